@@ -0,0 +1,160 @@
+"""Benchmark of the poll cycle under injected network and device faults.
+
+For each fault profile of fault_proxy.PROFILES a simulator and a fault proxy
+are started in a separate process and MyCoordinator._async_update_data, which
+includes the cycle timeout and the error handling of the coordinator, is run
+for a number of cycles. Reported per profile and modbus transport:
+
+- p50 and p99 of the cycle duration
+- completeness: valid values per cycle relative to the profile "none"
+- failed cycles: cycles that returned no data at all
+
+Run from the repository root:
+
+    python -m benchmarks.bench_faults --cycles 20 --profiles none latency busy
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from custom_components.weishaupt_modbus.const import CONF
+from custom_components.weishaupt_modbus.coordinator import MyCoordinator
+from homeassistant.core import HomeAssistant
+
+from .fault_proxy import PROFILES, FaultProxy
+from .harness import create_config_entry, create_coordinator
+from .simulator import HeatPumpSimulator
+
+HOST = "127.0.0.1"
+
+
+def serve_faults(port: int, profile: str, latency: float, seed: int) -> None:
+    """Run a simulator behind a fault proxy until the process is terminated.
+
+    The proxy listens on port, the simulator on port + 1.
+    """
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+
+    async def run() -> None:
+        async with HeatPumpSimulator(port=port + 1, latency=latency):
+            proxy = FaultProxy(HOST, port + 1, PROFILES[profile], seed)
+            await proxy.start(HOST, port)
+            await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the percentile of values, fraction between 0 and 1."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+async def run_cycles(coordinator: MyCoordinator, cycles: int) -> dict[str, Any]:
+    """Run poll cycles like the update interval of the coordinator does."""
+    durations: list[float] = []
+    valid: list[int] = []
+    failed = 0
+    for _cycle in range(cycles):
+        start = time.perf_counter()
+        values = await coordinator._async_update_data()  # noqa: SLF001
+        durations.append(time.perf_counter() - start)
+        valid.append(sum(value is not None for value in values.values()))
+        if not values:
+            failed += 1
+    return {
+        "p50_ms": percentile(durations, 0.5) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "valid_values": statistics.mean(valid),
+        "failed_cycles": failed,
+    }
+
+
+async def benchmark(port: int, cycles: int, transports: dict[str, bool]) -> Any:
+    """Run the cycles against the proxy with each transport."""
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for name, fast_transport in transports.items():
+            entry = create_config_entry(port, **{CONF.FAST_TRANSPORT: fast_transport})
+            coordinator = await create_coordinator(hass, entry)
+            try:
+                results[name] = await run_cycles(coordinator, cycles)
+            finally:
+                coordinator.modbus_api.close()
+        await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    """Run the benchmark for each fault profile and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--port", type=int, default=15031)
+    parser.add_argument(
+        "--profiles", nargs="+", choices=PROFILES, default=list(PROFILES)
+    )
+    parser.add_argument(
+        "--transport", choices=("pymodbus", "slim", "both"), default="both"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="simulated delay per request in s"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+
+    transports = {"pymodbus": False, "slim": True}
+    if args.transport != "both":
+        transports = {args.transport: transports[args.transport]}
+    # the reference for the completeness is measured without faults
+    profiles = ["none", *(name for name in args.profiles if name != "none")]
+
+    context = multiprocessing.get_context("spawn")
+    results: dict[str, dict[str, dict[str, Any]]] = {}
+    for profile in profiles:
+        server = context.Process(
+            target=serve_faults,
+            args=(args.port, profile, args.latency, args.seed),
+            daemon=True,
+        )
+        server.start()
+        try:
+            results[profile] = asyncio.run(
+                benchmark(args.port, args.cycles, transports)
+            )
+        finally:
+            server.terminate()
+            server.join()
+
+    print(  # noqa: T201
+        f"{'profile':16}{'client':10}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'complete %':>12}{'failed':>8}"
+    )
+    for profile, clients in results.items():
+        for name, values in clients.items():
+            reference = results["none"][name]["valid_values"] or 1
+            values["completeness"] = values["valid_values"] / reference
+            print(  # noqa: T201
+                f"{profile:16}{name:10}{values['p50_ms']:>10.1f}"
+                f"{values['p99_ms']:>10.1f}{values['completeness'] * 100:>12.1f}"
+                f"{values['failed_cycles']:>8}"
+            )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure import time and retained memory of hpconst.py.
+
+Every measurement runs in a fresh interpreter. The integration package (which
+imports hpconst.py) is imported first, then hpconst is removed from
+sys.modules and imported again, so only the work of hpconst itself is
+measured: the import time and the retained memory including the item lists
+of no, one or all additional heating circuits.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_hpconst --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import gc, importlib, json, sys, time, tracemalloc
+import custom_components.weishaupt_modbus
+NAME = "custom_components.weishaupt_modbus.hpconst"
+circuits = int(sys.argv[1])
+
+def build(hpconst):
+    if circuits == 4:
+        hpconst.DEVICELISTS
+    elif circuits:
+        hpconst.MODBUS_HZ2_ITEMS
+
+del sys.modules[NAME]
+gc.collect()
+start = time.perf_counter()
+build(importlib.import_module(NAME))
+elapsed = time.perf_counter() - start
+
+del sys.modules[NAME]
+gc.collect()
+tracemalloc.start()
+hpconst = importlib.import_module(NAME)
+build(hpconst)
+gc.collect()
+retained, _peak = tracemalloc.get_traced_memory()
+print(json.dumps({"import_ms": elapsed * 1000, "retained_kib": retained / 1024}))
+"""
+
+
+def probe(circuits: int) -> dict[str, float]:
+    """Run one measurement in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, str(circuits)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    """Run the measurements and print the medians."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for circuits, label in ((0, "HZ only"), (1, "HZ + HZ2"), (4, "HZ + HZ2..HZ5")):
+        runs = [probe(circuits) for _ in range(args.runs)]
+        results[label] = {
+            key: statistics.median(run[key] for run in runs) for key in runs[0]
+        }
+
+    keys = list(next(iter(results.values())))
+    print(f"{'circuits':16}" + "".join(f"{key:>16}" for key in keys))  # noqa: T201
+    for label, values in results.items():
+        print(f"{label:16}" + "".join(f"{values[key]:>16.1f}" for key in keys))  # noqa: T201
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Overhead of the metrics instrumentation relative to the poll cycle CPU time.
+
+The cost of the instrumentation of one request (two perf_counter calls and
+ModbusMetrics.record_request), of one poll cycle (start_cycle/end_cycle) and
+of the diagnostic sensor values is measured with timeit. The CPU time of a
+poll cycle is measured against the simulator (see harness.py). The
+instrumentation should stay below 1 % of the cycle CPU time.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_metrics
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import time
+import timeit
+
+from custom_components.weishaupt_modbus.hpconst import get_devicelists
+from custom_components.weishaupt_modbus.metrics import OUTCOME_OK, ModbusMetrics
+from custom_components.weishaupt_modbus.sensor import DIAGNOSTIC_SENSORS
+
+from .harness import benchmark
+from .simulator import serve
+
+
+def instrumentation_costs(number: int = 100000) -> dict[str, float]:
+    """Return the cost of the instrumentation in microseconds."""
+    metrics = ModbusMetrics()
+    items = [item for device in get_devicelists(()) for item in device]
+    item = items[0]
+    for other in items:
+        metrics.record_request(other, 4, 0.0, 0.001, OUTCOME_OK)
+
+    def request() -> None:
+        metrics.record_request(
+            item, 4, time.perf_counter(), time.perf_counter(), OUTCOME_OK
+        )
+
+    def cycle() -> None:
+        metrics.end_cycle(metrics.start_cycle())
+
+    def sensors() -> None:
+        for description in DIAGNOSTIC_SENSORS:
+            description.value_fn(metrics)
+
+    return {
+        name: min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+        for name, func in (
+            ("request_us", request),
+            ("cycle_us", cycle),
+            ("sensors_us", sensors),
+        )
+    }
+
+
+def main() -> None:
+    """Measure the instrumentation and the cycle and print the overhead."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--port", type=int, default=15051)
+    args = parser.parse_args()
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+
+    costs = instrumentation_costs()
+    context = multiprocessing.get_context("spawn")
+    counter = context.Value("L", 0)
+    server = context.Process(
+        target=serve, args=(args.port, "MadOne", 0.0, counter), daemon=True
+    )
+    server.start()
+    try:
+        results = asyncio.run(benchmark(args.port, counter, args.cycles, 1))
+    finally:
+        server.terminate()
+
+    print(  # noqa: T201
+        f"request {costs['request_us']:.2f} us, cycle {costs['cycle_us']:.2f} us, "
+        f"sensors {costs['sensors_us']:.2f} us"
+    )
+    for name, values in results.items():
+        overhead_us = (
+            values["requests_per_cycle"] * costs["request_us"]
+            + costs["cycle_us"]
+            + costs["sensors_us"]
+        )
+        cpu_us = values["cpu_ms_per_cycle"] * 1000
+        print(  # noqa: T201
+            f"{name:10} {values['requests_per_cycle']:.0f} requests, "
+            f"cycle CPU {cpu_us / 1000:.2f} ms, instrumentation {overhead_us:.1f} us "
+            f"= {100 * overhead_us / cpu_us:.2f} %"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Scaling of many heat pumps (config entries) in one event loop.
+
+For each number of instances K a fresh interpreter sets up K config entries
+with coordinators and all entities on one HomeAssistant instance. The heat
+pumps are the in-process synthetic heat pumps of the soak test, or with --tcp
+one simulator process that all K modbus clients connect to. Each round
+refreshes all coordinators at the same time, like the coordinators of HA
+which poll at the same second. Reported per K:
+
+- loop lag: p50/p99/max delay of a 10 ms sleep of a probe task during the
+  rounds, i.e. how long the event loop is blocked for other integrations
+- CPU time per device-cycle (one poll cycle of one heat pump incl. entities)
+- memory per entry: memory allocated by setup and the first round / K
+- state writes per second: state_changed events per round divided by the
+  scan interval, the rows the recorder would have to write
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scaling --instances 1 5 10 25 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from custom_components.weishaupt_modbus.const import CONF, CONST
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .bench_faults import percentile
+from .harness import create_config_entry
+from .simulator import serve
+from .soak import SyntheticModbusClient, VirtualClock, setup_integration
+
+# interval of the loop lag probe in seconds
+PROBE_INTERVAL = 0.01
+
+
+async def probe_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Append the delay of each PROBE_INTERVAL sleep to lags."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def measure(instances: int, rounds: int, port: int | None) -> dict[str, Any]:
+    """Set up instances entries, run the rounds and return the measurements."""
+    clock = VirtualClock()
+    scan_interval = CONST.SCAN_INTERVAL.total_seconds()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        tracemalloc.start()
+        coordinators = []
+        for index in range(instances):
+            entry = create_config_entry(
+                port or 0,
+                **{CONF.DEVICE_POSTFIX: f"_{index}", CONF.FAST_TRANSPORT: True},
+            )
+            client = None if port else SyntheticModbusClient(clock)
+            coordinators.append(await setup_integration(hass, entry, client))
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+        await hass.async_block_till_done()
+        memory, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        state_changes = 0
+
+        @callback
+        def count_state_change(_event: Event) -> None:
+            nonlocal state_changes
+            state_changes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_change)
+        lags: list[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_loop_lag(lags, stop))
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for _round in range(rounds):
+            clock.advance(scan_interval)
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in coordinators)
+            )
+            await hass.async_block_till_done()
+            # a pause between the rounds like between two poll intervals
+            await asyncio.sleep(5 * PROBE_INTERVAL)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        stop.set()
+        await probe
+
+        for coordinator in coordinators:
+            coordinator.modbus_api.close()
+        await hass.async_stop(force=True)
+
+    return {
+        "instances": instances,
+        "lag_p50_ms": percentile(lags, 0.5) * 1000,
+        "lag_p99_ms": percentile(lags, 0.99) * 1000,
+        "lag_max_ms": max(lags) * 1000,
+        "cpu_ms_per_device_cycle": cpu / (rounds * instances) * 1000,
+        "round_ms": wall / rounds * 1000,
+        "memory_kib_per_entry": memory / instances / 1024,
+        "state_writes_per_s": state_changes / rounds / scan_interval,
+    }
+
+
+def run_instances(instances: int, rounds: int, port: int | None) -> dict[str, Any]:
+    """Measure instances in a fresh interpreter."""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_scaling",
+        "--single",
+        str(instances),
+        "--rounds",
+        str(rounds),
+    ]
+    if port:
+        command += ["--tcp", "--port", str(port)]
+    result = subprocess.run(command, capture_output=True, check=True, text=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """Print one line per number of instances."""
+    print(  # noqa: T201
+        f"{'K':>4}{'lag p50':>10}{'lag p99':>10}{'lag max':>10}{'cpu/dev':>10}"
+        f"{'round':>10}{'KiB/entry':>11}{'writes/s':>10}"
+    )
+    for row in results:
+        print(  # noqa: T201
+            f"{row['instances']:>4}{row['lag_p50_ms']:>8.1f}ms{row['lag_p99_ms']:>8.1f}ms"
+            f"{row['lag_max_ms']:>8.1f}ms{row['cpu_ms_per_device_cycle']:>8.2f}ms"
+            f"{row['round_ms']:>8.0f}ms{row['memory_kib_per_entry']:>11.0f}"
+            f"{row['state_writes_per_s']:>10.1f}"
+        )
+
+
+def main() -> None:
+    """Run the scaling benchmark for all numbers of instances."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--tcp",
+        action="store_true",
+        help="poll a simulator process over TCP instead of in-process heat pumps",
+    )
+    parser.add_argument("--port", type=int, default=15040)
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if args.single:
+        # child process of run_instances
+        result = asyncio.run(
+            measure(args.single, args.rounds, args.port if args.tcp else None)
+        )
+        print(json.dumps(result))  # noqa: T201
+        return
+
+    server = None
+    if args.tcp:
+        context = multiprocessing.get_context("spawn")
+        server = context.Process(
+            target=serve, args=(args.port, "MadOne", 0.0, None), daemon=True
+        )
+        server.start()
+        time.sleep(1)
+    try:
+        results = [
+            run_instances(instances, args.rounds, args.port if args.tcp else None)
+            for instances in args.instances
+        ]
+    finally:
+        if server is not None:
+            server.terminate()
+    print_results(results)
+    first, last = results[0], results[-1]
+    growth = last["cpu_ms_per_device_cycle"] / first["cpu_ms_per_device_cycle"]
+    print(  # noqa: T201
+        f"CPU per device-cycle at K={last['instances']}: {growth:.2f}x of "
+        f"K={first['instances']}, median loop lag "
+        f"{statistics.median(row['lag_p50_ms'] for row in results):.1f} ms"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Compare the pymodbus client with the slim asyncio transport.
+
+The heat pump simulator in a separate process answers every register of
+hpconst.DEVICELISTS. Both clients read the registers one by one as
+MyCoordinator.fetch_data does and the CPU time and wall time per poll
+cycle as well as the per request latency are reported.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_transport --cycles 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import statistics
+import time
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from custom_components.weishaupt_modbus.const import TYPES
+from custom_components.weishaupt_modbus.hpconst import DEVICELISTS
+from custom_components.weishaupt_modbus.slim_modbus import SlimModbusTcpClient
+
+from .simulator import serve
+
+HOST = "127.0.0.1"
+
+
+def read_plan() -> list[tuple[bool, int]]:
+    """Return (is_input_register, address) for every item like fetch_data reads them."""
+    return [
+        (item.type in (TYPES.SENSOR, TYPES.SENSOR_CALC), item.address)
+        for device in DEVICELISTS
+        for item in device
+    ]
+
+
+async def _run_cycles(client, plan, cycles: int) -> dict[str, float]:
+    """Poll the read plan cycles times and collect timings."""
+    latencies: list[float] = []
+    cpu_per_cycle: list[float] = []
+    wall_per_cycle: list[float] = []
+    for _cycle in range(cycles + 1):
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for is_input, address in plan:
+            start = time.perf_counter()
+            if is_input:
+                response = await client.read_input_registers(address, slave=1)
+            else:
+                response = await client.read_holding_registers(address, slave=1)
+            latencies.append(time.perf_counter() - start)
+            if response.isError():
+                raise RuntimeError(f"Unexpected exception response for {address}")
+        if _cycle == 0:
+            # warm up cycle
+            latencies.clear()
+            continue
+        cpu_per_cycle.append(time.process_time() - cpu_start)
+        wall_per_cycle.append(time.perf_counter() - wall_start)
+    latencies.sort()
+    return {
+        "requests_per_cycle": len(plan),
+        "cpu_ms_per_cycle": statistics.mean(cpu_per_cycle) * 1000,
+        "wall_ms_per_cycle": statistics.mean(wall_per_cycle) * 1000,
+        "latency_p50_us": latencies[len(latencies) // 2] * 1e6,
+        "latency_p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+async def benchmark(port: int, cycles: int) -> dict[str, dict[str, float]]:
+    """Benchmark both clients against the server on port."""
+    plan = read_plan()
+    clients = {
+        "pymodbus": AsyncModbusTcpClient(host=HOST, port=port, retries=1),
+        "slim": SlimModbusTcpClient(host=HOST, port=port),
+    }
+    results: dict[str, dict[str, float]] = {}
+    for name, client in clients.items():
+        for _retry in range(50):
+            if await client.connect():
+                break
+            await asyncio.sleep(0.1)
+        else:
+            raise RuntimeError(f"Could not connect to the server on port {port}")
+        results[name] = await _run_cycles(client, plan, cycles)
+        client.close()
+    return results
+
+
+def main() -> None:
+    """Start the server, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--port", type=int, default=15020)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(args.port,), daemon=True
+    )
+    server.start()
+    try:
+        results = asyncio.run(benchmark(args.port, args.cycles))
+    finally:
+        server.terminate()
+
+    keys = list(next(iter(results.values())))
+    print(f"{'client':10}" + "".join(f"{key:>20}" for key in keys))  # noqa: T201
+    for name, values in results.items():
+        print(f"{name:10}" + "".join(f"{values[key]:>20.1f}" for key in keys))  # noqa: T201
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
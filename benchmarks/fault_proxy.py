@@ -0,0 +1,205 @@
+"""Modbus TCP proxy that injects faults between the integration and a server.
+
+The proxy forwards every request to the target server (usually the heat pump
+simulator) and can disturb the answers like a bad network link or a busy heat
+pump does:
+
+- delay and jitter: the response is delayed by delay + random(0, jitter)
+- drop_rate: the response is not sent, the client runs into its timeout
+- half_open_after: after that many requests on a connection the proxy stops
+  answering but keeps the socket open
+- exceptions: requests for an address range are answered with an exception
+  code, e.g. 4 (server device failure) or 6 (server device busy)
+
+The profile can be replaced while the proxy is running. Run a proxy for
+manual tests from the repository root:
+
+    python -m benchmarks.fault_proxy --target-port 5020 --port 5021 --profile busy
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import random
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+# MBAP header (transaction id, protocol id, length, unit id) and function code
+_HEADER = struct.Struct(">HHHBB")
+_ADDRESS = struct.Struct(">H")
+_EXCEPTION = struct.Struct(">HHHBBB")
+
+
+@dataclass(frozen=True)
+class ExceptionRule:
+    """Answer requests for first..last with an exception code."""
+
+    first: int
+    last: int
+    code: int
+    rate: float = 1.0
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Faults injected by the proxy."""
+
+    delay: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    half_open_after: int = 0
+    exceptions: tuple[ExceptionRule, ...] = field(default_factory=tuple)
+
+
+PROFILES: dict[str, FaultProfile] = {
+    "none": FaultProfile(),
+    "latency": FaultProfile(delay=0.02, jitter=0.03),
+    "drops": FaultProfile(drop_rate=0.01),
+    "busy": FaultProfile(
+        exceptions=(ExceptionRule(30001, 49999, 6, 0.05),), jitter=0.01
+    ),
+    "device_failure": FaultProfile(
+        exceptions=(ExceptionRule(31101, 31199, 4), ExceptionRule(33101, 33199, 4))
+    ),
+    "half_open": FaultProfile(half_open_after=300),
+}
+
+
+class FaultProxy:
+    """Modbus TCP proxy injecting the faults of a FaultProfile."""
+
+    def __init__(
+        self,
+        target_host: str,
+        target_port: int,
+        profile: FaultProfile | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the proxy.
+
+        Args:
+            target_host: host of the modbus server
+            target_port: port of the modbus server
+            profile: injected faults, can be changed while running
+            seed: seed of the random generator for reproducible runs
+
+        """
+        self.target_host: str = target_host
+        self.target_port: int = target_port
+        self.profile: FaultProfile = profile or FaultProfile()
+        self.injected: dict[str, int] = {"dropped": 0, "exceptions": 0, "stalled": 0}
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the port."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop the proxy and close all connections."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _exception_code(self, address: int) -> int:
+        """Return the exception code to inject for address or 0."""
+        for rule in self.profile.exceptions:
+            if rule.first <= address <= rule.last and (
+                rule.rate >= 1.0 or self._random.random() < rule.rate
+            ):
+                return rule.code
+        return 0
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Forward the requests of one client connection."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+        try:
+            up_reader, up_writer = await asyncio.open_connection(
+                self.target_host, self.target_port
+            )
+        except OSError as exc:
+            _LOGGER.warning("Could not connect to the target: %s", exc)
+            writer.close()
+            return
+        requests = 0
+        try:
+            while True:
+                request = await _read_frame(reader)
+                requests += 1
+                profile = self.profile
+                if profile.half_open_after and requests > profile.half_open_after:
+                    # keep the socket open without answering
+                    self.injected["stalled"] += 1
+                    await asyncio.Event().wait()
+                transaction_id, _protocol, _length, unit, function_code = (
+                    _HEADER.unpack_from(request)
+                )
+                code = self._exception_code(_ADDRESS.unpack_from(request, 8)[0])
+                if code:
+                    self.injected["exceptions"] += 1
+                    response = _EXCEPTION.pack(
+                        transaction_id, 0, 3, unit, function_code | 0x80, code
+                    )
+                else:
+                    up_writer.write(request)
+                    response = await _read_frame(up_reader)
+                if profile.drop_rate and self._random.random() < profile.drop_rate:
+                    self.injected["dropped"] += 1
+                    continue
+                delay = profile.delay + profile.jitter * self._random.random()
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            up_writer.close()
+            writer.close()
+            if task is not None:
+                self._tasks.discard(task)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one Modbus TCP frame."""
+    header = await reader.readexactly(6)
+    length = _ADDRESS.unpack_from(header, 4)[0]
+    return header + await reader.readexactly(length)
+
+
+def main() -> None:
+    """Run the proxy from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-host", default="127.0.0.1")
+    parser.add_argument("--target-port", type=int, default=5020)
+    parser.add_argument("--port", type=int, default=5021)
+    parser.add_argument("--profile", choices=PROFILES, default="latency")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def run() -> None:
+        proxy = FaultProxy(
+            args.target_host, args.target_port, PROFILES[args.profile], args.seed
+        )
+        await proxy.start(port=args.port)
+        _LOGGER.info("Proxy with profile %s on port %s", args.profile, args.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Set up the integration against the simulator.
+
+Shared by the benchmarks and by the benchmark tests in tests/benchmarks.
+The simulator runs in a separate process, so only the work of the
+integration is measured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from multiprocessing.process import BaseProcess
+import statistics
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+from typing import Any
+
+from custom_components.weishaupt_modbus.const import CONF, CONST
+from custom_components.weishaupt_modbus.coordinator import MyCoordinator
+from custom_components.weishaupt_modbus.hpconst import get_devicelists
+from custom_components.weishaupt_modbus.modbusobject import ModbusAPI
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .simulator import serve
+
+HOST = "127.0.0.1"
+
+
+def create_config_entry(port: int, **data: Any) -> ConfigEntry:
+    """Return a config entry of the integration for the simulator on port."""
+    entry_data = {
+        CONF.HOST: HOST,
+        CONF.PORT: port,
+        CONF.PREFIX: CONST.DEF_PREFIX,
+        CONF.DEVICE_POSTFIX: "",
+        CONF.KENNFELD_FILE: CONST.DEF_KENNFELDFILE,
+        CONF.HK2: False,
+        CONF.HK3: False,
+        CONF.HK4: False,
+        CONF.HK5: False,
+        CONF.NAME_DEVICE_PREFIX: False,
+        CONF.NAME_TOPIC_PREFIX: False,
+        CONF.CB_WEBIF: False,
+        CONF.USERNAME: "",
+        CONF.PASSWORD: "",
+        CONF.WEBIF_TOKEN: "",
+    }
+    entry_data.update(data)
+    return ConfigEntry(
+        data=entry_data,
+        discovery_keys=MappingProxyType({}),
+        domain=CONST.DOMAIN,
+        minor_version=1,
+        options={},
+        source="user",
+        subentries_data=None,
+        title=HOST,
+        unique_id=None,
+        version=6,
+    )
+
+
+async def create_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> MyCoordinator:
+    """Create and connect a coordinator like async_setup_entry does."""
+    circuits = tuple(
+        circuit
+        for circuit, conf in (
+            (2, CONF.HK2),
+            (3, CONF.HK3),
+            (4, CONF.HK4),
+            (5, CONF.HK5),
+        )
+        if entry.data[conf]
+    )
+    itemlist = [item for device in get_devicelists(circuits) for item in device]
+    coordinator = MyCoordinator(
+        hass=hass,
+        my_api=ModbusAPI(config_entry=entry),
+        api_items=itemlist,
+        p_config_entry=entry,
+    )
+    for _retry in range(50):
+        if await coordinator.modbus_api.connect(startup=True):
+            break
+        await asyncio.sleep(0.1)
+    else:
+        raise RuntimeError("Could not connect to the simulator")
+    return coordinator
+
+
+def start_simulator(
+    port: int, column: str = "MadOne", latency: float = 0.0
+) -> tuple[BaseProcess, Any]:
+    """Start the simulator in a process, return it and its request counter."""
+    context = multiprocessing.get_context("spawn")
+    counter = context.Value("L", 0)
+    server = context.Process(
+        target=serve, args=(port, column, latency, counter), daemon=True
+    )
+    server.start()
+    return server, counter
+
+
+async def measure_allocations(
+    coordinator: MyCoordinator, cycles: int
+) -> dict[str, float]:
+    """Return the allocations of a poll cycle, measured with tracemalloc.
+
+    Tracing slows down the cycles, so they are not timed.
+    """
+    peaks: list[float] = []
+    blocks: list[int] = []
+    tracemalloc.start()
+    for _cycle in range(cycles):
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+        await coordinator.fetch_data()
+        snapshot = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak)
+        blocks.append(sum(stat.count for stat in snapshot.statistics("filename")))
+    tracemalloc.stop()
+    return {
+        "alloc_peak_kib": statistics.mean(peaks) / 1024,
+        "alloc_blocks_live": statistics.mean(blocks),
+    }
+
+
+async def run_cycles(
+    coordinator: MyCoordinator, counter: Any, cycles: int, alloc_cycles: int
+) -> dict[str, float]:
+    """Run poll cycles and collect the statistics."""
+    requests: list[int] = []
+    cpu_per_cycle: list[float] = []
+    wall_per_cycle: list[float] = []
+    values: dict[str, Any] = {}
+    # warm up
+    await coordinator.fetch_data()
+    for _cycle in range(cycles):
+        start_requests = counter.value if counter is not None else 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        values = await coordinator.fetch_data()
+        cpu_per_cycle.append(time.process_time() - cpu_start)
+        wall_per_cycle.append(time.perf_counter() - wall_start)
+        if counter is not None:
+            requests.append(counter.value - start_requests)
+
+    return {
+        "items": len(values),
+        "valid_values": sum(value is not None for value in values.values()),
+        "requests_per_cycle": statistics.mean(requests) if requests else 0,
+        "wall_ms_per_cycle": statistics.mean(wall_per_cycle) * 1000,
+        "cpu_ms_per_cycle": statistics.mean(cpu_per_cycle) * 1000,
+        **await measure_allocations(coordinator, alloc_cycles),
+    }
+
+
+async def benchmark(
+    port: int, counter: Any, cycles: int, alloc_cycles: int, **data: Any
+) -> dict[str, dict[str, float]]:
+    """Benchmark fetch_data with both modbus transports."""
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for name, fast_transport in (("pymodbus", False), ("slim", True)):
+            entry = create_config_entry(
+                port, **data, **{CONF.FAST_TRANSPORT: fast_transport}
+            )
+            coordinator = await create_coordinator(hass, entry)
+            try:
+                results[name] = await run_cycles(
+                    coordinator, counter, cycles, alloc_cycles
+                )
+            finally:
+                coordinator.modbus_api.close()
+        await hass.async_stop(force=True)
+    return results
@@ -0,0 +1,246 @@
+"""Modbus TCP simulator of a Weishaupt heat pump.
+
+The register values are taken from auswertung_register.csv, which contains
+the values read from two real heat pumps (columns "MadOne" and "Ostrama").
+Registers of the hpconst item lists that are missing in the file answer with
+a plausible default. All other registers answer with exception code 2
+(illegal data address) like the heat pump does.
+
+Like the heat pump, the simulator does not distinguish input and holding
+registers: function codes 3 and 4 read the same registers, function code 6
+writes them. Each request can be delayed by a fixed latency to simulate the
+slow modbus interface of the heat pump.
+
+Run a simulator for manual tests from the repository root:
+
+    python -m benchmarks.simulator --port 5020 --latency 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Sequence
+import csv
+import logging
+from pathlib import Path
+from typing import Any, Self
+
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.datastore.context import ModbusBaseSlaveContext
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.server import ModbusTcpServer
+
+from custom_components.weishaupt_modbus.const import FORMATS
+from custom_components.weishaupt_modbus.hpconst import DEVICELISTS
+
+REGISTER_FILE = (
+    Path(__file__).parent.parent
+    / "custom_components"
+    / "weishaupt_modbus"
+    / "auswertung_register.csv"
+)
+COLUMNS = ("MadOne", "Ostrama")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_register_values(column: str = "MadOne") -> dict[int, int]:
+    """Return the register values of one heat pump of auswertung_register.csv."""
+    values: dict[int, int] = {}
+    with REGISTER_FILE.open(encoding="utf-8") as file:
+        for row in csv.DictReader(file, delimiter=";"):
+            if row[column].strip():
+                values[int(row["Register"])] = int(row[column])
+    return values
+
+
+def default_register_values() -> dict[int, int]:
+    """Return a plausible value for every register of the hpconst item lists."""
+    values: dict[int, int] = {}
+    for device in DEVICELISTS:
+        for item in device:
+            if item.resultlist:
+                values[item.address] = item.resultlist[0].number
+            elif item.format == FORMATS.TEMPERATURE:
+                values[item.address] = 200
+            else:
+                values[item.address] = 0
+    return values
+
+
+class SimulatorContext(ModbusBaseSlaveContext):
+    """Datastore of the simulator.
+
+    Unknown addresses are answered with exception code 2 instead of the
+    pymodbus default of silently returning 0.
+    """
+
+    def __init__(
+        self, registers: dict[int, int], latency: float = 0.0, counter: Any = None
+    ) -> None:
+        """Initialize the datastore.
+
+        Args:
+            registers: register values, key is the modbus address
+            latency: delay of each request in seconds
+            counter: optional multiprocessing.Value counting the requests
+
+        """
+        self.registers: dict[int, int] = registers
+        self.latency: float = latency
+        self.requests: int = 0
+        self._counter = counter
+
+    def reset(self) -> None:
+        """Reset the request counter."""
+        self.requests = 0
+
+    async def _request(self) -> None:
+        """Count a request and wait for the configured latency."""
+        self.requests += 1
+        if self._counter is not None:
+            self._counter.value += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _lookup(self, address: int, count: int) -> list[int] | int:
+        """Return the registers or the exception code."""
+        try:
+            return [self.registers[reg] for reg in range(address, address + count)]
+        except KeyError:
+            return ExceptionResponse.ILLEGAL_ADDRESS
+
+    def getValues(self, fc_as_hex: int, address: int, count: int = 1) -> Any:
+        """Return the registers or the exception code."""
+        return self._lookup(address, count)
+
+    def setValues(
+        self, fc_as_hex: int, address: int, values: Sequence[int | bool]
+    ) -> Any:
+        """Write registers, only existing registers can be written."""
+        if any(
+            reg not in self.registers for reg in range(address, address + len(values))
+        ):
+            return ExceptionResponse.ILLEGAL_ADDRESS
+        for offset, value in enumerate(values):
+            self.registers[address + offset] = int(value)
+        return None
+
+    async def async_getValues(
+        self, fc_as_hex: int, address: int, count: int = 1
+    ) -> Any:
+        """Return the registers after the configured latency."""
+        await self._request()
+        return self._lookup(address, count)
+
+    async def async_setValues(
+        self, fc_as_hex: int, address: int, values: Sequence[int | bool]
+    ) -> Any:
+        """Write registers after the configured latency."""
+        await self._request()
+        return self.setValues(fc_as_hex, address, values)
+
+
+class HeatPumpSimulator:
+    """Modbus TCP server answering like a Weishaupt heat pump."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5020,
+        column: str = "MadOne",
+        latency: float = 0.0,
+        counter: Any = None,
+    ) -> None:
+        """Initialize the simulator.
+
+        Args:
+            host: address to listen on
+            port: port to listen on
+            column: heat pump of auswertung_register.csv, "MadOne" or "Ostrama"
+            latency: delay of each request in seconds
+            counter: optional multiprocessing.Value counting the requests
+
+        """
+        registers = default_register_values()
+        registers.update(load_register_values(column))
+        self.host: str = host
+        self.port: int = port
+        self.context = SimulatorContext(registers, latency, counter)
+        self._server: ModbusTcpServer | None = None
+
+    async def start(self) -> None:
+        """Start listening, has to be called in a running event loop."""
+        self._server = ModbusTcpServer(
+            ModbusServerContext(slaves=self.context, single=True),
+            address=(self.host, self.port),
+        )
+        await self._server.serve_forever(background=True)
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            await self._server.shutdown()
+            self._server = None
+
+    async def __aenter__(self) -> Self:
+        """Start the simulator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the simulator."""
+        await self.stop()
+
+
+def serve(
+    port: int, column: str = "MadOne", latency: float = 0.0, counter: Any = None
+) -> None:
+    """Run a simulator until the process is terminated.
+
+    Used as target of a separate process by the benchmarks, so the CPU time of
+    the server is not measured.
+    """
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+
+    async def run() -> None:
+        async with HeatPumpSimulator(
+            port=port, column=column, latency=latency, counter=counter
+        ):
+            await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--column", choices=COLUMNS, default="MadOne")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="delay per request in seconds"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+
+    async def run() -> None:
+        async with HeatPumpSimulator(
+            args.host, args.port, args.column, args.latency
+        ) as simulator:
+            _LOGGER.info(
+                "Simulating %s on %s:%s with %s registers",
+                args.column,
+                args.host,
+                args.port,
+                len(simulator.context.registers),
+            )
+            await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
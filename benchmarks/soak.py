@@ -0,0 +1,339 @@
+"""Accelerated-time soak test of the coordinator and the entities.
+
+The integration is set up with the number, select and sensor entities on a
+real HomeAssistant instance, but the modbus traffic is served in-process and
+the poll cycles are driven by a virtual clock instead of the update interval
+of the coordinator. A week of polling runs in a few minutes.
+
+The register values come from a capture file (--replay, see capture.py) or
+from a synthetic heat pump:
+
+- temperatures follow a daily sine wave around the simulator values
+- the energy statistics (36x01 today, 36x03 month, 36x04 year) increase with
+  the virtual time and are reset at the start of each period; the year
+  counters start close to 65535 so they roll over on the second day
+- all other registers keep the simulator values
+
+Reported per time window: CPU time per cycle (mean and max), state_changed
+events per cycle, allocated memory blocks, maximum RSS and reconnects.
+Growing blocks or CPU time over the windows point to a leak or a slowdown.
+
+Run from the repository root:
+
+    python -m benchmarks.soak --days 7 --report-hours 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+from pathlib import Path
+import resource
+import sys
+import tempfile
+import time
+from typing import Any
+
+from custom_components.weishaupt_modbus import number, select, sensor
+from custom_components.weishaupt_modbus.configentry import MyConfigEntry, MyData
+from custom_components.weishaupt_modbus.const import CONF, CONST, FORMATS
+from custom_components.weishaupt_modbus.coordinator import MyCoordinator
+from custom_components.weishaupt_modbus.hpconst import DEVICELISTS, get_devicelists
+from custom_components.weishaupt_modbus.kennfeld import PowerMap
+from custom_components.weishaupt_modbus.modbusobject import ModbusAPI
+from custom_components.weishaupt_modbus.slim_modbus import (
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    FC_WRITE_REGISTER,
+    SlimModbusResponse,
+)
+from homeassistant import loader
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+)
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from .harness import create_config_entry
+from .simulator import default_register_values, load_register_values
+
+DAY = 86400
+# energy counters in 0.1 kWh per hour
+ENERGY_RATE = 10
+_PERIODS = {1: DAY, 3: 30 * DAY, 4: 365 * DAY}
+_PLATFORMS = (("sensor", sensor), ("number", number), ("select", select))
+
+
+class VirtualClock:
+    """Time of the soak test in seconds, advanced by each poll cycle."""
+
+    def __init__(self) -> None:
+        """Start at midnight of day 0."""
+        self.now: float = 0.0
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.now += seconds
+
+
+class SyntheticModbusClient:
+    """In-process modbus client answering with values of the virtual time."""
+
+    def __init__(self, clock: VirtualClock, column: str = "MadOne") -> None:
+        """Initialize the register values.
+
+        Args:
+            clock: the virtual clock of the soak test
+            column: heat pump of auswertung_register.csv, "MadOne" or "Ostrama"
+
+        """
+        self._clock = clock
+        self.registers: dict[int, int] = default_register_values()
+        self.registers.update(load_register_values(column))
+        self.temperatures: set[int] = {
+            item.address
+            for device in DEVICELISTS
+            for item in device
+            if item.format == FORMATS.TEMPERATURE
+        }
+        self.connects: int = 0
+        self._connected: bool = False
+
+    @property
+    def connected(self) -> bool:
+        """Return True after connect."""
+        return self._connected
+
+    async def connect(self) -> bool:
+        """Connect, always succeeds."""
+        self.connects += 1
+        self._connected = True
+        return True
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._connected = False
+
+    def value(self, address: int) -> int:
+        """Return the register value at the current virtual time."""
+        value = self.registers[address]
+        now = self._clock.now
+        if address in self.temperatures and value < 0x8000:
+            # 5 K daily amplitude in 0.1 K, negative values as two's complement
+            return (value + round(50 * math.sin(2 * math.pi * now / DAY))) & 0xFFFF
+        if 36000 < address < 37000:
+            period = _PERIODS.get(address % 100)
+            if address % 100 == 2:
+                return 24 * ENERGY_RATE
+            if period is not None:
+                start = 0xFFFF - 2 * 24 * ENERGY_RATE if period == 365 * DAY else 0
+                return (start + int(now % period / 3600 * ENERGY_RATE)) & 0xFFFF
+        return value
+
+    def _read(self, function_code: int, address: int) -> SlimModbusResponse:
+        """Return the response of a read request."""
+        if address not in self.registers:
+            return SlimModbusResponse(function_code | 0x80, (), 2)
+        return SlimModbusResponse(function_code, (self.value(address),))
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Read holding registers (FC03)."""
+        return self._read(FC_READ_HOLDING_REGISTERS, address)
+
+    async def read_input_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Read input registers (FC04)."""
+        return self._read(FC_READ_INPUT_REGISTERS, address)
+
+    async def write_register(
+        self, address: int, value: int, *, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Write a single holding register (FC06)."""
+        self.registers[address] = value
+        return SlimModbusResponse(FC_WRITE_REGISTER, (value,))
+
+
+def _collect_entities(entities: list[Any]) -> Any:
+    """Return an async_add_entities callback appending to entities."""
+
+    def add_entities(new: Any, update_before_add: bool = False) -> None:
+        entities.extend(new)
+
+    return add_entities
+
+
+async def setup_integration(
+    hass: HomeAssistant,
+    entry: MyConfigEntry,
+    client: Any,
+    all_entities: list[Any] | None = None,
+) -> MyCoordinator:
+    """Set up coordinator and entities like async_setup_entry does.
+
+    The update interval of the coordinator is disabled, the cycles are
+    triggered by the soak test. The entities are appended to all_entities.
+    Can be called for several entries on the same hass.
+    """
+    if er.DATA_REGISTRY not in hass.data:
+        loader.async_setup(hass)
+        for registry in (ar, fr, lr, dr, er):
+            await registry.async_load(hass)
+    modbus_api = ModbusAPI(config_entry=entry)
+    if client is not None:
+        modbus_api._modbus_client = client  # noqa: SLF001
+    await modbus_api.connect(startup=True)
+    devicelists = get_devicelists(())
+    coordinator = MyCoordinator(
+        hass=hass,
+        my_api=modbus_api,
+        api_items=[item for device in devicelists for item in device],
+        p_config_entry=entry,
+    )
+    coordinator.update_interval = None
+    entry.runtime_data = MyData(
+        modbus_api=modbus_api,
+        webif_api=None,
+        config_dir=hass.config.config_dir,
+        hass=hass,
+        coordinator=coordinator,
+        powermap=None,
+        devicelists=devicelists,
+    )
+    powermap = PowerMap(entry, hass)
+    await powermap.initialize()
+    entry.runtime_data.powermap = powermap
+
+    for domain, module in _PLATFORMS:
+        entities: list[Any] = []
+        await module.async_setup_entry(hass, entry, _collect_entities(entities))
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(domain),
+            domain=domain,
+            platform_name=CONST.DOMAIN,
+            platform=None,
+            scan_interval=CONST.SCAN_INTERVAL,
+            entity_namespace=None,
+        )
+        await platform.async_add_entities(entities)
+        if all_entities is not None:
+            all_entities.extend(entities)
+    return coordinator
+
+
+async def soak(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Run the soak test and return one row per report window."""
+    clock = VirtualClock()
+    client = None if args.replay else SyntheticModbusClient(clock, args.column)
+    data = {CONF.REPLAY_FILE: str(args.replay)} if args.replay else {}
+    interval = args.scan_interval
+    cycles = int(args.days * DAY / interval)
+    window = max(1, int(args.report_hours * 3600 / interval))
+    rows: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = create_config_entry(0, **data)
+        coordinator = await setup_integration(hass, entry, client)
+        state_changes = 0
+
+        @callback
+        def count_state_change(_event: Event) -> None:
+            nonlocal state_changes
+            state_changes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_change)
+        cpu_times: list[float] = []
+        window_changes = state_changes
+        print_header()
+        for cycle in range(1, cycles + 1):
+            clock.advance(interval)
+            if args.disconnect_every and cycle % args.disconnect_every == 0:
+                coordinator.modbus_api.get_device().close()
+            cpu_start = time.process_time()
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            cpu_times.append(time.process_time() - cpu_start)
+            if cycle % window == 0 or cycle == cycles:
+                rows.append(
+                    {
+                        "hours": clock.now / 3600,
+                        "cycles": cycle,
+                        "cpu_ms_mean": sum(cpu_times) / len(cpu_times) * 1000,
+                        "cpu_ms_max": max(cpu_times) * 1000,
+                        "state_changes_per_cycle": (state_changes - window_changes)
+                        / len(cpu_times),
+                        "allocated_blocks": sys.getallocatedblocks(),
+                        "max_rss_mib": resource.getrusage(
+                            resource.RUSAGE_SELF
+                        ).ru_maxrss
+                        / 1024,
+                        "connects": client.connects if client is not None else 0,
+                    }
+                )
+                print_row(rows[-1])
+                cpu_times = []
+                window_changes = state_changes
+        coordinator.modbus_api.close()
+        await hass.async_stop(force=True)
+    return rows
+
+
+def print_header() -> None:
+    """Print the header of the report."""
+    print(  # noqa: T201
+        f"{'hours':>8}{'cycles':>8}{'cpu ms':>9}{'max ms':>9}{'changes':>9}"
+        f"{'blocks':>10}{'rss MiB':>9}{'connects':>9}"
+    )
+
+
+def print_row(row: dict[str, Any]) -> None:
+    """Print one report window."""
+    print(  # noqa: T201
+        f"{row['hours']:>8.1f}{row['cycles']:>8}{row['cpu_ms_mean']:>9.2f}"
+        f"{row['cpu_ms_max']:>9.2f}{row['state_changes_per_cycle']:>9.1f}"
+        f"{row['allocated_blocks']:>10}{row['max_rss_mib']:>9.1f}{row['connects']:>9}"
+    )
+
+
+def main() -> None:
+    """Run the soak test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=7.0)
+    parser.add_argument("--scan-interval", type=float, default=30.0)
+    parser.add_argument("--report-hours", type=float, default=12.0)
+    parser.add_argument("--column", choices=("MadOne", "Ostrama"), default="MadOne")
+    parser.add_argument("--replay", type=Path, help="serve this capture file")
+    parser.add_argument(
+        "--disconnect-every",
+        type=int,
+        default=0,
+        help="drop the connection every n cycles",
+    )
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    rows = asyncio.run(soak(args))
+    first, last = rows[0], rows[-1]
+    print(  # noqa: T201
+        f"growth: {last['allocated_blocks'] - first['allocated_blocks']} blocks, "
+        f"{last['cpu_ms_mean'] - first['cpu_ms_mean']:+.2f} ms CPU per cycle"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
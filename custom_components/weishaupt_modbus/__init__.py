@@ -7,30 +7,37 @@ import logging
 from pathlib import Path
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .capture import CaptureWriter
 from .configentry import MyConfigEntry, MyData
 from .const import CONF, CONST, DEVICENAMES, FORMATS, TYPES
 from .coordinator import MyCoordinator
-from .hpconst import (
-    DEVICELISTS,
-    MODBUS_HZ2_ITEMS,
-    MODBUS_HZ3_ITEMS,
-    MODBUS_HZ4_ITEMS,
-    MODBUS_HZ5_ITEMS,
-    MODBUS_HZ_ITEMS,
-    MODBUS_IO_ITEMS,
-    MODBUS_ST_ITEMS,
-    MODBUS_SYS_ITEMS,
-    MODBUS_W2_ITEMS,
-    MODBUS_WP_ITEMS,
-    MODBUS_WW_ITEMS,
-)
-from .items import ModbusItem
-from .kennfeld import PowerMap
+from .hpconst import get_devicelists, reverse_device_list
+from .items import ModbusItem, read_status_descriptions
+from .kennfeld import PowerMap, get_filepath
 from .migrate_helpers import migrate_entities
 from .modbusobject import ModbusAPI
+from .openmetrics import async_register_view
+from .options import (
+    WEBIF_OPTIONS,
+    apply_metrics_endpoint,
+    apply_poll_bounds,
+    async_apply_devices,
+    async_apply_kennfeld,
+    async_apply_webif,
+    changed_options,
+    needs_platform_reload,
+    needs_reload,
+    watch_recovered,
+)
+from .profiler import async_setup_services
+from .registermap import load_register_map, remove_register_map_caches
 from .webif_object import WebifConnection
 
 _LOGGER = logging.getLogger(__name__)
@@ -42,10 +49,41 @@ PLATFORMS: list[str] = [
     #    "switch",
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(CONST.DOMAIN)
+
+# seconds to wait for the capture file to be written when Home Assistant stops
+CAPTURE_STOP_TIMEOUT = 5
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    # the status descriptions are read when displayed, not in the event loop
+    await hass.async_add_executor_job(read_status_descriptions)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
     """Set up entry."""
     mbapi = ModbusAPI(config_entry=entry)
+    if entry.data.get(CONF.CAPTURE, False):
+        capture_file = Path(
+            hass.config.path(f"{CONST.DOMAIN}_{entry.entry_id}{CONST.CAPTURE_SUFFIX}")
+        )
+        writer = await hass.async_add_executor_job(CaptureWriter, capture_file)
+        mbapi.start_capture(writer)
+        _LOGGER.info("Recording modbus traffic to %s", capture_file)
+
+        async def async_stop_capture(_event: Event) -> None:
+            """Write the buffered records before Home Assistant stops."""
+            mbapi.stop_capture()
+            await hass.async_add_executor_job(writer.join, CAPTURE_STOP_TIMEOUT)
+
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_capture)
+        )
+    if entry.data.get(CONF.METRICS_ENDPOINT, False):
+        async_register_view(hass)
 
     if entry.data[CONF.CB_WEBIF]:
         # print
@@ -54,9 +92,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
     else:
         webapi = None
 
+    devicelists = await load_devicelists(hass, entry)
     itemlist = []
 
-    for device in DEVICELISTS:
+    for device in devicelists:
         for item in device:
             itemlist.append(item)  # noqa: PERF402
 
@@ -72,6 +111,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
         hass=hass,
         coordinator=coordinator,
         powermap=None,
+        devicelists=devicelists,
     )
 
     powermap = PowerMap(entry, hass)
@@ -88,17 +128,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
     # await myWebifCon.close()
     # print(myWebifCon._session.closed)
 
-    hass.add_job(migrate_entities, entry, MODBUS_SYS_ITEMS, DEVICENAMES.SYS)
-    hass.add_job(migrate_entities, entry, MODBUS_HZ_ITEMS, DEVICENAMES.HZ)
-    hass.add_job(migrate_entities, entry, MODBUS_HZ2_ITEMS, DEVICENAMES.HZ2)
-    hass.add_job(migrate_entities, entry, MODBUS_HZ3_ITEMS, DEVICENAMES.HZ3)
-    hass.add_job(migrate_entities, entry, MODBUS_HZ4_ITEMS, DEVICENAMES.HZ4)
-    hass.add_job(migrate_entities, entry, MODBUS_HZ5_ITEMS, DEVICENAMES.HZ5)
-    hass.add_job(migrate_entities, entry, MODBUS_WP_ITEMS, DEVICENAMES.WP)
-    hass.add_job(migrate_entities, entry, MODBUS_WW_ITEMS, DEVICENAMES.WW)
-    hass.add_job(migrate_entities, entry, MODBUS_W2_ITEMS, DEVICENAMES.W2)
-    hass.add_job(migrate_entities, entry, MODBUS_IO_ITEMS, DEVICENAMES.IO)
-    hass.add_job(migrate_entities, entry, MODBUS_ST_ITEMS, DEVICENAMES.ST)
+    for device in devicelists:
+        if len(device) > 0:
+            device_name = getattr(
+                DEVICENAMES, reverse_device_list.get(device[0].device, "UK")
+            )
+            hass.add_job(migrate_entities, entry, device, device_name)
 
     # see https://community.home-assistant.io/t/config-flow-how-to-update-an-existing-entity/522442/8
     entry.async_on_unload(entry.add_update_listener(update_listener))
@@ -109,17 +144,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: MyConfigEntry) -> bool:
     # This creates each HA object for each platform your device requires.
     # It's done by calling the `async_setup_entry` function in each platform module.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.runtime_data.applied_data = dict(entry.data)
+    entry.async_on_unload(watch_recovered(hass, entry))
 
     _LOGGER.info("Init done")
 
     return True
 
 
-async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update listener."""
-    await hass.config_entries.async_reload(
-        entry.entry_id
-    )  # list of entry_ids created for file
+async def load_devicelists(
+    hass: HomeAssistant, entry: MyConfigEntry
+) -> list[list[ModbusItem]]:
+    """Return the modbus item lists of the configured register map."""
+    register_map = entry.data.get(CONF.REGISTER_MAP_FILE, CONST.DEF_REGISTER_MAP)
+    if register_map == CONST.DEF_REGISTER_MAP:
+        # only build the lists of the configured heating circuits
+        circuits = tuple(
+            circuit
+            for circuit, conf in (
+                (2, CONF.HK2),
+                (3, CONF.HK3),
+                (4, CONF.HK4),
+                (5, CONF.HK5),
+            )
+            if entry.data[conf]
+        )
+        return get_devicelists(circuits)
+
+    filepath = Path(f"{get_filepath(hass)}/{register_map}")
+    await hass.async_add_executor_job(
+        remove_register_map_caches, Path(hass.config.path(".storage"))
+    )
+    try:
+        return await hass.async_add_executor_job(load_register_map, filepath)
+    except (OSError, ValueError) as err:
+        raise ConfigEntryError(
+            f"Register map {register_map} could not be loaded: {err}"
+        ) from err
+
+
+async def update_listener(hass: HomeAssistant, entry: MyConfigEntry) -> None:
+    """Apply the changed options, reload the entry only if required."""
+    if entry.state is not ConfigEntryState.LOADED:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    data = entry.runtime_data
+    changed = changed_options(data.applied_data, dict(entry.data))
+    if not changed:
+        return
+    if needs_reload(changed):
+        _LOGGER.info("Options %s changed, reloading", sorted(changed))
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    data.applied_data = dict(entry.data)
+    if CONF.KENNFELD_FILE in changed:
+        await async_apply_kennfeld(hass, entry)
+    if CONF.METRICS_ENDPOINT in changed:
+        apply_metrics_endpoint(hass, entry)
+    if CONF.POLL_INTERVAL_MIN in changed or CONF.POLL_INTERVAL_MAX in changed:
+        apply_poll_bounds(entry)
+    if needs_platform_reload(changed):
+        await async_apply_devices(hass, entry, changed, add=False)
+        if any(option in changed for option in WEBIF_OPTIONS):
+            await async_apply_webif(entry)
+        # the entities are created again, the connection and the coordinator stay
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        data.add_entities.clear()
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    else:
+        await async_apply_devices(hass, entry, changed)
+    _LOGGER.info("Options %s applied without reload", sorted(changed))
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: MyConfigEntry):
@@ -173,6 +268,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # needs to unload itself, and remove callbacks. See the classes for further
     # details
     entry.runtime_data.modbus_api.close()
+    entry.runtime_data.modbus_api.stop_capture()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         try:
@@ -193,7 +289,7 @@ def create_string_json() -> None:
 
     # generate list of all mbitems
     DEVICELIST: list[ModbusItem] = []
-    for devicelist in DEVICELISTS:
+    for devicelist in get_devicelists():
         DEVICELIST = DEVICELIST + devicelist
 
     for item in DEVICELIST:
@@ -0,0 +1,435 @@
+"""Capture and replay of the modbus traffic.
+
+With capture enabled every request and its response is appended to a binary
+file. The file can be attached to bug reports and served back to the
+integration by ReplayModbusClient, which makes it possible to reproduce a
+problem or to benchmark the integration without a heat pump.
+
+File layout (little endian): the 8 byte CAPTURE_MAGIC followed by records of
+
+    int64   time of the request in ns since the epoch
+    uint8   function code of the request
+    uint8   exception code of the response, 0 for a valid response and
+            NO_RESPONSE when the request failed without a response
+    uint16  register address
+    uint16  count (read requests) or value (write request)
+    uint8   number of registers of the response
+    uint16  registers of the response
+
+Records are only appended, a record that was cut off at the end of the file
+is ignored when the file is read. The records are written at the latest
+FLUSH_SECONDS after the request, so a crash loses at most the last ones. A
+file that reaches MAX_CAPTURE_BYTES is renamed to "<file>.1", replacing an
+older one, and a new file is started.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from functools import cache
+import logging
+import mmap
+from pathlib import Path
+import queue
+import struct
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, NamedTuple
+
+from pymodbus import ModbusException
+from pymodbus.exceptions import ModbusIOException
+
+from .slim_modbus import (
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    FC_WRITE_REGISTER,
+    SlimModbusResponse,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"WMCAP\x01\r\n"
+NO_RESPONSE = 0xFF
+ILLEGAL_ADDRESS = 2
+# size of a capture file before it is rotated, about 5 days of polling
+MAX_CAPTURE_BYTES = 32 * 1024 * 1024
+# seconds a record stays in the buffer at most, about one poll cycle
+FLUSH_SECONDS = 30
+
+_RECORD = struct.Struct("<qBBHHB")
+
+
+@cache
+def _registers_struct(count: int) -> struct.Struct:
+    """Return a precompiled struct for count registers."""
+    return struct.Struct(f"<{count}H")
+
+
+class CaptureRecord(NamedTuple):
+    """A request and its response."""
+
+    timestamp_ns: int
+    function_code: int
+    exception_code: int
+    address: int
+    value: int
+    registers: tuple[int, ...]
+
+
+class CaptureWriter:
+    """Appends records to a capture file.
+
+    The records are collected in memory. A buffer that is full or holds a
+    record older than FLUSH_SECONDS is handed to a writer thread, so the
+    poll loop never waits for the disk. Opening the file is blocking I/O.
+    The thread is a daemon and does not keep the interpreter alive, close()
+    has to be called before Home Assistant stops to write the last records.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        buffer_size: int = 65536,
+        max_bytes: int = MAX_CAPTURE_BYTES,
+    ) -> None:
+        """Open the capture file for appending.
+
+        Args:
+            filepath: capture file, created if it does not exist
+            buffer_size: size of the write buffer in bytes
+            max_bytes: size of the file before it is rotated
+
+        """
+        self.filepath: Path = filepath
+        self.records: int = 0
+        self.rotations: int = 0
+        self._buffer_size: int = buffer_size
+        self._max_bytes: int = max_bytes
+        self._buffer = bytearray()
+        # time of the request after which the buffer is flushed
+        self._flush_due_ns: int = 0
+        self._closed: bool = False
+        # chunks of whole records, None closes the file
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._file: BinaryIO = self._open()
+        self._thread = threading.Thread(
+            target=self._run, name="weishaupt_modbus_capture", daemon=True
+        )
+        self._thread.start()
+
+    def _open(self) -> BinaryIO:
+        """Open the capture file and write the magic to a new one."""
+        file = self.filepath.open("ab")
+        if file.tell() == 0:
+            file.write(CAPTURE_MAGIC)
+        return file
+
+    def write(
+        self,
+        function_code: int,
+        address: int,
+        value: int,
+        exception_code: int = 0,
+        registers: tuple[int, ...] | list[int] = (),
+        *,
+        timestamp_ns: int | None = None,
+    ) -> None:
+        """Append one record, timestamp_ns defaults to now."""
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        if not self._buffer:
+            self._flush_due_ns = timestamp_ns + FLUSH_SECONDS * 1_000_000_000
+        count = len(registers)
+        self._buffer += _RECORD.pack(
+            timestamp_ns,
+            function_code,
+            exception_code,
+            address,
+            value,
+            count,
+        )
+        if count:
+            self._buffer += _registers_struct(count).pack(*registers)
+        self.records += 1
+        if len(self._buffer) >= self._buffer_size or timestamp_ns >= self._flush_due_ns:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the buffered records to the writer thread."""
+        if self._buffer and not self._closed:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Hand the buffered records to the writer thread and close the file."""
+        if not self._closed:
+            self.flush()
+            self._closed = True
+            self._queue.put(None)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait until the writer thread has closed the file."""
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Write the chunks of the queue to the file, runs in the writer thread."""
+        while (chunk := self._queue.get()) is not None:
+            try:
+                position = self._file.tell()
+                if (
+                    position > len(CAPTURE_MAGIC)
+                    and position + len(chunk) > self._max_bytes
+                ):
+                    self._rotate()
+                self._file.write(chunk)
+                self._file.flush()
+            except OSError as err:
+                _LOGGER.warning(
+                    "Writing capture file %s failed: %s", self.filepath, err
+                )
+        self._file.close()
+
+    def _rotate(self) -> None:
+        """Rename the full capture file to "<file>.1" and start a new one."""
+        self._file.close()
+        self.filepath.replace(self.filepath.with_name(f"{self.filepath.name}.1"))
+        self._file = self._open()
+        self.rotations += 1
+        _LOGGER.info("Capture file %s rotated", self.filepath)
+
+
+def read_capture(filepath: Path) -> Iterator[CaptureRecord]:
+    """Iterate over the records of a capture file.
+
+    The file is memory mapped, so large captures are not read into memory.
+    """
+    with filepath.open("rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{filepath} is not a modbus capture file")
+        size = file.seek(0, 2)
+        if size == len(CAPTURE_MAGIC):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = len(CAPTURE_MAGIC)
+            while offset + _RECORD.size <= size:
+                timestamp, function_code, exception_code, address, value, count = (
+                    _RECORD.unpack_from(data, offset)
+                )
+                offset += _RECORD.size
+                if offset + 2 * count > size:
+                    _LOGGER.debug("Ignoring incomplete record at end of %s", filepath)
+                    return
+                registers = _registers_struct(count).unpack_from(data, offset)
+                offset += 2 * count
+                yield CaptureRecord(
+                    timestamp, function_code, exception_code, address, value, registers
+                )
+
+
+class CapturingModbusClient:
+    """Wraps a modbus client and records all requests to a CaptureWriter."""
+
+    def __init__(self, client: Any, writer: CaptureWriter) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            client: AsyncModbusTcpClient or SlimModbusTcpClient
+            writer: the records are written here
+
+        """
+        self.client = client
+        self.writer: CaptureWriter = writer
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection is established."""
+        return self.client.connected
+
+    async def connect(self) -> bool:
+        """Open the connection."""
+        return await self.client.connect()
+
+    def close(self) -> None:
+        """Close the connection, the capture file stays open for reconnects."""
+        self.client.close()
+        self.writer.flush()
+
+    async def _execute(
+        self, function_code: int, address: int, value: int, request: Any
+    ) -> Any:
+        """Send the request and record it with its response."""
+        timestamp = time.time_ns()
+        try:
+            response = await request
+        except ModbusException:
+            self.writer.write(
+                function_code, address, value, NO_RESPONSE, timestamp_ns=timestamp
+            )
+            raise
+        if response.isError():
+            self.writer.write(
+                function_code,
+                address,
+                value,
+                response.exception_code,
+                timestamp_ns=timestamp,
+            )
+        else:
+            self.writer.write(
+                function_code,
+                address,
+                value,
+                0,
+                response.registers,
+                timestamp_ns=timestamp,
+            )
+        return response
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> Any:
+        """Read holding registers (FC03)."""
+        return await self._execute(
+            FC_READ_HOLDING_REGISTERS,
+            address,
+            count,
+            self.client.read_holding_registers(address, count=count, slave=slave),
+        )
+
+    async def read_input_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> Any:
+        """Read input registers (FC04)."""
+        return await self._execute(
+            FC_READ_INPUT_REGISTERS,
+            address,
+            count,
+            self.client.read_input_registers(address, count=count, slave=slave),
+        )
+
+    async def write_register(self, address: int, value: int, *, slave: int = 1) -> Any:
+        """Write a single holding register (FC06)."""
+        return await self._execute(
+            FC_WRITE_REGISTER,
+            address,
+            value,
+            self.client.write_register(address, value, slave=slave),
+        )
+
+
+class ReplayModbusClient:
+    """Modbus client that answers with the responses of a capture file.
+
+    The responses of each function code and address are served in the order
+    they were recorded, starting again with the first one when all were
+    served. Addresses that are not in the capture answer with exception
+    code 2 like the heat pump does. Writes are acknowledged without being
+    recorded.
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        """Initialize the client, the file is read on connect.
+
+        Args:
+            filepath: capture file written by CaptureWriter
+
+        """
+        self._filepath: Path = filepath
+        self._responses: dict[tuple[int, int], list[CaptureRecord]] | None = None
+        self._positions: dict[tuple[int, int], int] = {}
+        self._connected: bool = False
+
+    @property
+    def connected(self) -> bool:
+        """Return True after connect."""
+        return self._connected
+
+    def _load(self) -> dict[tuple[int, int], list[CaptureRecord]]:
+        """Group the records of the capture file by function code and address."""
+        responses: dict[tuple[int, int], list[CaptureRecord]] = {}
+        for record in read_capture(self._filepath):
+            if record.function_code != FC_WRITE_REGISTER:
+                responses.setdefault((record.function_code, record.address), []).append(
+                    record
+                )
+        return responses
+
+    async def connect(self) -> bool:
+        """Read the capture file, returns False if it can not be read."""
+        if self._responses is None:
+            try:
+                self._responses = await asyncio.get_running_loop().run_in_executor(
+                    None, self._load
+                )
+            except (OSError, ValueError) as exc:
+                _LOGGER.warning("Capture file could not be read: %s", exc)
+                return False
+        self._connected = True
+        return True
+
+    def close(self) -> None:
+        """Close the connection, the replay position is kept."""
+        self._connected = False
+
+    def _replay(self, function_code: int, address: int) -> SlimModbusResponse:
+        """Return the next recorded response for the request."""
+        if not self._connected or self._responses is None:
+            raise ModbusIOException("Not connected", function_code)
+        key = (function_code, address)
+        records = self._responses.get(key)
+        if not records:
+            return SlimModbusResponse(function_code | 0x80, (), ILLEGAL_ADDRESS)
+        position = self._positions.get(key, 0)
+        self._positions[key] = (position + 1) % len(records)
+        record = records[position]
+        if record.exception_code == NO_RESPONSE:
+            raise ModbusIOException(f"No response for address {address}", function_code)
+        if record.exception_code:
+            return SlimModbusResponse(function_code | 0x80, (), record.exception_code)
+        return SlimModbusResponse(function_code, record.registers)
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Replay a read of holding registers (FC03)."""
+        return self._replay(FC_READ_HOLDING_REGISTERS, address)
+
+    async def read_input_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Replay a read of input registers (FC04)."""
+        return self._replay(FC_READ_INPUT_REGISTERS, address)
+
+    async def write_register(
+        self, address: int, value: int, *, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Acknowledge a write of a single holding register (FC06)."""
+        if not self._connected:
+            raise ModbusIOException("Not connected", FC_WRITE_REGISTER)
+        return SlimModbusResponse(FC_WRITE_REGISTER, (value,))
+
+
+def summarize_capture(filepath: Path) -> str:
+    """Return a one line summary of a capture file."""
+    records = 0
+    errors = 0
+    addresses: set[int] = set()
+    first = last = 0
+    for record in read_capture(filepath):
+        if records == 0:
+            first = record.timestamp_ns
+        last = record.timestamp_ns
+        records += 1
+        errors += record.exception_code != 0
+        addresses.add(record.address)
+    return (
+        f"{records} records, {len(addresses)} addresses, {errors} errors, "
+        f"{(last - first) / 1e9:.0f} s"
+    )
+
+
+if __name__ == "__main__":
+    # python -m custom_components.weishaupt_modbus.capture <file>
+    print(summarize_capture(Path(sys.argv[1])))  # noqa: T201
@@ -10,7 +10,9 @@ from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
 
 from .const import CONF, CONST
+from .detect import async_detect_devices
 from .kennfeld import get_filepath
+from .register_helpers import OPTIONAL_DEVICES
 
 
 async def build_kennfeld_list(hass: HomeAssistant):
@@ -38,6 +40,19 @@ async def build_kennfeld_list(hass: HomeAssistant):
     return kennfelder
 
 
+async def build_register_map_list(hass: HomeAssistant) -> list[str]:
+    """Browse integration directory for register map files."""
+    register_maps = [CONST.DEF_REGISTER_MAP]
+
+    dir_iterator = await scandir(get_filepath(hass))
+
+    for item in dir_iterator:
+        if item.name.endswith("registers.json"):
+            register_maps.append(item.name)  # noqa: PERF401
+
+    return register_maps
+
+
 async def validate_input(data: dict[str, Any]) -> dict[str, Any]:
     """Validate the input."""
     # Validate the data can be used to set up a connection.
@@ -47,6 +62,7 @@ async def validate_input(data: dict[str, Any]) -> dict[str, Any]:
     # `async_step_user` method below.
     if len(data["host"]) < 3:
         raise InvalidHost
+    validate_poll_interval(data)
 
     # If your PyPI package is not built with async, pass your methods
     # to the executor:
@@ -66,6 +82,24 @@ async def validate_input(data: dict[str, Any]) -> dict[str, Any]:
     return {"title": data["host"]}
 
 
+def validate_poll_interval(data: dict[str, Any]) -> None:
+    """Raise PollIntervalRange if the longest interval is below the shortest."""
+    if data.get(CONF.POLL_INTERVAL_MAX, CONST.DEF_POLL_INTERVAL_MAX) < data.get(
+        CONF.POLL_INTERVAL_MIN, CONST.SCAN_INTERVAL.total_seconds()
+    ):
+        raise PollIntervalRange
+
+
+def devices_schema(defaults: dict[str, bool]) -> vol.Schema:
+    """Return the schema of the optional devices with the given defaults."""
+    return vol.Schema(
+        schema={
+            vol.Optional(schema=flag, default=defaults[flag]): bool
+            for flag in OPTIONAL_DEVICES.values()
+        }
+    )
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: disable=abstract-method
     """Class config flow."""
 
@@ -76,6 +110,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
     # changes.
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._title: str = ""
+        self._data: dict[str, Any] = {}
+        self._detected: dict[str, bool] | None = None
+
     async def async_step_user(self, user_input=None) -> config_entries.ConfigFlowResult:
         """Step for setup process."""
         # This goes through the steps to take the user through the setup process.
@@ -98,16 +138,25 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
                 vol.Optional(
                     schema=CONF.KENNFELD_FILE, default="weishaupt_wbb_kennfeld.json"
                 ): vol.In(container=await build_kennfeld_list(self.hass)),
-                vol.Optional(schema=CONF.HK2, default=False): bool,
-                vol.Optional(schema=CONF.HK3, default=False): bool,
-                vol.Optional(schema=CONF.HK4, default=False): bool,
-                vol.Optional(schema=CONF.HK5, default=False): bool,
+                vol.Optional(
+                    schema=CONF.REGISTER_MAP_FILE, default=CONST.DEF_REGISTER_MAP
+                ): vol.In(container=await build_register_map_list(self.hass)),
                 vol.Optional(schema=CONF.NAME_DEVICE_PREFIX, default=False): bool,
                 vol.Optional(schema=CONF.NAME_TOPIC_PREFIX, default=False): bool,
                 vol.Optional(schema=CONF.CB_WEBIF, default=False): bool,
                 vol.Optional(schema=CONF.USERNAME, default=""): str,
                 vol.Optional(schema=CONF.PASSWORD, default=""): str,
                 vol.Optional(schema=CONF.WEBIF_TOKEN, default=""): str,
+                vol.Optional(schema=CONF.FAST_TRANSPORT, default=False): bool,
+                vol.Optional(schema=CONF.CAPTURE, default=False): bool,
+                vol.Optional(schema=CONF.METRICS_ENDPOINT, default=False): bool,
+                vol.Optional(
+                    schema=CONF.POLL_INTERVAL_MIN,
+                    default=int(CONST.SCAN_INTERVAL.total_seconds()),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Optional(
+                    schema=CONF.POLL_INTERVAL_MAX, default=CONST.DEF_POLL_INTERVAL_MAX
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
             }
         )
 
@@ -116,9 +165,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
         if user_input is not None:
             try:
                 info = await validate_input(data=user_input)
-
-                return self.async_create_entry(title=info["title"], data=user_input)
-
+                self._title = info["title"]
+                self._data = user_input
+                self._detected = await async_detect_devices(
+                    user_input[CONF.HOST], user_input[CONF.PORT]
+                )
+                return await self.async_step_devices()
+
+            except PollIntervalRange:
+                errors[CONF.POLL_INTERVAL_MAX] = "poll_interval_range"
             except Exception:  # noqa: BLE001
                 errors["base"] = "unknown error"
 
@@ -128,6 +183,31 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
             step_id="user", data_schema=data_schema, errors=errors
         )
 
+    async def async_step_devices(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Step to confirm the detected heating circuits and heat generator."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=self._title,
+                data={
+                    **self._data,
+                    **user_input,
+                    CONF.DETECTED_DEVICES: self._detected,
+                },
+            )
+
+        # without a connection nothing is preselected except the second heat
+        # generator, which was always polled before the detection
+        defaults = self._detected or {
+            flag: flag == CONF.W2 for flag in OPTIONAL_DEVICES.values()
+        }
+        return self.async_show_form(
+            step_id="devices",
+            data_schema=devices_schema(defaults),
+            errors={} if self._detected is not None else {"base": "cannot_connect"},
+        )
+
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -138,9 +218,25 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
         )
 
         if user_input:
-            return self.async_update_reload_and_abort(
-                entry=reconfigure_entry, data_updates=user_input
-            )
+            try:
+                validate_poll_interval(user_input)
+            except PollIntervalRange:
+                errors[CONF.POLL_INTERVAL_MAX] = "poll_interval_range"
+            else:
+                # the update listener applies the changes, it reloads only if needed
+                return self.async_update_and_abort(
+                    entry=reconfigure_entry,
+                    data_updates={**user_input, CONF.DETECTED_DEVICES: self._detected},
+                )
+
+        # preselect the devices found now, the stored flags without connection
+        self._detected = await async_detect_devices(
+            reconfigure_entry.data[CONF.HOST], reconfigure_entry.data[CONF.PORT]
+        )
+        defaults = self._detected or {
+            flag: reconfigure_entry.data.get(flag, flag == CONF.W2)
+            for flag in OPTIONAL_DEVICES.values()
+        }
 
         schema_reconfigure = vol.Schema(
             schema={
@@ -163,17 +259,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
                     default=reconfigure_entry.data[CONF.KENNFELD_FILE],
                 ): vol.In(container=await build_kennfeld_list(hass=self.hass)),
                 vol.Optional(
-                    schema=CONF.HK2, default=reconfigure_entry.data[CONF.HK2]
-                ): bool,
-                vol.Optional(
-                    schema=CONF.HK3, default=reconfigure_entry.data[CONF.HK3]
-                ): bool,
-                vol.Optional(
-                    schema=CONF.HK4, default=reconfigure_entry.data[CONF.HK4]
-                ): bool,
-                vol.Optional(
-                    schema=CONF.HK5, default=reconfigure_entry.data[CONF.HK5]
-                ): bool,
+                    schema=CONF.REGISTER_MAP_FILE,
+                    default=reconfigure_entry.data.get(
+                        CONF.REGISTER_MAP_FILE, CONST.DEF_REGISTER_MAP
+                    ),
+                ): vol.In(container=await build_register_map_list(hass=self.hass)),
+                **devices_schema(defaults).schema,
                 vol.Optional(
                     schema=CONF.NAME_DEVICE_PREFIX,
                     default=reconfigure_entry.data[CONF.NAME_DEVICE_PREFIX],
@@ -195,9 +286,39 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
                     schema=CONF.WEBIF_TOKEN,
                     default=reconfigure_entry.data[CONF.WEBIF_TOKEN],
                 ): str,
+                vol.Optional(
+                    schema=CONF.FAST_TRANSPORT,
+                    default=reconfigure_entry.data.get(CONF.FAST_TRANSPORT, False),
+                ): bool,
+                vol.Optional(
+                    schema=CONF.CAPTURE,
+                    default=reconfigure_entry.data.get(CONF.CAPTURE, False),
+                ): bool,
+                vol.Optional(
+                    schema=CONF.METRICS_ENDPOINT,
+                    default=reconfigure_entry.data.get(CONF.METRICS_ENDPOINT, False),
+                ): bool,
+                vol.Optional(
+                    schema=CONF.POLL_INTERVAL_MIN,
+                    default=reconfigure_entry.data.get(
+                        CONF.POLL_INTERVAL_MIN, int(CONST.SCAN_INTERVAL.total_seconds())
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Optional(
+                    schema=CONF.POLL_INTERVAL_MAX,
+                    default=reconfigure_entry.data.get(
+                        CONF.POLL_INTERVAL_MAX, CONST.DEF_POLL_INTERVAL_MAX
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
             }
         )
 
+        if user_input:
+            # show the rejected input again
+            schema_reconfigure = self.add_suggested_values_to_schema(
+                schema_reconfigure, user_input
+            )
+
         return self.async_show_form(
             step_id="reconfigure",
             data_schema=schema_reconfigure,
@@ -207,10 +328,23 @@ class ConfigFlow(config_entries.ConfigFlow, domain=CONST.DOMAIN):  # pylint: dis
             },
         )
 
+    def async_update_and_abort(
+        self, entry: config_entries.ConfigEntry[Any], data_updates: dict[str, Any]
+    ) -> config_entries.ConfigFlowResult:
+        """Update the entry without a reload and finish the flow."""
+        self.hass.config_entries.async_update_entry(
+            entry, data={**entry.data, **data_updates}
+        )
+        return self.async_abort(reason="reconfigure_successful")
+
 
 class InvalidHost(exceptions.HomeAssistantError):
     """Error to indicate there is an invalid hostname."""
 
 
+class PollIntervalRange(exceptions.HomeAssistantError):
+    """Error to indicate the longest poll interval is below the shortest."""
+
+
 class ConnectionFailed(exceptions.HomeAssistantError):
     """Error to indicate there is an invalid hostname."""
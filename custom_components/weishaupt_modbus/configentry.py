@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -21,6 +21,11 @@ class MyData:
     hass: HomeAssistant
     coordinator: Any  # MyCoordinator
     powermap: Any
+    devicelists: list[Any]  # list[list[ModbusItem]]
+    # entry data the integration was set up with, see options.py
+    applied_data: dict[str, Any] = field(default_factory=dict)
+    # async_add_entities callback of each platform
+    add_entities: dict[str, Any] = field(default_factory=dict)
 
 
 type MyConfigEntry = ConfigEntry[MyData]
@@ -25,12 +25,21 @@ class ConfConstants:
     HK3: str = "Heizkreis 3"
     HK4: str = "Heizkreis 4"
     HK5: str = "Heizkreis 5"
+    W2: str = "Waermeerzeuger 2"
     NAME_DEVICE_PREFIX: str = "Name-Device-Prefix"
     NAME_TOPIC_PREFIX: str = "Name-Topic-Prefix"
     CB_WEBIF: str = "enable-webif"
     PASSWORD: str = CONF_PASSWORD
     USERNAME: str = CONF_USERNAME
     WEBIF_TOKEN: str = "Web-IF-Token"
+    FAST_TRANSPORT: str = "Fast-Transport"
+    REGISTER_MAP_FILE: str = "Register-Map-File"
+    CAPTURE: str = "Capture-Modbus"
+    REPLAY_FILE: str = "Replay-File"
+    METRICS_ENDPOINT: str = "Metrics-Endpoint"
+    DETECTED_DEVICES: str = "Detected-Devices"
+    POLL_INTERVAL_MIN: str = "Poll-Interval-Min"
+    POLL_INTERVAL_MAX: str = "Poll-Interval-Max"
 
 
 CONF = ConfConstants()
@@ -42,9 +51,13 @@ class MainConstants:
 
     DOMAIN: str = "weishaupt_modbus"
     SCAN_INTERVAL: timedelta = timedelta(seconds=30)
+    # upper bound of the poll interval the governor backs off to, in seconds
+    DEF_POLL_INTERVAL_MAX: int = 300
     UNIQUE_ID: str = "unique_id"
     APPID: int = 100
     DEF_KENNFELDFILE: str = "weishaupt_wbb_kennfeld.json"
+    DEF_REGISTER_MAP: str = "builtin"
+    CAPTURE_SUFFIX: str = ".modbus_capture"
     DEF_PREFIX: str = "weishaupt_wbb"
 
 
@@ -13,12 +13,24 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .configentry import MyConfigEntry
 from .const import CONF, CONST, DeviceConstants, TYPES
+from .governor import PollGovernor
 from .items import ModbusItem
-from .modbusobject import ModbusAPI, ModbusObject
+from .modbusobject import HEARTBEAT_IDLE, ModbusAPI, ModbusObject
 from .webif_object import WebifConnection
 
 _LOGGER = logging.getLogger(__name__)
 
+# seconds a poll cycle may take
+CYCLE_TIMEOUT = 10.0
+
+# requests without answer in a row after which the connection is checked with
+# a heartbeat. A dead connection aborts the cycle after the request, the
+# heartbeat and a reconnect, well within CYCLE_TIMEOUT: a gateway that accepts
+# the new connection fails its heartbeat (REQUEST_TIMEOUT + 2 * HEARTBEAT_TIMEOUT,
+# 6 s), a gateway that is gone fails the connect (2 * REQUEST_TIMEOUT +
+# HEARTBEAT_TIMEOUT, 7.5 s)
+DEAD_LINK_ERRORS = 1
+
 
 async def check_configured(
     modbus_item: ModbusItem, config_entry: MyConfigEntry
@@ -33,10 +45,23 @@ async def check_configured(
             return config_entry.data[CONF.HK4]
         case DeviceConstants.HZ5:
             return config_entry.data[CONF.HK5]
+        case DeviceConstants.W2:
+            # entries created before the device detection poll the W2 items
+            return config_entry.data.get(CONF.W2, True)
         case _:
             return True
 
 
+def poll_bounds(config_entry: MyConfigEntry) -> tuple[float, float]:
+    """Return the configured bounds of the poll interval in seconds."""
+    return (
+        config_entry.data.get(
+            CONF.POLL_INTERVAL_MIN, CONST.SCAN_INTERVAL.total_seconds()
+        ),
+        config_entry.data.get(CONF.POLL_INTERVAL_MAX, CONST.DEF_POLL_INTERVAL_MAX),
+    )
+
+
 class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Modbus coordinator for Weishaupt heat pump."""
 
@@ -52,7 +77,7 @@ class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass,
             _LOGGER,
             name="weishaupt-coordinator",
-            update_interval=CONST.SCAN_INTERVAL,
+            update_interval=timedelta(seconds=poll_bounds(p_config_entry)[0]),
             always_update=True,
         )
         self._modbus_api = my_api
@@ -60,23 +85,27 @@ class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._modbusitems = api_items
         self._number_of_items = len(api_items)
         self._config_entry = p_config_entry
+        self.governor = PollGovernor(*poll_bounds(p_config_entry))
 
     async def get_value(self, modbus_item: ModbusItem) -> Any:
         """Read a value from the modbus."""
         mbo = ModbusObject(self._modbus_api, modbus_item)
-        if mbo is None:
-            modbus_item.state = None
-        else:
-            modbus_item.state = await mbo.value
-        return modbus_item.state
+        value = None if mbo is None else await mbo.value
+        self._modbus_api.states.set_state(modbus_item, value)
+        return value
 
     def get_value_from_item(self, translation_key: str) -> Any:
         """Read a value from another modbus item."""
         for item in self._modbusitems:
             if item.translation_key == translation_key:
-                return item.state
+                return self._modbus_api.states.get_state(item)
         return None
 
+    def add_items(self, items: list[ModbusItem]) -> None:
+        """Poll additional items from the next cycle on."""
+        self._modbusitems.extend(items)
+        self._number_of_items = len(self._modbusitems)
+
     async def _async_setup(self) -> None:
         """Set up the coordinator."""
         if self._modbus_api._modbus_client is None:  # noqa: SLF001
@@ -99,6 +128,9 @@ class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return {}
 
         results: dict[str, Any] = {}
+        pause = self.governor.pause_per_request(len(to_update), CYCLE_TIMEOUT)
+        metrics = self._modbus_api.metrics
+        reconnected = False
 
         for index in to_update:
             if index >= len(self._modbusitems):
@@ -117,9 +149,26 @@ class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     | TYPES.SELECT
                     | TYPES.SENSOR_CALC
                 ):
+                    if pause:
+                        # the heat pump struggled, give it time between requests
+                        await asyncio.sleep(pause)
                     value = await self.get_value(item)
                     results[item.translation_key] = value
 
+            if self._modbus_api.connected and (
+                metrics.consecutive_errors < DEAD_LINK_ERRORS
+                # a register without answer does not make the connection dead
+                or await self._modbus_api.heartbeat()
+            ):
+                continue
+            # one fast reconnect, then the cycle is not wasted on timeouts
+            if reconnected or not await self._modbus_api.reconnect():
+                # the connection failed, not the register
+                self._modbus_api.health.forgive(item)
+                _LOGGER.debug("Connection lost, poll cycle aborted")
+                break
+            reconnected = True
+
         return results
 
     async def _ensure_connection(self) -> bool:
@@ -133,12 +182,19 @@ class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if not status:
                 _LOGGER.debug("Connection retry failed")
                 return False
+            return True
+
+        # a half-open connection still reports connected, check an idle one
+        if self._modbus_api.idle_time() > HEARTBEAT_IDLE:
+            if not await self._modbus_api.heartbeat():
+                return await self._modbus_api.reconnect()
         return True
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API endpoint."""
+        cycle = self._modbus_api.metrics.start_cycle()
         try:
-            async with asyncio.timeout(10):
+            async with asyncio.timeout(CYCLE_TIMEOUT):
                 listening_idx = set(self.async_contexts())
                 return await self.fetch_data()  # listening_idx)
         except ModbusException as err:
@@ -147,12 +203,33 @@ class MyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         except TimeoutError as err:
             _LOGGER.debug("Timeout while fetching data: %s", err)
             return {}
+        finally:
+            self._modbus_api.metrics.end_cycle(cycle)
+            self._govern()
+
+    def _govern(self) -> None:
+        """Adapt the poll interval to the answers of the last cycle."""
+        metrics = self._modbus_api.metrics
+        self.governor.update(
+            metrics.last_cycle_requests,
+            metrics.last_cycle_overloads,
+            metrics.last_cycle_latency,
+        )
+        metrics.poll_interval = self.governor.interval
+        # benchmarks and tests trigger the cycles themselves
+        if self.update_interval is not None:
+            self.update_interval = timedelta(seconds=self.governor.interval)
 
     @property
     def modbus_api(self) -> ModbusAPI:
         """Return modbus API."""
         return self._modbus_api
 
+    @property
+    def modbus_items(self) -> list[ModbusItem]:
+        """Return the items polled by the coordinator."""
+        return self._modbusitems
+
 
 class MyWebIfCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """WebIF coordinator for Weishaupt heat pump."""
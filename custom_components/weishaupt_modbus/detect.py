@@ -0,0 +1,85 @@
+"""Detection of the optional devices of a heat pump.
+
+The heating circuits 2-5 and the second heat generator have their own
+register blocks, e.g. 31201-31206 and 41201-41212 of heating circuit 2.
+Each block is read with one request. A heating circuit exists if its blocks
+answer and its configuration register is not 0 ("aus"), the registers of
+unused circuits answer as well. The second heat generator exists if its
+blocks answer.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from pymodbus import ModbusException
+
+from .const import TYPES
+from .hpconst import HZ_KONFIGURATION, get_devicelists
+from .register_helpers import (
+    BLOCK_SIZE,
+    OPTIONAL_DEVICES,
+    contiguous_blocks,
+    function_code_of,
+)
+from .slim_modbus import FC_READ_HOLDING_REGISTERS, SlimModbusTcpClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _device_registers() -> dict[str, tuple[list[tuple[int, int]], int | None]]:
+    """Return the blocks and the configuration register of each device."""
+    registers: dict[str, tuple[list[tuple[int, int]], int | None]] = {}
+    devicelists = get_devicelists()
+    for device in OPTIONAL_DEVICES:
+        items = [
+            item
+            for items in devicelists
+            for item in items
+            if item.device == device and item.type != TYPES.SENSOR_CALC
+        ]
+        configuration = next(
+            (item.address for item in items if item.resultlist is HZ_KONFIGURATION),
+            None,
+        )
+        registers[device] = (
+            contiguous_blocks((item.address for item in items), BLOCK_SIZE),
+            configuration,
+        )
+    return registers
+
+
+async def async_detect_devices(
+    host: str, port: int, timeout: float = 3.0
+) -> dict[str, bool] | None:
+    """Return the configuration flag of each optional device.
+
+    Returns None if the heat pump can not be reached.
+    """
+    client = SlimModbusTcpClient(host, port, timeout=timeout)
+    if not await client.connect():
+        _LOGGER.debug("Device detection: no connection to %s:%s", host, port)
+        return None
+    detected: dict[str, bool] = {}
+    try:
+        for device, (blocks, configuration) in _device_registers().items():
+            present = bool(blocks)
+            for first, count in blocks:
+                if function_code_of(first) == FC_READ_HOLDING_REGISTERS:
+                    response = await client.read_holding_registers(first, count=count)
+                else:
+                    response = await client.read_input_registers(first, count=count)
+                if response.isError():
+                    present = False
+                    break
+                if configuration is not None and first <= configuration < first + count:
+                    # the circuit is switched off in the configuration
+                    present = response.registers[configuration - first] != 0
+            detected[OPTIONAL_DEVICES[device]] = present
+    except ModbusException as exc:
+        _LOGGER.debug("Device detection failed: %s", exc)
+        return None
+    finally:
+        client.close()
+    _LOGGER.debug("Detected devices: %s", detected)
+    return detected
@@ -0,0 +1,173 @@
+"""Diagnostics of the Weishaupt modbus integration.
+
+The snapshot is built from the values kept in memory by the integration, no
+request is sent to the heat pump or the WebIF, so it can be downloaded while
+the poll loop is busy.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .configentry import MyConfigEntry
+from .const import CONF, TYPES
+from .coordinator import check_configured
+from .governor import PollGovernor
+from .items import ModbusItem
+from .metrics import LatencyHistogram, ModbusMetrics
+from .slim_modbus import FC_READ_HOLDING_REGISTERS, FC_READ_INPUT_REGISTERS
+
+TO_REDACT = {CONF.USERNAME, CONF.PASSWORD, CONF.WEBIF_TOKEN}
+
+# characters of the availability bitmap
+AVAILABLE = "1"
+UNAVAILABLE = "0"
+NOT_POLLED = "-"
+
+
+def _timestamp(value: float) -> str:
+    """Return a time.time() value as ISO string."""
+    return dt_util.utc_from_timestamp(value).isoformat()
+
+
+def _histogram(histogram: LatencyHistogram) -> dict[str, Any]:
+    """Return count, sum and percentiles of a latency histogram in seconds."""
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "p50": histogram.percentile(0.5),
+        "p95": histogram.percentile(0.95),
+    }
+
+
+def _function_code(item: ModbusItem) -> int:
+    """Return the function code used to read item."""
+    if item.type in (TYPES.SENSOR, TYPES.SENSOR_CALC):
+        return FC_READ_INPUT_REGISTERS
+    return FC_READ_HOLDING_REGISTERS
+
+
+async def _read_plan(
+    entry: MyConfigEntry, items: list[ModbusItem], metrics: ModbusMetrics
+) -> dict[str, Any]:
+    """Return the polled items, their availability and their last values."""
+    states = entry.runtime_data.modbus_api.states
+    values = states.get_states()
+    ages = metrics.data_ages()
+    plan: list[dict[str, Any]] = []
+    bitmap: list[str] = []
+    shadow: dict[str, dict[str, Any]] = {}
+    for item in items:
+        polled = await check_configured(item, entry)
+        plan.append(
+            {
+                "address": item.address,
+                "function_code": _function_code(item),
+                "device": item.device,
+                "key": item.translation_key,
+                "polled": polled,
+            }
+        )
+        if not polled:
+            bitmap.append(NOT_POLLED)
+        elif states.is_invalid(item):
+            bitmap.append(UNAVAILABLE)
+        else:
+            bitmap.append(AVAILABLE)
+        if item in values:
+            age = ages.get(item)
+            shadow[str(item.address)] = {
+                "key": item.translation_key,
+                "value": values[item],
+                "age": None if age is None else round(age, 3),
+            }
+    return {
+        "read_plan": plan,
+        "availability": {
+            "bitmap": "".join(bitmap),
+            "available": bitmap.count(AVAILABLE),
+            "unavailable": bitmap.count(UNAVAILABLE),
+            "not_polled": bitmap.count(NOT_POLLED),
+        },
+        "register_shadow": shadow,
+    }
+
+
+def _cycles(metrics: ModbusMetrics) -> dict[str, Any]:
+    """Return the timings of the poll cycles."""
+    return {
+        "cycles": metrics.cycles,
+        "durations": _histogram(metrics.cycle_durations),
+        "recent": [
+            {
+                "time": _timestamp(timestamp),
+                "duration": round(duration, 4),
+                "requests": requests,
+                "errors": errors,
+            }
+            for timestamp, duration, requests, errors in metrics.cycle_history
+        ],
+        "requests": {
+            str(function_code): _histogram(histogram)
+            for function_code, histogram in metrics.by_function_code().items()
+        },
+    }
+
+
+def _connection(entry: MyConfigEntry, metrics: ModbusMetrics) -> dict[str, Any]:
+    """Return the state and the history of the modbus connection."""
+    client = entry.runtime_data.modbus_api.get_device()
+    return {
+        "client": type(client).__name__,
+        "connected": client.connected,
+        "connects": metrics.connects,
+        "reconnects": metrics.reconnects,
+        "connect_failures": metrics.connect_failures,
+        "history": [
+            {"time": _timestamp(timestamp), "event": event}
+            for timestamp, event in metrics.connection_history
+        ],
+    }
+
+
+def _webif(entry: MyConfigEntry) -> dict[str, Any] | None:
+    """Return the timings of the WebIF requests, None if the WebIF is not used."""
+    webif = entry.runtime_data.webif_api
+    if webif is None:
+        return None
+    return {
+        "fetch": _histogram(webif.fetch_times),
+        "parse": _histogram(webif.parse_times),
+        "last_fetch": webif.last_fetch_time,
+        "last_parse": webif.last_parse_time,
+    }
+
+
+def _governor(governor: PollGovernor) -> dict[str, Any]:
+    """Return the state of the poll governor."""
+    state = governor.as_dict()
+    if state["last_backoff"] is not None:
+        state["last_backoff"] = _timestamp(state["last_backoff"])
+    return state
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: MyConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = entry.runtime_data
+    metrics = data.modbus_api.metrics
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        **await _read_plan(entry, data.coordinator.modbus_items, metrics),
+        "poll_cycles": _cycles(metrics),
+        "connection": _connection(entry, metrics),
+        "webif": _webif(entry),
+        "kennfeld": None if data.powermap is None else data.powermap.get_metadata(),
+        "poll_governor": _governor(data.coordinator.governor),
+        "register_health": data.modbus_api.health.as_dict(),
+    }
@@ -2,21 +2,29 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.components.select import SelectEntity
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .configentry import MyConfigEntry
-from .const import CONF, CONST, FORMATS
+from .const import CONF, CONST, DEVICES, FORMATS
 from .coordinator import MyCoordinator, MyWebIfCoordinator
 from .hpconst import reverse_device_list
 from .items import ModbusItem, WebItem
+from .metrics import ModbusMetrics
 from .migrate_helpers import create_unique_id
 from .modbusobject import ModbusAPI, ModbusObject
 
@@ -225,7 +233,9 @@ class MySensorEntity(CoordinatorEntity, SensorEntity, MyEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.translate_val(self._api_item.state)
+        self._attr_native_value = self.translate_val(
+            self._modbus_api.states.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     @property
@@ -269,7 +279,9 @@ class MyCalcSensorEntity(MySensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.translate_val(self._api_item.state)
+        self._attr_native_value = self.translate_val(
+            self._modbus_api.states.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     def translate_val(self, val):
@@ -359,15 +371,17 @@ class MyNumberEntity(CoordinatorEntity, NumberEntity, MyEntity):  # pylint: disa
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self.translate_val_number(self._api_item.state)
+        self._attr_native_value = self.translate_val_number(
+            self._modbus_api.states.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     async def async_set_native_value(self, value: float) -> None:
         """Send value over modbus and refresh HA."""
         result = await self.set_translate_val(value)
         if result is not None:
-            self._api_item.state = result
-            self._attr_native_value = self.translate_val_number(self._api_item.state)
+            self._modbus_api.states.set_state(self._api_item, result)
+            self._attr_native_value = self.translate_val_number(result)
             self.async_write_ha_state()
 
     @property
@@ -399,7 +413,7 @@ class MySelectEntity(CoordinatorEntity, SelectEntity, MyEntity):  # pylint: disa
         ]
         # option list build from the status list of the ModbusItem
         self._attr_options: list[str] = []
-        for _useless, item in enumerate(self._api_item._resultlist):  # noqa: SLF001
+        for _useless, item in enumerate(self._api_item.resultlist):
             self._attr_options.append(item.translation_key)
         self._attr_current_option = "FEHLER"
 
@@ -414,14 +428,16 @@ class MySelectEntity(CoordinatorEntity, SelectEntity, MyEntity):  # pylint: disa
         """Write the selected option to modbus and refresh HA."""
         result = await self.set_translate_val(option)
         if result is not None:
-            self._api_item.state = result
-            self._attr_current_option = self.translate_val_select(self._api_item.state)
+            self._modbus_api.states.set_state(self._api_item, result)
+            self._attr_current_option = self.translate_val_select(result)
             self.async_write_ha_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_current_option = self.translate_val_select(self._api_item.state)
+        self._attr_current_option = self.translate_val_select(
+            self._modbus_api.states.get_state(self._api_item)
+        )
         self.async_write_ha_state()
 
     @property
@@ -501,3 +517,59 @@ class MyWebifSensorEntity(CoordinatorEntity, SensorEntity, MyEntity):
 
         # Update the data
         await self.coordinator.async_request_refresh()
+
+
+@dataclass(frozen=True, kw_only=True)
+class MyDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor showing a metric of the modbus communication."""
+
+    value_fn: Callable[[ModbusMetrics], float | None]
+
+
+class MyDiagnosticSensorEntity(CoordinatorEntity, SensorEntity):
+    """Sensor showing a metric of the modbus communication.
+
+    The value is read from the in-memory counters of the ModbusAPI after
+    each poll cycle of the coordinator.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: MyDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: MyConfigEntry,
+        coordinator: MyCoordinator,
+        description: MyDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize MyDiagnosticSensorEntity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._metrics = coordinator.modbus_api.metrics
+
+        dev_postfix = "_" + config_entry.data[CONF.DEVICE_POSTFIX]
+        if dev_postfix == "_":
+            dev_postfix = ""
+        self._attr_unique_id = (
+            f"{config_entry.data[CONF.PREFIX]}_{description.key}{dev_postfix}"
+        )
+        self._dev_translation_placeholders = {"postfix": dev_postfix}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.entity_description.value_fn(self._metrics)
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info, the sensors belong to the system device."""
+        return DeviceInfo(
+            identifiers={(CONST.DOMAIN, DEVICES.SYS)},
+            translation_key=DEVICES.SYS,
+            translation_placeholders=self._dev_translation_placeholders,
+            sw_version="Device_SW_Version",
+            model="Device_model",
+            manufacturer="Weishaupt",
+        )
@@ -28,6 +28,13 @@ EntityType = (
     | MyWebifSensorEntity
 )
 
+# item types of the entities of each platform
+PLATFORM_ITEM_TYPES: dict[str, tuple[str, ...]] = {
+    "number": (TYPES.NUMBER,),
+    "select": (TYPES.SELECT,),
+    "sensor": (TYPES.NUMBER_RO, TYPES.SENSOR_CALC, TYPES.SENSOR),
+}
+
 
 async def check_available(
     api_item: ModbusItem | WebItem, config_entry: MyConfigEntry
@@ -53,7 +60,11 @@ async def check_available(
     modbus_api = config_entry.runtime_data.modbus_api
     mbo = ModbusObject(modbus_api, api_item, no_connect_warn=True)
     _ = await mbo.value
-    return api_item.is_invalid is False
+    if modbus_api.states.is_invalid(api_item):
+        # the entity is added when the register answers, see health.py
+        modbus_api.health.set_without_entity(api_item)
+        return False
+    return True
 
 
 async def build_entity_list(
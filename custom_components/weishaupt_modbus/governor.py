@@ -0,0 +1,126 @@
+"""Adaptive poll interval of the coordinator.
+
+The controller of the heat pump answers slowly during defrost and compressor
+start, polling at a fixed rate then piles up timeouts. After each poll cycle
+the governor looks at the overloaded requests and the mean request latency
+of the cycle (additive increase, multiplicative decrease of the request
+rate). Overloaded are requests without answer and the exception codes 4 and
+6 (device failure, busy), not e.g. code 2 of a register that does not exist:
+
+- struggling, more than ERROR_LIMIT of the requests were overloaded or the
+  latency is above LATENCY_FACTOR times the latency of the healthy cycles:
+  the poll interval and the pause between two requests are doubled
+- healthy: the interval shrinks by the shortest interval and the pause by
+  PAUSE_STEP, e.g. from 240 s back to 30 s in 7 cycles
+
+The interval stays between the configured bounds. The pause stays below
+PAUSE_MAX and the pauses of a cycle add up to at most PAUSE_SHARE of the
+timeout of a cycle, so a cycle with many items still fits into it.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+# overloaded requests of a cycle above which the heat pump is struggling
+ERROR_LIMIT = 0.1
+# mean latency of a cycle above this factor of the baseline is too slow
+LATENCY_FACTOR = 3.0
+# latencies below this never count as slow, in seconds
+LATENCY_FLOOR = 0.05
+# weight of a healthy cycle in the moving average of the baseline latency
+BASELINE_WEIGHT = 0.1
+
+BACKOFF_FACTOR = 2.0
+# pause between two requests in seconds
+PAUSE_START = 0.005
+PAUSE_STEP = 0.005
+PAUSE_MAX = 0.05
+# share of the timeout of a cycle that may be spent in pauses
+PAUSE_SHARE = 0.2
+
+SIGNAL_HEALTHY = "healthy"
+SIGNAL_ERRORS = "errors"
+SIGNAL_LATENCY = "latency"
+# no request in the cycle, e.g. without connection
+SIGNAL_IDLE = "idle"
+
+
+class PollGovernor:
+    """AIMD governor of the poll interval and the pause between requests."""
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        """Start at the shortest interval without pause."""
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval: float = min_interval
+        self.pause: float = 0.0
+        # mean request latency of the healthy cycles in seconds
+        self.baseline: float | None = None
+        self.signal: str = SIGNAL_IDLE
+        self.backoffs: int = 0
+        self.recoveries: int = 0
+        # time.time() of the last backoff
+        self.last_backoff: float | None = None
+
+    def set_bounds(self, min_interval: float, max_interval: float) -> None:
+        """Change the bounds, the interval is moved into them."""
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+
+    def pause_per_request(self, requests: int, cycle_timeout: float) -> float:
+        """Return the pause before each of the requests of a cycle in seconds."""
+        if requests == 0:
+            return self.pause
+        return min(self.pause, PAUSE_SHARE * cycle_timeout / requests)
+
+    def update(self, requests: int, errors: int, latency: float | None) -> None:
+        """Adapt interval and pause to a finished poll cycle.
+
+        errors is the number of overloaded requests, latency the mean duration
+        of the requests of the cycle in seconds.
+        """
+        if requests == 0 or latency is None:
+            self.signal = SIGNAL_IDLE
+            return
+        if errors > ERROR_LIMIT * requests:
+            self.signal = SIGNAL_ERRORS
+        elif self.baseline is not None and latency > max(
+            LATENCY_FLOOR, LATENCY_FACTOR * self.baseline
+        ):
+            self.signal = SIGNAL_LATENCY
+        else:
+            self.signal = SIGNAL_HEALTHY
+
+        if self.signal == SIGNAL_HEALTHY:
+            self.baseline = (
+                latency
+                if self.baseline is None
+                else self.baseline + BASELINE_WEIGHT * (latency - self.baseline)
+            )
+            if self.interval > self.min_interval or self.pause > 0:
+                self.recoveries += 1
+            self.interval = max(self.min_interval, self.interval - self.min_interval)
+            self.pause = max(0.0, round(self.pause - PAUSE_STEP, 3))
+            return
+
+        self.backoffs += 1
+        self.last_backoff = time.time()
+        self.interval = min(self.max_interval, self.interval * BACKOFF_FACTOR)
+        self.pause = min(PAUSE_MAX, max(PAUSE_START, self.pause * BACKOFF_FACTOR))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for the diagnostics."""
+        return {
+            "interval": self.interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "pause": self.pause,
+            "baseline_latency": self.baseline,
+            "signal": self.signal,
+            "backoffs": self.backoffs,
+            "recoveries": self.recoveries,
+            "last_backoff": self.last_backoff,
+        }
@@ -0,0 +1,182 @@
+"""Health of the registers read by the integration.
+
+Each register is in one of three states:
+
+- ok: read every cycle
+- failing: read every cycle, the failed reads add up in a score, a failed
+  read adds 1, an answered read takes SUCCESS_CREDIT off again, so a
+  register failing in more than a third of the reads keeps growing
+- quarantined: not read, probed on an exponential backoff schedule
+
+A register goes into quarantine when it answers as not available (exception
+code 2 or the "no sensor" values, e.g. -32768 for a temperature) or when its
+score reaches QUARANTINE_SCORE. The first probe follows after PROBE_START,
+each failed probe doubles the wait up to PROBE_MAX. A probe with a valid
+answer brings the register back, e.g. a room sensor plugged in later.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+import time
+from typing import Any
+
+from .items import ModbusItem
+
+# score of failed reads after which a register is quarantined
+QUARANTINE_SCORE = 3.0
+# score taken off by an answered read
+SUCCESS_CREDIT = 0.5
+
+BACKOFF_FACTOR = 2.0
+# waiting time before the first probe and the longest waiting time in seconds
+PROBE_START = 60.0
+PROBE_MAX = 3600.0
+
+STATE_OK = "ok"
+STATE_FAILING = "failing"
+STATE_QUARANTINED = "quarantined"
+
+# reason of a quarantine
+REASON_INVALID = "invalid"
+REASON_ERRORS = "errors"
+
+
+@dataclass
+class RegisterHealth:
+    """Health of one register."""
+
+    state: str = STATE_OK
+    score: float = 0.0
+    reason: str | None = None
+    # waiting time before the next probe in seconds
+    backoff: float = PROBE_START
+    # time.monotonic() of the next probe
+    next_probe: float = 0.0
+    # probes without a valid answer
+    probes: int = 0
+    quarantines: int = 0
+    recoveries: int = 0
+
+
+class HealthTracker:
+    """Health of the registers read over one connection."""
+
+    def __init__(self) -> None:
+        """Start with all registers ok."""
+        self._health: dict[ModbusItem, RegisterHealth] = {}
+        # the state before the last failed read, see forgive
+        self._before_failure: tuple[ModbusItem, RegisterHealth] | None = None
+        # registers without entity because they were not available at setup
+        self._without_entity: set[ModbusItem] = set()
+
+    def get(self, item: ModbusItem) -> RegisterHealth:
+        """Return the health of the register, ok if never read."""
+        return self._health.get(item) or RegisterHealth()
+
+    def is_due(self, item: ModbusItem) -> bool:
+        """Return True if the register has to be read in this cycle."""
+        health = self._health.get(item)
+        if health is None or health.state != STATE_QUARANTINED:
+            return True
+        return time.monotonic() >= health.next_probe
+
+    def record_success(self, item: ModbusItem) -> None:
+        """Record a read with a valid answer."""
+        health = self._health.get(item)
+        if health is None:
+            return
+        if health.state == STATE_QUARANTINED:
+            health.recoveries += 1
+            health.score = 0.0
+            health.reason = None
+            health.backoff = PROBE_START
+        else:
+            health.score = max(0.0, health.score - SUCCESS_CREDIT)
+        health.state = STATE_FAILING if health.score > 0 else STATE_OK
+
+    def record_invalid(self, item: ModbusItem) -> None:
+        """Record an answer that the register is not available."""
+        self._quarantine(
+            self._health.setdefault(item, RegisterHealth()), REASON_INVALID
+        )
+
+    def record_failure(self, item: ModbusItem) -> None:
+        """Record a read without answer or with an error answer."""
+        health = self._health.setdefault(item, RegisterHealth())
+        self._before_failure = (item, replace(health))
+        if health.state == STATE_QUARANTINED:
+            self._quarantine(health, REASON_ERRORS)
+            return
+        health.score += 1
+        if health.score >= QUARANTINE_SCORE:
+            self._quarantine(health, REASON_ERRORS)
+        else:
+            health.state = STATE_FAILING
+
+    def forgive(self, item: ModbusItem) -> None:
+        """Undo the last failed read of the register, the connection failed."""
+        if self._before_failure is not None and self._before_failure[0] is item:
+            self._health[item] = self._before_failure[1]
+        self._before_failure = None
+
+    def _quarantine(self, health: RegisterHealth, reason: str) -> None:
+        """Put the register into quarantine or wait longer for the next probe."""
+        if health.state == STATE_QUARANTINED:
+            health.probes += 1
+            health.backoff = min(PROBE_MAX, health.backoff * BACKOFF_FACTOR)
+        else:
+            health.quarantines += 1
+            health.backoff = PROBE_START
+        health.state = STATE_QUARANTINED
+        health.reason = reason
+        health.next_probe = time.monotonic() + health.backoff
+
+    def set_without_entity(self, item: ModbusItem) -> None:
+        """Remember that the register got no entity, it was not available."""
+        self._without_entity.add(item)
+
+    def has_recovered(self) -> bool:
+        """Return True if a register without entity answers again."""
+        return any(
+            self.get(item).state != STATE_QUARANTINED for item in self._without_entity
+        )
+
+    def take_recovered(self) -> list[ModbusItem]:
+        """Return the registers without entity that answer again."""
+        recovered = [
+            item
+            for item in self._without_entity
+            if self.get(item).state != STATE_QUARANTINED
+        ]
+        self._without_entity.difference_update(recovered)
+        return recovered
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the registers that are not ok for the diagnostics."""
+        now = time.monotonic()
+        registers = [
+            {
+                "address": item.address,
+                "key": item.translation_key,
+                "state": health.state,
+                "score": health.score,
+                "reason": health.reason,
+                "next_probe_in": (
+                    round(max(0.0, health.next_probe - now), 1)
+                    if health.state == STATE_QUARANTINED
+                    else None
+                ),
+                "probes": health.probes,
+                "quarantines": health.quarantines,
+                "recoveries": health.recoveries,
+            }
+            for item, health in self._health.items()
+            if health.state != STATE_OK or health.recoveries
+        ]
+        states = [health.state for health in self._health.values()]
+        return {
+            "failing": states.count(STATE_FAILING),
+            "quarantined": states.count(STATE_QUARANTINED),
+            "registers": registers,
+        }
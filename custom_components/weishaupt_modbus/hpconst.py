@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import copy
+from functools import cache
 from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
@@ -42,104 +42,104 @@ reverse_device_list: dict[str, str] = {
 # fmt: off
 SYS_FEHLER: list[StatusItem] = [
     StatusItem(number=65535,text='kein Fehler', translation_key="sys_fehler_65535"),
-    StatusItem(number=1,text='Kältemittelfühler Expansionsventil Eintritt (T1)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_1"),
-    StatusItem(number=2,text='Luftansaugfühler (T2)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_2"),
-    StatusItem(number=3,text='Wärmetauscherfühler AG Austritt (T3)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_3"),
-    StatusItem(number=4,text='Verdichtersauggasfühler (T4)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_4"),
-    StatusItem(number=5,text='EVI-Sauggasfühler (T5)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_5"),
-    StatusItem(number=6,text='Kältemittelfühler IG Austritt (T6)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_6"),
-    StatusItem(number=7,text='Ölsumpffühler (T7)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_7"),
-    StatusItem(number=8,text='Expansionsventil EVI', description='Leitung prüfen, ggf. austauschen. Ggf. defektes Expansionsventil austauschen.', translation_key="sys_fehler_8"),
-    StatusItem(number=9,text='Niederdrucksensor (P1)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_9"),
-    StatusItem(number=10,text='Hochdrucksensor (P2)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_10"),
-    StatusItem(number=11,text='Mitteldrucksensor (P3)', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_11"),
-    StatusItem(number=12,text='Expansionsventil Kühlen defekt', description='Leitung prüfen, ggf. austauschen. Expansionsventil austauschen.', translation_key="sys_fehler_12"),
-    StatusItem(number=13,text='keine Kommunikation zum Inverter', description='Lastspannung am Verdichter und Inverter prüfen. & Verbindungsleitung Steuerplatine Kältesatz zu Inverter prüfen. & Ggf. defekte Steuerplatine Kältesatz austauschen.', translation_key="sys_fehler_13"),
-    StatusItem(number=14,text='keine Kommunikation zum Außengerät', description='Verbindungsleitung zum Außengerät prüfen.', translation_key="sys_fehler_14"),
-    StatusItem(number=15,text='Hochdruckschalter hat ausgelöst', description='Drücke im Kältekreis kontrollieren. Volumenstrom prüfen. & Verdrahtung prüfen. & Sicherstellen, dass die Einsatzgrenzen der Wärmepumpe eingehalten werden. & Kältekreis prüfen.', translation_key="sys_fehler_15"),
-    StatusItem(number=16,text='Inverter gesperrt, da in den letzten 10 Stunden 10 Fehler aufgetreten sind', description='Spannungsversorgung mindestens 10 Minuten unterbrechen. Bei wiederholtem Auftreten Weishaupt-Kundendienst benachrichtigen.', translation_key="sys_fehler_16"),
-    StatusItem(number=17,text='EEPROM Speicher-Fehler', description='Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_17"),
-    StatusItem(number=18,text='keine Modbus-Kommunikation zwischen Regler EC und Steuerplatine Kältesatz', description='Modbus-Verbindung prüfen.', translation_key="sys_fehler_18"),
-    StatusItem(number=19,text='durch Inverter-Alarm Wärmepumpe abgeschaltet', description='Bei wiederholtem Auftreten Weishaupt-Kundendienst benachrichtigen.', translation_key="sys_fehler_19"),
-    StatusItem(number=20,text='Verdichter passt nicht zur Konfiguration', description='Verdichtertyp prüfen. & Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_20"),
-    StatusItem(number=21,text='Niederdruck-Störung', description='Verdampfer auf Eisfreiheit prüfen. Funktion Ventilator prüfen. & Niederdrucksensor (P1) prüfen. Kältekreis prüfen.', translation_key="sys_fehler_21"),
-    StatusItem(number=22,text='zu geringe Überhitzung', description='Wenn der Fehler wiederholt auftritt: Überhitzung prüfen. & Verdichtersauggasfühler (T4) prüfen. Niederdrucksensor (P1) prüfen. & Antrieb Expansionsventil prüfen. Kältekreis prüfen.', translation_key="sys_fehler_22"),
-    StatusItem(number=23,text='zu hohe Überhitzung', description='Wenn der Fehler wiederholt auftritt: Überhitzung prüfen. & Verdichtersauggasfühler (T4) prüfen. Niederdrucksensor (P1) prüfen. & Antrieb Expansionsventil prüfen. Kältekreis prüfen.', translation_key="sys_fehler_23"),
-    StatusItem(number=24,text='EVI zu hohe Überhitzung', description='Wenn der Fehler wiederholt auftritt: Kältekreis prüfen. & Lecksuche durchführen.', translation_key="sys_fehler_24"),
-    StatusItem(number=25,text='Kältemittelmenge zu niedrig', description='Wenn der Fehler wiederholt auftritt: Kältekreis prüfen. & Lecksuche durchführen.', translation_key="sys_fehler_25"),
-    StatusItem(number=26,text='Hochdruck-Störung', description='Wärmeabnahme prüfen. & Hohe Warmwasser-Solltemperaturen vermeiden. & Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Einstellung Überströmventil prüfen.', translation_key="sys_fehler_26"),
-    StatusItem(number=27,text='Kondensationstemperatur zu niedrig', description='Der erwartete Betriebszustand wird bei hoher Außentemperatur und geringer Vorlauftemperatur nicht erreichen. & Anlage mit 2. Wärmeerzeuger hochheizen.', translation_key="sys_fehler_27"),
-    StatusItem(number=28,text='Kondensationstemperatur zu hoch', description='Wärmeabnahme prüfen. Einstellung Überströmventil prüfen. Heizwasser-Volumenstrom prüfen.', translation_key="sys_fehler_28"),
-    StatusItem(number=29,text='Verdampfungstemperatur zu niedrig', description='Verdampfer auf Eisfreiheit prüfen. Funktion Ventilator prüfen. & Kältekreis prüfen.', translation_key="sys_fehler_29"),
-    StatusItem(number=30,text='Verdampfungstemperatur zu hoch', description='Die Einsatzgrenze der Wärmepumpe wurde überschritten. & Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird.', translation_key="sys_fehler_30"),
-    StatusItem(number=32,text='Wärmepumpe nicht kompatibel', description='Spannungsversorgung Verdichter prüfen. Spannungsversorgung von den Klemmen zum Kältesatz prüfen. & Weishaupt-Kundendienst benachrichtigen.', translation_key="sys_fehler_32"),
-    StatusItem(number=33,text='Regler EC hat keine Verbindung zum Erweiterungsmodul EM-HK', description='Verbindungsleitung zwischen Regler und Erweiterungsmodul prüfen.', translation_key="sys_fehler_33"),
-    StatusItem(number=40,text='Volumenstrom zu gering', description='Mindestvolumenstrom beachten [Kap. 3.4.6]. Volumenstrom prüfen, ggf. erhöhen. & Leitung Volumenstromsensor (B10) prüfen. Volumenstromsensor (B10) prüfen, ggf. austauschen.', translation_key="sys_fehler_40"),
-    StatusItem(number=41,text='Spreizung LWT/Rücklauf negativ / Vierwegeventil schaltet nach dem Abtauen nicht zurück; nach 3 Warnungen verriegelt die Anlage)', description='Volumenstrom anpassen. Pumpenleistung reduzieren. Vierwegeventil prüfen. & Ggf. Funktion deaktivieren.', translation_key="sys_fehler_41"),
-    StatusItem(number=43,text='Ventilator blockiert', description='Verdampfer auf Eisfreiheit prüfen. Funktion Ventilator prüfen.', translation_key="sys_fehler_43"),
-    StatusItem(number=44,text='Drehzahl Ventilator zu niedrig', description='Verdampfer auf Eisfreiheit prüfen. Funktion Ventilator prüfen.', translation_key="sys_fehler_44"),
-    StatusItem(number=47,text='Kommunikation Regler EC zu Steuerplatine Kältesatz fehlerhaft', description='Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_47"),
-    StatusItem(number=50,text='Außenfühler (B1) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_50"),
-    StatusItem(number=51,text='Außenfühler (B1) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_51"),
-    StatusItem(number=52,text='Weichenfühler (B2) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_52"),
-    StatusItem(number=53,text='Weichenfühler (B2) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_53"),
-    StatusItem(number=54,text='Warmwasserfühler (B3) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_54"),
-    StatusItem(number=55,text='Warmwasserfühler (B3) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_55"),
-    StatusItem(number=56,text='Vorlauffühler Verflüssiger (B4) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_56"),
-    StatusItem(number=57,text='Vorlauffühler Verflüssiger (B4) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_57"),
-    StatusItem(number=58,text='Vorlauffühler (B7) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_58"),
-    StatusItem(number=59,text='Vorlauffühler (B7) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_59"),
-    StatusItem(number=60,text='Rücklauffühler (B9) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_60"),
-    StatusItem(number=61,text='Rücklauffühler (B9) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_61"),
-    StatusItem(number=64,text='Pufferfühler (B11) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_64"),
-    StatusItem(number=65,text='Pufferfühler (B11) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_65"),
-    StatusItem(number=66,text='Mischerfühler regenerativ (B2.1) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_66"),
-    StatusItem(number=67,text='Mischerfühler regenerativ (B2.1) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_67"),
-    StatusItem(number=70,text='Vorlauffühler Zweiter Heizkreis (B6.2) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_70"),
-    StatusItem(number=71,text='Vorlauffühler Zweiter Heizkreis (B6.2) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_71"),
-    StatusItem(number=72,text='Fühler (T1.2) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_72"),
-    StatusItem(number=73,text='Fühler (T1.2) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_73"),
-    StatusItem(number=74,text='Fühler (T2.2) unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_74"),
-    StatusItem(number=75,text='Fühler (T2.2) kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_75"),
-    StatusItem(number=90,text='Analogeingang AE1 unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_90"),
-    StatusItem(number=91,text='Analogeingang AE1 kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_91"),
-    StatusItem(number=92,text='Analogeingang AE2 unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_92"),
-    StatusItem(number=93,text='Analogeingang AE2 kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_93"),
-    StatusItem(number=94,text='Analogeingang AE3 unterbrochen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_94"),
-    StatusItem(number=95,text='Analogeingang AE3 kurzgeschlossen', description='Fühler und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_95"),
-    StatusItem(number=101,text='Wärmepumpe wird außerhalb der Einsatzgrenzen betrieben', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird, siehe W 26 bis W 30.', translation_key="sys_fehler_101"),
-    StatusItem(number=102,text='maximale Abtauzeit überschritten', description='Bei exponiertem Aufstellungsort kann starker Wind zu dieser Warnung führen. Nach der Abtauung Verdampfer auf Eisfreiheit prüfen.', translation_key="sys_fehler_102"),
-    StatusItem(number=103,text='Kommunikation Kältekreis fehlerhaft', description='Spannungsversorgung mindestens 10 Minuten unterbrechen. Bei wiederholtem Auftreten Weishaupt-Kundendienst benachrichtigen.', translation_key="sys_fehler_103"),
-    StatusItem(number=104,text='Druckgastemperatur zu hoch', description='Wärmeabnahme prüfen. Kältekreis prüfen.', translation_key="sys_fehler_104"),
-    StatusItem(number=105,text='Stromaufnahme vom Inverter zu hoch', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Verdichteranschluss am Inverter prüfen.', translation_key="sys_fehler_105"),
-    StatusItem(number=106,text='Stromaufnahme zu hoch', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Spannungsversorgung prüfen (Netzspannung zu gering). & Drosselspulen in der 400 V Zuleitung zum Inverter prüfen.', translation_key="sys_fehler_106"),
-    StatusItem(number=107,text='Gleichspannung am Inverter zu hoch', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Spannungsversorgung prüfen.', translation_key="sys_fehler_107"),
-    StatusItem(number=108,text='Gleichspannung am Inverter zu niedrig', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Spannungsversorgung prüfen.', translation_key="sys_fehler_108"),
-    StatusItem(number=109,text='Wärmepumpe wird außerhalb vom zulässigen Spannungsbereich betrieben', description='Spannungsversorgung prüfen.', translation_key="sys_fehler_109"),
-    StatusItem(number=110,text='Wärmepumpe wird außerhalb vom zulässigen Spannungsbereich betrieben', description='Spannungsversorgung prüfen.', translation_key="sys_fehler_110"),
-    StatusItem(number=111,text='Hochdruckschalter hat ausgelöst', description='Wärmeabnahme prüfen. & Einstellung vom Überströmventil prüfen. Stellung der Kugelhähne am Innenund Außengerät prüfen. & Drücke im Kältekreis kontrollieren. Volumenstrom kontrollieren. & Verdrahtung prüfen. & Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Kältekreis prüfen.', translation_key="sys_fehler_111"),
-    StatusItem(number=112,text='Inverter ist überhitzt', description='Sicherstellen, dass: die Montagebedingungen für das Innengerät eingehalten werden & die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird & Weishaupt-Kundendienst benachrichtigen (Version der Steuerplatine Kältesatz RCC Modbus prüfen).', translation_key="sys_fehler_112"),
-    StatusItem(number=113,text='Inverter ist überhitzt', description='Sicherstellen, dass: die Montagebedingungen für das Innengerät eingehalten werden & die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird & Weishaupt-Kundendienst benachrichtigen (Version der Steuerplatine Kältesatz RCC Modbus prüfen).', translation_key="sys_fehler_113"),
-    StatusItem(number=114,text='Stellung vom Verdichtermotor kann nicht bestimmt werden', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Verdichteranschluss am Inverter prüfen.', translation_key="sys_fehler_114"),
-    StatusItem(number=117,text='Gleichspannung am Inverter zu niedrig', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Spannungsversorgung prüfen.', translation_key="sys_fehler_117"),
-    StatusItem(number=118,text='Strom zwischen Inverter und Verdichter ist zu hoch', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Verdichteranschluss am Inverter prüfen. Verdichter-Wicklungswiderstände messen.', translation_key="sys_fehler_118"),
-    StatusItem(number=119,text='Stromaufnahme vom Verdichter zu hoch Zeitüberschreitung', description='Sicherstellen, dass die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird. & Verdichteranschluss am Inverter prüfen. Verdichter-Wicklungswiderstände messen.', translation_key="sys_fehler_119"),
-    StatusItem(number=120,text='Invertertemperatur zu hoch', description='Sicherstellen, dass: die Montagebedingungen für das Innengerät eingehalten werden & die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird', translation_key="sys_fehler_120"),
-    StatusItem(number=121,text='Spannung am Inverter zu gering', description='Spannung nach den Drosselspulen messen.', translation_key="sys_fehler_121"),
-    StatusItem(number=122,text='Modbus-Konfigurationsfehler', description='Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_122"),
-    StatusItem(number=123,text='keine Modbus-Verbindung', description='Modbus-Verbindung (Leitung und Stecker) zwischen Inverter und Steuerplatine Kältesatz prüfen. & Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_123"),
-    StatusItem(number=124,text='Druckgastemperatur zu hoch', description='Wärmeabnahme prüfen. Kältekreis prüfen.', translation_key="sys_fehler_124"),
-    StatusItem(number=127,text='Invertertemperatur zu hoch', description='Sicherstellen, dass: die Montagebedingungen für das Innengerät eingehalten werden & die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird', translation_key="sys_fehler_127"),
-    StatusItem(number=128,text='Inverter ist überhitzt', description='Sicherstellen, dass: die Montagebedingungen für das Innengerät eingehalten werden & die Wärmepumpe innerhalb der Einsatzgrenzen betrieben wird & Weishaupt-Kundendienst benachrichtigen (Version der Steuerplatine Kältesatz RCC Modbus prüfen).', translation_key="sys_fehler_128"),
-    StatusItem(number=129,text='Modbus-Kommunikation fehlerhaft', description='Modbus-Verbindung zwischen Inverter und Steuerplatine Kältesatz prüfen (Leitung und Stecker). & Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_129"),
-    StatusItem(number=130,text='Modbus-Kommunikation fehlerhaft', description='Modbus-Verbindung zwischen Inverter und Steuerplatine Kältesatz prüfen (Leitung und Stecker). & Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_130"),
-    StatusItem(number=133,text='Elektronikfehler', description='Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_133"),
-    StatusItem(number=135,text='Hochdruckschalter defekt', description='Hochdruckschalter-Anschluss prüfen.', translation_key="sys_fehler_135"),
-    StatusItem(number=136,text='Verdichter passt nicht zur Konfiguration', description='Verdichtertyp prüfen. & Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_136"),
-    StatusItem(number=137,text='Hochdruckschalter passt nicht zur Konfiguration', description='Hochdruckschalter prüfen. Spannungsversorgung mindestens 10 Minuten unterbrechen.', translation_key="sys_fehler_137"),
-    StatusItem(number=140,text='Druckgastemperatur zu niedrig', description='Druckgasfühler (DT) und Leitung prüfen, ggf. austauschen.', translation_key="sys_fehler_140"),
-    StatusItem(number=143,text='Invertertemperatur zu niedrig', description='Kühlung am Inverter prüfen. Gerät neu starten.', translation_key="sys_fehler_143"),
-    StatusItem(number=144,text='Drosselspulentemperatur zu niedrig', description='Sicherstellen, dass die Montagebedingungen für das Innengerät eingehalten werden.', translation_key="sys_fehler_144"),
+    StatusItem(number=1,text='Kältemittelfühler Expansionsventil Eintritt (T1)', translation_key="sys_fehler_1"),
+    StatusItem(number=2,text='Luftansaugfühler (T2)', translation_key="sys_fehler_2"),
+    StatusItem(number=3,text='Wärmetauscherfühler AG Austritt (T3)', translation_key="sys_fehler_3"),
+    StatusItem(number=4,text='Verdichtersauggasfühler (T4)', translation_key="sys_fehler_4"),
+    StatusItem(number=5,text='EVI-Sauggasfühler (T5)', translation_key="sys_fehler_5"),
+    StatusItem(number=6,text='Kältemittelfühler IG Austritt (T6)', translation_key="sys_fehler_6"),
+    StatusItem(number=7,text='Ölsumpffühler (T7)', translation_key="sys_fehler_7"),
+    StatusItem(number=8,text='Expansionsventil EVI', translation_key="sys_fehler_8"),
+    StatusItem(number=9,text='Niederdrucksensor (P1)', translation_key="sys_fehler_9"),
+    StatusItem(number=10,text='Hochdrucksensor (P2)', translation_key="sys_fehler_10"),
+    StatusItem(number=11,text='Mitteldrucksensor (P3)', translation_key="sys_fehler_11"),
+    StatusItem(number=12,text='Expansionsventil Kühlen defekt', translation_key="sys_fehler_12"),
+    StatusItem(number=13,text='keine Kommunikation zum Inverter', translation_key="sys_fehler_13"),
+    StatusItem(number=14,text='keine Kommunikation zum Außengerät', translation_key="sys_fehler_14"),
+    StatusItem(number=15,text='Hochdruckschalter hat ausgelöst', translation_key="sys_fehler_15"),
+    StatusItem(number=16,text='Inverter gesperrt, da in den letzten 10 Stunden 10 Fehler aufgetreten sind', translation_key="sys_fehler_16"),
+    StatusItem(number=17,text='EEPROM Speicher-Fehler', translation_key="sys_fehler_17"),
+    StatusItem(number=18,text='keine Modbus-Kommunikation zwischen Regler EC und Steuerplatine Kältesatz', translation_key="sys_fehler_18"),
+    StatusItem(number=19,text='durch Inverter-Alarm Wärmepumpe abgeschaltet', translation_key="sys_fehler_19"),
+    StatusItem(number=20,text='Verdichter passt nicht zur Konfiguration', translation_key="sys_fehler_20"),
+    StatusItem(number=21,text='Niederdruck-Störung', translation_key="sys_fehler_21"),
+    StatusItem(number=22,text='zu geringe Überhitzung', translation_key="sys_fehler_22"),
+    StatusItem(number=23,text='zu hohe Überhitzung', translation_key="sys_fehler_23"),
+    StatusItem(number=24,text='EVI zu hohe Überhitzung', translation_key="sys_fehler_24"),
+    StatusItem(number=25,text='Kältemittelmenge zu niedrig', translation_key="sys_fehler_25"),
+    StatusItem(number=26,text='Hochdruck-Störung', translation_key="sys_fehler_26"),
+    StatusItem(number=27,text='Kondensationstemperatur zu niedrig', translation_key="sys_fehler_27"),
+    StatusItem(number=28,text='Kondensationstemperatur zu hoch', translation_key="sys_fehler_28"),
+    StatusItem(number=29,text='Verdampfungstemperatur zu niedrig', translation_key="sys_fehler_29"),
+    StatusItem(number=30,text='Verdampfungstemperatur zu hoch', translation_key="sys_fehler_30"),
+    StatusItem(number=32,text='Wärmepumpe nicht kompatibel', translation_key="sys_fehler_32"),
+    StatusItem(number=33,text='Regler EC hat keine Verbindung zum Erweiterungsmodul EM-HK', translation_key="sys_fehler_33"),
+    StatusItem(number=40,text='Volumenstrom zu gering', translation_key="sys_fehler_40"),
+    StatusItem(number=41,text='Spreizung LWT/Rücklauf negativ / Vierwegeventil schaltet nach dem Abtauen nicht zurück; nach 3 Warnungen verriegelt die Anlage)', translation_key="sys_fehler_41"),
+    StatusItem(number=43,text='Ventilator blockiert', translation_key="sys_fehler_43"),
+    StatusItem(number=44,text='Drehzahl Ventilator zu niedrig', translation_key="sys_fehler_44"),
+    StatusItem(number=47,text='Kommunikation Regler EC zu Steuerplatine Kältesatz fehlerhaft', translation_key="sys_fehler_47"),
+    StatusItem(number=50,text='Außenfühler (B1) unterbrochen', translation_key="sys_fehler_50"),
+    StatusItem(number=51,text='Außenfühler (B1) kurzgeschlossen', translation_key="sys_fehler_51"),
+    StatusItem(number=52,text='Weichenfühler (B2) unterbrochen', translation_key="sys_fehler_52"),
+    StatusItem(number=53,text='Weichenfühler (B2) kurzgeschlossen', translation_key="sys_fehler_53"),
+    StatusItem(number=54,text='Warmwasserfühler (B3) unterbrochen', translation_key="sys_fehler_54"),
+    StatusItem(number=55,text='Warmwasserfühler (B3) kurzgeschlossen', translation_key="sys_fehler_55"),
+    StatusItem(number=56,text='Vorlauffühler Verflüssiger (B4) unterbrochen', translation_key="sys_fehler_56"),
+    StatusItem(number=57,text='Vorlauffühler Verflüssiger (B4) kurzgeschlossen', translation_key="sys_fehler_57"),
+    StatusItem(number=58,text='Vorlauffühler (B7) unterbrochen', translation_key="sys_fehler_58"),
+    StatusItem(number=59,text='Vorlauffühler (B7) kurzgeschlossen', translation_key="sys_fehler_59"),
+    StatusItem(number=60,text='Rücklauffühler (B9) unterbrochen', translation_key="sys_fehler_60"),
+    StatusItem(number=61,text='Rücklauffühler (B9) kurzgeschlossen', translation_key="sys_fehler_61"),
+    StatusItem(number=64,text='Pufferfühler (B11) unterbrochen', translation_key="sys_fehler_64"),
+    StatusItem(number=65,text='Pufferfühler (B11) kurzgeschlossen', translation_key="sys_fehler_65"),
+    StatusItem(number=66,text='Mischerfühler regenerativ (B2.1) unterbrochen', translation_key="sys_fehler_66"),
+    StatusItem(number=67,text='Mischerfühler regenerativ (B2.1) kurzgeschlossen', translation_key="sys_fehler_67"),
+    StatusItem(number=70,text='Vorlauffühler Zweiter Heizkreis (B6.2) unterbrochen', translation_key="sys_fehler_70"),
+    StatusItem(number=71,text='Vorlauffühler Zweiter Heizkreis (B6.2) kurzgeschlossen', translation_key="sys_fehler_71"),
+    StatusItem(number=72,text='Fühler (T1.2) unterbrochen', translation_key="sys_fehler_72"),
+    StatusItem(number=73,text='Fühler (T1.2) kurzgeschlossen', translation_key="sys_fehler_73"),
+    StatusItem(number=74,text='Fühler (T2.2) unterbrochen', translation_key="sys_fehler_74"),
+    StatusItem(number=75,text='Fühler (T2.2) kurzgeschlossen', translation_key="sys_fehler_75"),
+    StatusItem(number=90,text='Analogeingang AE1 unterbrochen', translation_key="sys_fehler_90"),
+    StatusItem(number=91,text='Analogeingang AE1 kurzgeschlossen', translation_key="sys_fehler_91"),
+    StatusItem(number=92,text='Analogeingang AE2 unterbrochen', translation_key="sys_fehler_92"),
+    StatusItem(number=93,text='Analogeingang AE2 kurzgeschlossen', translation_key="sys_fehler_93"),
+    StatusItem(number=94,text='Analogeingang AE3 unterbrochen', translation_key="sys_fehler_94"),
+    StatusItem(number=95,text='Analogeingang AE3 kurzgeschlossen', translation_key="sys_fehler_95"),
+    StatusItem(number=101,text='Wärmepumpe wird außerhalb der Einsatzgrenzen betrieben', translation_key="sys_fehler_101"),
+    StatusItem(number=102,text='maximale Abtauzeit überschritten', translation_key="sys_fehler_102"),
+    StatusItem(number=103,text='Kommunikation Kältekreis fehlerhaft', translation_key="sys_fehler_103"),
+    StatusItem(number=104,text='Druckgastemperatur zu hoch', translation_key="sys_fehler_104"),
+    StatusItem(number=105,text='Stromaufnahme vom Inverter zu hoch', translation_key="sys_fehler_105"),
+    StatusItem(number=106,text='Stromaufnahme zu hoch', translation_key="sys_fehler_106"),
+    StatusItem(number=107,text='Gleichspannung am Inverter zu hoch', translation_key="sys_fehler_107"),
+    StatusItem(number=108,text='Gleichspannung am Inverter zu niedrig', translation_key="sys_fehler_108"),
+    StatusItem(number=109,text='Wärmepumpe wird außerhalb vom zulässigen Spannungsbereich betrieben', translation_key="sys_fehler_109"),
+    StatusItem(number=110,text='Wärmepumpe wird außerhalb vom zulässigen Spannungsbereich betrieben', translation_key="sys_fehler_110"),
+    StatusItem(number=111,text='Hochdruckschalter hat ausgelöst', translation_key="sys_fehler_111"),
+    StatusItem(number=112,text='Inverter ist überhitzt', translation_key="sys_fehler_112"),
+    StatusItem(number=113,text='Inverter ist überhitzt', translation_key="sys_fehler_113"),
+    StatusItem(number=114,text='Stellung vom Verdichtermotor kann nicht bestimmt werden', translation_key="sys_fehler_114"),
+    StatusItem(number=117,text='Gleichspannung am Inverter zu niedrig', translation_key="sys_fehler_117"),
+    StatusItem(number=118,text='Strom zwischen Inverter und Verdichter ist zu hoch', translation_key="sys_fehler_118"),
+    StatusItem(number=119,text='Stromaufnahme vom Verdichter zu hoch Zeitüberschreitung', translation_key="sys_fehler_119"),
+    StatusItem(number=120,text='Invertertemperatur zu hoch', translation_key="sys_fehler_120"),
+    StatusItem(number=121,text='Spannung am Inverter zu gering', translation_key="sys_fehler_121"),
+    StatusItem(number=122,text='Modbus-Konfigurationsfehler', translation_key="sys_fehler_122"),
+    StatusItem(number=123,text='keine Modbus-Verbindung', translation_key="sys_fehler_123"),
+    StatusItem(number=124,text='Druckgastemperatur zu hoch', translation_key="sys_fehler_124"),
+    StatusItem(number=127,text='Invertertemperatur zu hoch', translation_key="sys_fehler_127"),
+    StatusItem(number=128,text='Inverter ist überhitzt', translation_key="sys_fehler_128"),
+    StatusItem(number=129,text='Modbus-Kommunikation fehlerhaft', translation_key="sys_fehler_129"),
+    StatusItem(number=130,text='Modbus-Kommunikation fehlerhaft', translation_key="sys_fehler_130"),
+    StatusItem(number=133,text='Elektronikfehler', translation_key="sys_fehler_133"),
+    StatusItem(number=135,text='Hochdruckschalter defekt', translation_key="sys_fehler_135"),
+    StatusItem(number=136,text='Verdichter passt nicht zur Konfiguration', translation_key="sys_fehler_136"),
+    StatusItem(number=137,text='Hochdruckschalter passt nicht zur Konfiguration', translation_key="sys_fehler_137"),
+    StatusItem(number=140,text='Druckgastemperatur zu niedrig', translation_key="sys_fehler_140"),
+    StatusItem(number=143,text='Invertertemperatur zu niedrig', translation_key="sys_fehler_143"),
+    StatusItem(number=144,text='Drosselspulentemperatur zu niedrig', translation_key="sys_fehler_144"),
     StatusItem(number=150,text="Verdichter Stromsensor Phase U Fehler", translation_key="sys_fehler_150"),
     StatusItem(number=151,text="Verdichter Stromsensor Phase V Fehler", translation_key="sys_fehler_151"),
     StatusItem(number=152,text="Verdichter Stromsensor Phase W Fehler Spannungsversorgung von Eingangsklemme", translation_key="sys_fehler_152"),
@@ -684,247 +684,205 @@ IO_KONFIG_IN: list[StatusItem] = [
     StatusItem(
         number=0,
         text="SG Ready",
-        description="Siehe Smart-Grid-Funktion [Kap. 6.7.7.2]. Funktion kann nur in SGR1 gewählt werden und wird automatisch auf SGR2 übertragen, in SGR2 sind dann die anderen Funktionen gesperrt.",
         translation_key="io_konf_in_0",
     ),
     StatusItem(
         number=1,
         text="EVU-Sperre",
-        description="Heiz- und Kühlbetrieb und Warmwasserladung gesperrt, Frostschutz ist sichergestellt.",
         translation_key="io_konf_in_1",
     ),
     StatusItem(
         number=2,
         text="Erhöhter Betrieb",
-        description="Zu der Vorlaufsolltemperatur im Heizbetrieb und der Warmwasser-Solltemperatur wird die eingestellte ",
         translation_key="io_konf_in_2",
     ),
     StatusItem(
         number=3,
         text="HK-Sperre",
-        description="Heiz- und Kühlbetrieb gesperrt, Frostschutz ist sichergestellt, Warmwasserladung weiterhin betriebsbereit. ",
         translation_key="io_konf_in_3",
     ),
     StatusItem(
         number=4,
         text="Umschaltung Hz/Kü",
-        description="Wärmeanforderungen werden ignoriert, nur Kühlanforderungen wirken auf die Wärmepumpe. Die Funktion Umschaltung Hz/Kü hat Vorrang vor Erhöhter Betrieb.",
         translation_key="io_konf_in_4",
     ),
     StatusItem(
         number=5,
         text="Ruhemodus",
-        description="Manueller Ruhemodus, externer Kontakt [Kap. 6.7.5.2].",
         translation_key="io_konf_in_5",
     ),
     StatusItem(
         number=6,
         text="Not-Aus",
-        description="Wärmepumpe, Elektroheizung und Pumpe aus.",
         translation_key="io_konf_in_6",
     ),
     StatusItem(
         number=7,
         text="System Standby",
-        description="Standby",
         translation_key="io_konf_in_7",
     ),
     StatusItem(
         number=8,
         text="Erzeugersperre HZ",
-        description="Heizkreis durch Wärmepumpe gesperrt.",
         translation_key="io_konf_in_8",
     ),
     StatusItem(
         number=9,
         text="Erzeugersperre WW",
-        description="Warmwasserladung durch Wärmepumpe gesperrt.",
         translation_key="io_konf_in_9",
     ),
     StatusItem(
         number=10,
         text="Erzeugersperre HZ und WW",
-        description="Heizkreis und Warmwasserladung durch Wärmepumpe gesperrt",
         translation_key="io_konf_in_10",
     ),
     StatusItem(
         number=11,
         text="Warmwasser Standby",
-        description="Warmwasserladung Standby.",
         translation_key="io_konf_in_11",
     ),
     StatusItem(
         number=12,
         text="Warmwasser Absenk",
-        description="Warmwasserladung im Absenkbetrieb.",
         translation_key="io_konf_in_12",
     ),
     StatusItem(
         number=13,
         text="Warmwasser Normal",
-        description="Warmwasserladung im Normalbetrieb.",
         translation_key="io_konf_in_13",
     ),
     StatusItem(
         number=14,
         text="Warmwasser PUSH",
-        description="Vom Zeitprogramm abweichender Warmwasserbedarf. Der Trinkwasserspeicher wird auf Normaltemperatur aufgeheizt und gehalten.",
         translation_key="io_konf_in_14",
     ),
     StatusItem(
         number=15,
         text="Taupunktwächter",
-        description="Kühlbetrieb für Heizkreise gesperrt.",
         translation_key="io_konf_in_15",
     ),
     StatusItem(
         number=16,
         text="Heizkreis … Standby",
-        description="Heizkreis im Standby.",
         translation_key="io_konf_in_16",
     ),
     StatusItem(
         number=17,
         text="Heizkreis … Absenk",
-        description="Heizkreis im Absenkbetrieb",
         translation_key="io_konf_in_17",
     ),
     StatusItem(
         number=18,
         text="Heizkreis … Normal",
-        description="Heizkreis im Normalbetrieb.",
         translation_key="io_konf_in_18",
     ),
     StatusItem(
         number=19,
         text="Heizkreis … Komfort",
-        description="Heizkreis im Komfortbetrieb",
         translation_key="io_konf_in_19",
     ),
     StatusItem(
         number=20,
         text="2.WEZ",
-        description="2. Wärmeerzeuger über Eingang aktivieren.",
         translation_key="io_konf_in_20",
     ),
     StatusItem(
         number=21,
         text="Sperre Verdichter",
-        description="Externe Vorgabe zur Sperre vom Verdichter.ng für Digitaleingang DE",
         translation_key="io_konf_in_21",
     ),
     StatusItem(
         number=65535,
         text="AUS",
-        description="Keine Funktion, wird nicht angesteuert.",
         translation_key="io_konf_in_65535",
     ),
 ]
 
 IO_KONFIG_OUT: list[StatusItem] = [
-    StatusItem(
-        number=0, text="AUS", description="Keine Funktion, wird nicht angesteuert."
-    ),
+    StatusItem(number=0, text="AUS"),
     StatusItem(
         number=1,
         text="Zirkulationspumpe",
-        description="Ausgang wird periodisch während dem Warmwasserprogramm angesteuert.",
         translation_key="io_config_out_1",
     ),
     StatusItem(
         number=2,
         text="ext. Heizkreispumpe",
-        description="Ausgang wird im Heizbetrieb der Wärmepumpe angesteuert.",
         translation_key="io_config_out_2",
     ),
     StatusItem(
         number=3,
         text="Schaltuhr",
-        description="Ausgang wird nach Zeitprogramm angesteuert.",
         translation_key="io_config_out_3",
     ),
     StatusItem(
         number=4,
         text="Störmeldung",
-        description="Ausgang wird im Fehlerfall der Wärmepumpe angesteuert.",
         translation_key="io_config_out_4",
     ),
     StatusItem(
         number=5,
         text="Kühlbetrieb",
-        description="Ausgang wird im Kühlbetrieb der Wärmepumpe angesteuert.",
         translation_key="io_config_out_5",
     ),
     StatusItem(
         number=6,
         text="Verdichterbetrieb",
-        description="Ausgang wird bei Verdichterbetrieb der Wärmepumpe angesteuert.",
         translation_key="io_config_out_6",
     ),
     StatusItem(
         number=7,
         text="Warmwasserbetrieb",
-        description="Ausgang wird bei Warmwasserladung angesteuert.",
         translation_key="io_config_out_7",
     ),
     StatusItem(
         number=8,
         text="Dauerspannung",
-        description="Ausgang wird bei eingeschaltetem Innengerät angesteuert.",
         translation_key="io_config_out_8",
     ),
     StatusItem(
         number=9,
         text="Betriebsweitermeldung",
-        description="Ausgang wird bei Verdichterbetrieb angesteuert.",
         translation_key="io_config_out_9",
     ),
     StatusItem(
         number=10,
         text="Hz- WW-Betrieb",
-        description="Ausgang wird im Heizbetrieb oder bei Warmwasserladung angesteuert.",
         translation_key="io_config_out_10",
     ),
     StatusItem(
         number=11,
         text="Düsenringheizung",
-        description="Ausgang wird bei zusätzlicher Heizung am Düsenring im Außengerät angesteuert.",
         translation_key="io_config_out_11",
     ),
     StatusItem(
         number=12,
         text="Kondensatwannenheizung",
-        description="Ausgang wird bei zusätzlicher Heizung in der Kondensatwanne im Außengerät angesteuert",
         translation_key="io_config_out_12",
     ),
     StatusItem(
         number=13,
         text="Pumpe HK1",
-        description="Ausgang wird bei Pumpenbetrieb für einen direkten Heizkreis angesteuert.",
         translation_key="io_config_out_13",
     ),
     StatusItem(
         number=14,
         text="Umlenkventil Heizen",
-        description="Ausgang wird angesteuert, wenn das Dreiwegeventil auf Heizbetrieb steht.",
         translation_key="io_config_out_14",
     ),
     StatusItem(
         number=15,
         text="Umlenkventil Warmwasser",
-        description="Ausgang wird angesteuert, wenn das Dreiwegeventil auf Warmwasserladung steht.",
         translation_key="io_config_out_15",
     ),
     StatusItem(
         number=65535,
         text="Umlenkventil Kühlen",
-        description="Ausgang wird angesteuert, wenn das Dreiwegeventil auf Kühlbetrieb steht.",
         translation_key="io_config_out_65535",
     ),
     StatusItem(
         number=65535,
         text="65535",
-        description="Keine Funktion, wird nicht angesteuert.",
         translation_key="io_config_out_65535",
     ),
 ]
@@ -1298,46 +1256,6 @@ MODBUS_HZ_ITEMS = [
     ModbusItem( address=41112, name="Kühlen Konstanttemperatur", mformat=FORMATS.TEMPERATURE, mtype=TYPES.NUMBER_RO, device=DEVICES.HZ, params=PARAMS_ROOMTEMP, translation_key="kuehl_konstanttemp"),
 ]
 
-# buils other Heizkreis Itemlists
-MODBUS_HZ2_ITEMS: list = []
-for item in MODBUS_HZ_ITEMS:
-    mbi2 = copy.deepcopy(x=item)
-    mbi2.address = item.address+100
-    mbi2.name = item.name + "2"
-    mbi2.translation_key = item.translation_key + "2"
-    mbi2.device = DEVICES.HZ2
-    MODBUS_HZ2_ITEMS.append(mbi2)
-
-# buils other Heizkreis Itemlists
-MODBUS_HZ3_ITEMS: list = []
-for item in MODBUS_HZ_ITEMS:
-    mbi3 = copy.deepcopy(x=item)
-    mbi3.address = item.address+200
-    mbi3.name = item.name + "3"
-    mbi3.translation_key = item.translation_key + "3"
-    mbi3.device = DEVICES.HZ3
-    MODBUS_HZ3_ITEMS.append(mbi3)
-
-# buils other Heizkreis Itemlists
-MODBUS_HZ4_ITEMS: list = []
-for item in MODBUS_HZ_ITEMS:
-    mbi4 = copy.deepcopy(x=item)
-    mbi4.address = item.address+300
-    mbi4.name = item.name + "4"
-    mbi4.translation_key = item.translation_key + "4"
-    mbi4.device = DEVICES.HZ4
-    MODBUS_HZ4_ITEMS.append(mbi4)
-
-# buils other Heizkreis Itemlists
-MODBUS_HZ5_ITEMS: list = []
-for item in MODBUS_HZ_ITEMS:
-    mbi5: ModbusItem = copy.deepcopy(x=item)
-    mbi5.address = item.address+400
-    mbi5.name = item.name + "5"
-    mbi5.translation_key = item.translation_key + "5"
-    mbi5.device = DEVICES.HZ5
-    MODBUS_HZ5_ITEMS.append(mbi5)
-
 MODBUS_WW_ITEMS: list[ModbusItem] = [
     ModbusItem( address=32101, name="Warmwassersolltemperatur", mformat=FORMATS.TEMPERATURE, mtype=TYPES.SENSOR, device=DEVICES.WW, params=PARAMS_WATERTEMP, translation_key="ww_soll_temp"),
     ModbusItem( address=32102, name="Warmwassertemperatur", mformat=FORMATS.TEMPERATURE, mtype=TYPES.SENSOR, device=DEVICES.WW, params=PARAMS_WATERTEMP, translation_key="ww_temp"),
@@ -1435,18 +1353,57 @@ WEBIF_INFO_HEIZKREIS1: list[WebItem] = [
     WebItem(name="Vorlauftemperatur", mformat=FORMATS.TEMPERATURE, mtype=TYPES.SENSOR, device=DEVICES.WIH, webif_group="WIH", translation_key="webif_info_heizkreis1_vorlauftemperatur"),
 ]
 
-DEVICELISTS: list = [
-    MODBUS_SYS_ITEMS,
-    MODBUS_WP_ITEMS,
-    MODBUS_WW_ITEMS,
-    MODBUS_HZ_ITEMS,
-    MODBUS_HZ2_ITEMS,
-    MODBUS_HZ3_ITEMS,
-    MODBUS_HZ4_ITEMS,
-    MODBUS_HZ5_ITEMS,
-    MODBUS_W2_ITEMS,
-    MODBUS_ST_ITEMS,
-    MODBUS_IO_ITEMS
-]
-
 # fmt: on
+
+# Heizkreis 2..5 use the items of Heizkreis 1 with an address offset of 100 per
+# circuit. The lists are built on first use, the items are copies that
+# share resultlist and params with the items of MODBUS_HZ_ITEMS.
+HZ_DEVICES: dict[int, str] = {
+    2: DEVICES.HZ2,
+    3: DEVICES.HZ3,
+    4: DEVICES.HZ4,
+    5: DEVICES.HZ5,
+}
+_HZ_LIST_NAMES: dict[str, int] = {
+    f"MODBUS_HZ{circuit}_ITEMS": circuit for circuit in HZ_DEVICES
+}
+
+
+@cache
+def get_hz_items(circuit: int) -> list[ModbusItem]:
+    """Return the item list of Heizkreis 2..5."""
+    return [
+        item.replace(
+            address=item.address + 100 * (circuit - 1),
+            name=item.name + str(circuit),
+            translation_key=item.translation_key + str(circuit),
+            device=HZ_DEVICES[circuit],
+        )
+        for item in MODBUS_HZ_ITEMS
+    ]
+
+
+def get_devicelists(circuits: tuple[int, ...] = (2, 3, 4, 5)) -> list[list[ModbusItem]]:
+    """Return the item lists of all devices with the given additional heating circuits."""
+    return [
+        MODBUS_SYS_ITEMS,
+        MODBUS_WP_ITEMS,
+        MODBUS_WW_ITEMS,
+        MODBUS_HZ_ITEMS,
+        *(get_hz_items(circuit) for circuit in circuits),
+        MODBUS_W2_ITEMS,
+        MODBUS_ST_ITEMS,
+        MODBUS_IO_ITEMS,
+    ]
+
+
+def __getattr__(name: str) -> Any:
+    """Build MODBUS_HZ2_ITEMS..MODBUS_HZ5_ITEMS and DEVICELISTS on first access."""
+    if name == "DEVICELISTS":
+        value: Any = get_devicelists()
+    elif name in _HZ_LIST_NAMES:
+        value = get_hz_items(_HZ_LIST_NAMES[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -2,22 +2,88 @@
 
 from __future__ import annotations
 
-from typing import Any
+import copy
+from functools import cache, lru_cache
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Self
 
-from .const import DEVICES, FORMATS, TYPES
+from .const import FORMATS
 
+# shared by all items without params, must not be modified
+_NO_PARAMS: dict[Any, Any] = {}
 
-class StatusItem:
+# descriptions of the status items, key is "<translation_key>/<text>"
+_DESCRIPTIONS_FILE = Path(__file__).parent / "status_descriptions.json.gz"
+
+
+@cache
+def read_status_descriptions() -> bytes:
+    """Return the compressed descriptions file, read once.
+
+    This is blocking I/O, async_setup reads the file in the executor.
+    """
+    try:
+        return _DESCRIPTIONS_FILE.read_bytes()
+    except OSError:
+        return b""
+
+
+@lru_cache(maxsize=64)
+def get_status_description(translation_key: str, text: str) -> str:
+    """Return the description of a status item.
+
+    Only the compressed file and the recently used descriptions are kept in
+    memory, a miss decompresses the file.
+    """
+    try:
+        descriptions = json.loads(gzip.decompress(read_status_descriptions()))
+    except (OSError, EOFError, ValueError):
+        return ""
+    return descriptions.get(f"{translation_key}/{text}", "")
+
+
+class _FrozenSlots:
+    """Base class for immutable items with __slots__.
+
+    The attributes are set once in __init__, assigning them afterwards raises
+    an AttributeError. This allows to share the items between config entries,
+    the runtime values are kept in the ItemStates of each entry.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent modification of the item definition."""
+        raise AttributeError(f"{type(self).__name__}.{name} is read-only")
+
+    def __setstate__(self, state: tuple[Any, dict[str, Any]]) -> None:
+        """Restore the slots, used by copy and pickle."""
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+
+    def replace(self, **changes: Any) -> Self:
+        """Return a copy of the item with the given attributes changed."""
+        item = copy.copy(self)
+        for name, value in changes.items():
+            object.__setattr__(item, name, value)
+        return item
+
+
+class StatusItem(_FrozenSlots):
     """An item of a status, e.g. error code and error text along with a precise description.
 
     A class is intentionally defined here because the assignment via dictionaries would not work so elegantly in the end,
     especially when searching backwards. (At least I don't know how...)
     """
 
-    _number: int | None = None
-    _text: str | None = None
-    _description: str | None = None
-    _translation_key: str = ""
+    __slots__ = ("_description", "number", "text", "translation_key")
+
+    _description: str | None
+    number: int
+    text: str
+    translation_key: str
 
     def __init__(
         self,
@@ -27,66 +93,83 @@ class StatusItem:
         description: str | None = None,
     ) -> None:
         """Initialise StatusItem."""
-        self._number = number
-        self._text = text
-        self._description = description
-        self._translation_key = translation_key or ""
+        object.__setattr__(self, "number", number or 0)
+        object.__setattr__(self, "text", text or "")
+        object.__setattr__(self, "translation_key", translation_key or "")
+        # None: the description is read from the descriptions file on access
+        object.__setattr__(self, "_description", description)
 
     @property
-    def number(self) -> int:
-        """Return number."""
-        return self._number or 0
+    def description(self) -> str:
+        """Return description."""
+        if self._description is None:
+            return get_status_description(self.translation_key, self.text)
+        return self._description
 
-    @number.setter
-    def number(self, value: int) -> None:
-        """Set number."""
-        self._number = value
 
-    @property
-    def text(self) -> str:
-        """Return text."""
-        return self._text or ""
+class ItemStates:
+    """Runtime values of the items of one config entry.
 
-    @text.setter
-    def text(self, value: str) -> None:
-        self._text = value
+    The items only hold the static definition and can be shared between
+    config entries, the values read from the heat pump are stored here.
+    """
 
-    @property
-    def description(self) -> str:
-        """Return description."""
-        return self._description or ""
+    __slots__ = ("_invalid", "_values")
 
-    @description.setter
-    def description(self, value: str) -> None:
-        self._description = value
+    def __init__(self) -> None:
+        """Initialise ItemStates."""
+        self._values: dict[ApiItem, Any] = {}
+        self._invalid: set[ApiItem] = set()
 
-    @property
-    def translation_key(self) -> str:
-        """Return translation_key."""
-        return self._translation_key
+    def get_state(self, item: ApiItem) -> Any:
+        """Return the state of the item."""
+        return self._values.get(item)
+
+    def set_state(self, item: ApiItem, val: Any) -> None:
+        """Set the state of the item."""
+        self._values[item] = val
+
+    def get_states(self) -> dict[ApiItem, Any]:
+        """Return a copy of the states of all items read so far."""
+        return dict(self._values)
 
-    @translation_key.setter
-    def translation_key(self, val: str) -> None:
-        """Set translation_key."""
-        self._translation_key = val
+    def is_invalid(self, item: ApiItem) -> bool:
+        """Return True if the item is not available on the heat pump."""
+        return item in self._invalid
 
+    def set_invalid(self, item: ApiItem, val: bool) -> None:
+        """Mark the item as (not) available on the heat pump."""
+        if val:
+            self._invalid.add(item)
+        else:
+            self._invalid.discard(item)
 
-class ApiItem:
+
+class ApiItem(_FrozenSlots):
     """Class ApiIem item.
 
     This can either be a ModbusItem or a WebifItem
     """
 
-    _name: str = "empty"
-    _format: str = FORMATS.UNKNOWN
-    _type: str = TYPES.SENSOR
-    _resultlist: Any = None
-    _device: str = DEVICES.UK
-    _state: Any = None
-    _is_invalid: bool = False
-    _translation_key: str = ""
-    _params: dict[Any, Any] | None = None
-    _divider: int = 1
+    __slots__ = (
+        "device",
+        "divider",
+        "format",
+        "name",
+        "params",
+        "resultlist",
+        "translation_key",
+        "type",
+    )
+
+    name: str
+    format: str
+    type: str
+    device: str
+    translation_key: str
+    resultlist: Any
+    params: dict[Any, Any]
+    divider: int
 
     def __init__(
         self,
@@ -99,115 +182,31 @@ class ApiItem:
         params: dict[Any, Any] | None = None,
     ) -> None:
         """Initialise ModbusItem."""
-        self._name: str = name
-        self._format: str = mformat
-        self._type: str = mtype
-        self._device: str = device
-        self._resultlist = resultlist
-        self._state = None
-        self._is_invalid = False
-        self._translation_key = translation_key or ""
-        self._params = params
-        self._divider = 1
-
-    @property
-    def params(self) -> dict[Any, Any]:
-        """Return state."""
-        return self._params or {}
-
-    @params.setter
-    def params(self, val: dict[Any, Any] | None) -> None:
-        self._params = val
-
-    @property
-    def divider(self) -> int:
-        """Return state."""
-        return self._divider
-
-    @divider.setter
-    def divider(self, val: int) -> None:
-        self._divider = val
-
-    @property
-    def is_invalid(self) -> bool:
-        """Return state."""
-        return self._is_invalid
-
-    @is_invalid.setter
-    def is_invalid(self, val: bool) -> None:
-        self._is_invalid = val
-
-    @property
-    def state(self) -> Any:
-        """Return the state of the item set by modbusobject."""
-        return self._state
-
-    @state.setter
-    def state(self, val: Any) -> None:
-        """Set the state of the item from modbus."""
-        self._state = val
-
-    @property
-    def name(self) -> str:
-        """Return name."""
-        return self._name
-
-    @name.setter
-    def name(self, val: str) -> None:
-        """Set name."""
-        self._name = val
-
-    @property
-    def format(self) -> str:
-        """Return format."""
-        return self._format
-
-    @property
-    def type(self) -> str:
-        """Return type."""
-        return self._type
-
-    @property
-    def device(self) -> str:
-        """Return device."""
-        return self._device
-
-    @device.setter
-    def device(self, val: str) -> None:
-        """Set device."""
-        self._device = val
-
-    @property
-    def translation_key(self) -> str:
-        """Return translation_key."""
-        return self._translation_key
-
-    @translation_key.setter
-    def translation_key(self, val: str) -> None:
-        """Set translation_key."""
-        self._translation_key = val
-
-    @property
-    def resultlist(self) -> Any:
-        """Return resultlist."""
-        return self._resultlist
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "format", mformat)
+        object.__setattr__(self, "type", mtype)
+        object.__setattr__(self, "device", device)
+        object.__setattr__(self, "translation_key", translation_key or "")
+        object.__setattr__(self, "resultlist", resultlist)
+        object.__setattr__(self, "params", params or _NO_PARAMS)
+        object.__setattr__(self, "divider", 1)
 
     def get_text_from_number(self, val: int) -> str | None:
         """Get errortext from corresponding number."""
         if val is None:
             return None
-        if self._resultlist is None:
+        if self.resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
+        for _useless, item in enumerate(self.resultlist):
             if val == item.number:
                 return item.text
         return f"unbekannt <{val}>"
 
     def get_number_from_text(self, val: str) -> int | None:
         """Get number of corresponding errortext."""
-        if self._resultlist is None:
+        if self.resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
+        for _useless, item in enumerate(self.resultlist):
             if val == item.text:
                 return item.number
         return -1
@@ -216,9 +215,9 @@ class ApiItem:
         """Get errortext from corresponding number."""
         if val is None:
             return None
-        if self._resultlist is None:
+        if self.resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
+        for _useless, item in enumerate(self.resultlist):
             if val == item.number:
                 return item.translation_key
         return f"unbekannt <{val}>"
@@ -227,9 +226,9 @@ class ApiItem:
         """Get number of corresponding errortext."""
         if val is None:
             return None
-        if self._resultlist is None:
+        if self.resultlist is None:
             return None
-        for _useless, item in enumerate(self._resultlist):
+        for _useless, item in enumerate(self.resultlist):
             if val == item.translation_key:
                 return item.number
         return -1
@@ -241,6 +240,10 @@ class WebItem(ApiItem):
     Used for generating entities.
     """
 
+    __slots__ = ("webif_group",)
+
+    webif_group: str
+
     def __init__(
         self,
         name: str,
@@ -274,21 +277,11 @@ class WebItem(ApiItem):
             resultlist=resultlist,
             params=params,
         )
-        self._webif_group: str = webif_group
-
-    @property
-    def webif_group(self) -> str:
-        """Return webif_group."""
-        return self._webif_group
-
-    @webif_group.setter
-    def webif_group(self, val: str) -> None:
-        """Set webif_group."""
-        self._webif_group = val
+        object.__setattr__(self, "webif_group", webif_group)
 
     def get_value(self, val: str) -> str:
         """Get the value based on the format."""
-        if self._format in [
+        if self.format in [
             FORMATS.TEMPERATURE,
             FORMATS.PERCENTAGE,
         ]:
@@ -299,7 +292,9 @@ class WebItem(ApiItem):
 class ModbusItem(ApiItem):
     """Represents an Modbus item."""
 
-    _address: int
+    __slots__ = ("address",)
+
+    address: int
 
     def __init__(
         self,
@@ -334,14 +329,4 @@ class ModbusItem(ApiItem):
             resultlist=resultlist,
             params=params,
         )
-        self._address = address
-
-    @property
-    def address(self) -> int:
-        """Return address."""
-        return self._address
-
-    @address.setter
-    def address(self, val: int) -> None:
-        """Set address."""
-        self._address = val
+        object.__setattr__(self, "address", address)
@@ -193,6 +193,20 @@ class PowerMap:
 
         return self._max_power[int(y)][int(x)]
 
+    def get_metadata(self) -> dict[str, Any]:
+        """Return the source points and the shape of the interpolated grid."""
+        return {
+            "file": self._config_entry.data.get(CONF.KENNFELD_FILE),
+            "interpolation": "cubic_spline" if SPLINE_AVAILABLE else "chebyshev",
+            "known_x": list(self.known_x),
+            "known_t": list(self.known_t),
+            "known_y_points": [len(row) for row in self.known_y],
+            "grid_rows": len(self._max_power),
+            "grid_columns": len(self._max_power[0]) if self._max_power else 0,
+            "power_min": float(np.min(self._max_power)) if self._max_power else None,
+            "power_max": float(np.max(self._max_power)) if self._max_power else None,
+        }
+
     def plot_kennfeld_to_file(self) -> None:
         """Plot the kennfeld file into png image for display."""
         if not MATPLOTLIB_AVAILABLE or plt is None:
@@ -0,0 +1,308 @@
+"""Counters and latency histograms of the modbus communication.
+
+The metrics are updated for every request, so they are kept as plain
+counters in memory. A request costs a dict lookup, a bisect in the bucket
+bounds and two additions on the histogram of its register. The histograms
+per function code and per device group and the percentiles are derived when
+they are read, e.g. by the diagnostic sensors after each poll cycle.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+import math
+import time
+from typing import Any
+
+# upper bounds of the latency buckets in seconds, the last bucket is +Inf
+BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+OUTCOME_OK = 0
+# the heat pump answered with a modbus exception
+OUTCOME_EXCEPTION = 1
+# no answer, e.g. timeout or lost connection
+OUTCOME_ERROR = 2
+OUTCOMES = ("ok", "exception", "error")
+# exception codes of an overloaded heat pump: server device failure and busy,
+# unlike e.g. code 2 (illegal address) of a register that does not exist
+OVERLOAD_EXCEPTION_CODES = (4, 6)
+
+# number of poll cycles and connection events kept for the diagnostics
+HISTORY_LENGTH = 32
+
+
+class LatencyHistogram:
+    """Histogram with the fixed buckets of BUCKETS."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts: list[int] = [0] * (len(BUCKETS) + 1)
+        self.sum: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of observations."""
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        """Add a duration."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the observations of other."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.sum += other.sum
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket containing the percentile.
+
+        Returns None for an empty histogram and inf when the percentile is in
+        the last bucket.
+        """
+        count = self.count
+        if count == 0:
+            return None
+        rank = fraction * count
+        total = 0
+        for bound, bucket_count in zip(BUCKETS, self.counts, strict=False):
+            total += bucket_count
+            if total >= rank:
+                return bound
+        return math.inf
+
+
+class RegisterStats(LatencyHistogram):
+    """Requests of one register and function code."""
+
+    __slots__ = ("function_code", "item", "outcomes", "updated")
+
+    def __init__(self, item: Any, function_code: int) -> None:
+        """Initialize the statistics of item."""
+        super().__init__()
+        self.item = item
+        self.function_code: int = function_code
+        # failed requests, index is OUTCOME_EXCEPTION or OUTCOME_ERROR
+        self.outcomes: list[int] = [0, 0, 0]
+        # time.perf_counter() of the last valid answer
+        self.updated: float | None = None
+
+
+class ModbusMetrics:
+    """Metrics of the modbus communication of one config entry."""
+
+    __slots__ = (
+        "connect_failures",
+        "connection_history",
+        "connects",
+        "consecutive_errors",
+        "cycle_durations",
+        "cycle_history",
+        "cycles",
+        "last_answer",
+        "last_cycle_duration",
+        "last_cycle_errors",
+        "last_cycle_latency",
+        "last_cycle_overloads",
+        "last_cycle_requests",
+        "outcomes",
+        "overloads",
+        "poll_interval",
+        "registers",
+        "request_seconds",
+        "requests",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        # key is the item for reads and (item, function code) for writes
+        self.registers: dict[Any, RegisterStats] = {}
+        self.requests: int = 0
+        # summed duration of all requests
+        self.request_seconds: float = 0.0
+        # number of failed requests, index is OUTCOME_EXCEPTION or OUTCOME_ERROR
+        self.outcomes: list[int] = [0, 0, 0]
+        # requests without answer or with an overload exception code
+        self.overloads: int = 0
+        self.connects: int = 0
+        # requests without answer since the last answer
+        self.consecutive_errors: int = 0
+        # time.perf_counter() of the last answer of the heat pump
+        self.last_answer: float | None = None
+        self.connect_failures: int = 0
+        self.cycles: int = 0
+        self.cycle_durations: LatencyHistogram = LatencyHistogram()
+        self.last_cycle_duration: float | None = None
+        self.last_cycle_requests: int = 0
+        self.last_cycle_errors: int = 0
+        self.last_cycle_overloads: int = 0
+        # mean duration of the requests of the last cycle
+        self.last_cycle_latency: float | None = None
+        # current interval of the poll governor in seconds
+        self.poll_interval: float | None = None
+        # (time.time(), duration, requests, errors) of the last cycles
+        self.cycle_history: deque[tuple[float, float, int, int]] = deque(
+            maxlen=HISTORY_LENGTH
+        )
+        # (time.time(), event) with event "connected", "connect_failed" or "closed"
+        self.connection_history: deque[tuple[float, str]] = deque(maxlen=HISTORY_LENGTH)
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests."""
+        return self.outcomes[OUTCOME_EXCEPTION] + self.outcomes[OUTCOME_ERROR]
+
+    @property
+    def reconnects(self) -> int:
+        """Return the number of successful connects after the first one."""
+        return max(0, self.connects - 1)
+
+    def record_request(
+        self,
+        item: Any,
+        function_code: int,
+        start: float,
+        end: float,
+        outcome: int,
+        *,
+        key: Any = None,
+        exception_code: int = 0,
+    ) -> None:
+        """Add a request of item timed with time.perf_counter().
+
+        The statistics are kept per key, which defaults to item. Requests of
+        the same item with another function code need another key.
+        exception_code is the one of an OUTCOME_EXCEPTION response.
+        """
+        self.requests += 1
+        stats = self.registers.get(item if key is None else key)
+        if stats is None:
+            stats = self.registers[item if key is None else key] = RegisterStats(
+                item, function_code
+            )
+        seconds = end - start
+        self.request_seconds += seconds
+        stats.counts[bisect_left(BUCKETS, seconds)] += 1
+        stats.sum += seconds
+        if outcome == OUTCOME_ERROR or exception_code in OVERLOAD_EXCEPTION_CODES:
+            self.overloads += 1
+        if outcome == OUTCOME_ERROR:
+            self.consecutive_errors += 1
+        else:
+            # an exception response is an answer as well
+            self.consecutive_errors = 0
+            self.last_answer = end
+        if outcome == OUTCOME_OK:
+            stats.updated = end
+        else:
+            stats.outcomes[outcome] += 1
+            self.outcomes[outcome] += 1
+
+    def record_connect(self, success: bool) -> None:
+        """Add a connection attempt."""
+        if success:
+            self.connects += 1
+        else:
+            self.connect_failures += 1
+        self.connection_history.append(
+            (time.time(), "connected" if success else "connect_failed")
+        )
+
+    def record_close(self) -> None:
+        """Add a closed connection."""
+        self.connection_history.append((time.time(), "closed"))
+
+    def record_answer(self) -> None:
+        """Add an answer that is not counted as request, e.g. a heartbeat."""
+        self.consecutive_errors = 0
+        self.last_answer = time.perf_counter()
+
+    def start_cycle(self) -> tuple[float, int, int, int, float]:
+        """Return the state at the start of a poll cycle for end_cycle."""
+        return (
+            time.perf_counter(),
+            self.requests,
+            self.errors,
+            self.overloads,
+            self.request_seconds,
+        )
+
+    def end_cycle(self, start: tuple[float, int, int, int, float]) -> None:
+        """Add a poll cycle started with start_cycle."""
+        started, requests, errors, overloads, request_seconds = start
+        duration = time.perf_counter() - started
+        self.cycles += 1
+        self.cycle_durations.observe(duration)
+        self.last_cycle_duration = duration
+        self.last_cycle_requests = self.requests - requests
+        self.last_cycle_errors = self.errors - errors
+        self.last_cycle_overloads = self.overloads - overloads
+        self.last_cycle_latency = (
+            (self.request_seconds - request_seconds) / self.last_cycle_requests
+            if self.last_cycle_requests
+            else None
+        )
+        self.cycle_history.append(
+            (time.time(), duration, self.last_cycle_requests, self.last_cycle_errors)
+        )
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the failed requests of the last cycle in percent."""
+        if self.last_cycle_requests == 0:
+            return None
+        return 100 * self.last_cycle_errors / self.last_cycle_requests
+
+    def by_function_code(self) -> dict[int, LatencyHistogram]:
+        """Return the latency histograms per function code."""
+        histograms: dict[int, LatencyHistogram] = {}
+        for stats in self.registers.values():
+            histograms.setdefault(stats.function_code, LatencyHistogram()).merge(stats)
+        return histograms
+
+    def by_device(self) -> dict[str, LatencyHistogram]:
+        """Return the latency histograms per device group."""
+        histograms: dict[str, LatencyHistogram] = {}
+        for stats in self.registers.values():
+            histograms.setdefault(stats.item.device, LatencyHistogram()).merge(stats)
+        return histograms
+
+    def data_ages(self) -> dict[Any, float]:
+        """Return the age of the last valid value of each register in seconds."""
+        now = time.perf_counter()
+        return {
+            key: now - stats.updated
+            for key, stats in self.registers.items()
+            if stats.updated is not None
+        }
+
+    def data_age_percentile(self, fraction: float) -> float | None:
+        """Return a percentile of the data ages in seconds."""
+        updated = [
+            stats.updated
+            for stats in self.registers.values()
+            if stats.updated is not None
+        ]
+        if not updated:
+            return None
+        # ascending ages are descending update times
+        updated.sort(reverse=True)
+        return (
+            time.perf_counter()
+            - updated[min(len(updated) - 1, int(fraction * len(updated)))]
+        )
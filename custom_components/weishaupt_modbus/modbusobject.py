@@ -8,17 +8,108 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from pathlib import Path
+import socket
+import time
 from typing import Any
 
 from pymodbus import ExceptionResponse, ModbusException
 from pymodbus.client import AsyncModbusTcpClient
 
+from .capture import CaptureWriter, CapturingModbusClient, ReplayModbusClient
 from .configentry import MyConfigEntry
 from .const import CONF, FORMATS, TYPES
-from .items import ModbusItem
+from .health import HealthTracker
+from .items import ItemStates, ModbusItem
+from .metrics import OUTCOME_ERROR, OUTCOME_EXCEPTION, OUTCOME_OK, ModbusMetrics
+from .slim_modbus import (
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    FC_WRITE_REGISTER,
+    SlimModbusTcpClient,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+type ModbusClient = (
+    AsyncModbusTcpClient
+    | SlimModbusTcpClient
+    | CapturingModbusClient
+    | ReplayModbusClient
+)
+
+# TCP keepalive of the modbus connection: the first probe is sent after
+# KEEPALIVE_IDLE seconds without traffic, then every KEEPALIVE_INTERVAL seconds,
+# the connection is dead after KEEPALIVE_COUNT unanswered probes
+KEEPALIVE_IDLE = 5
+KEEPALIVE_INTERVAL = 2
+KEEPALIVE_COUNT = 3
+# a request that is not acknowledged by TCP within this time fails the
+# connection (Linux only), in milliseconds
+USER_TIMEOUT = 5000
+
+# seconds to wait for the answer of a request, a request without answer is not
+# repeated: the coordinator checks the connection with a heartbeat instead, so
+# a dead connection is found within the timeout of a poll cycle
+REQUEST_TIMEOUT = 3.0
+
+# a connection without answer for this time is checked before the next cycle
+HEARTBEAT_IDLE = 20.0
+# the heartbeat reads the outside temperature, any answer proves the connection
+HEARTBEAT_ADDRESS = 30001
+HEARTBEAT_TIMEOUT = 1.5
+
+
+def _exception_code(response: Any) -> int:
+    """Return the exception code of an error response, 0 for a valid one."""
+    if not response.isError():
+        return 0
+    return getattr(response, "exception_code", 0) or 0
+
+
+def _transport_of(client: ModbusClient) -> asyncio.BaseTransport | None:
+    """Return the transport of a modbus client, None without TCP connection."""
+    if isinstance(client, CapturingModbusClient):
+        client = client.client
+    if isinstance(client, SlimModbusTcpClient):
+        return client.transport
+    if isinstance(client, ReplayModbusClient):
+        return None
+    # pymodbus keeps the transport in the transaction manager, this is not part
+    # of its API and may move in a new release
+    transport = getattr(getattr(client, "ctx", None), "transport", None)
+    if not isinstance(transport, asyncio.BaseTransport):
+        _LOGGER.warning(
+            "No transport found in %s, TCP keepalive is not enabled",
+            type(client).__name__,
+        )
+        return None
+    return transport
+
+
+def enable_keepalive(transport: asyncio.BaseTransport | None) -> None:
+    """Enable TCP keepalive with short timeouts on the socket of transport.
+
+    A gateway that reboots or a WiFi bridge that roams leaves the connection
+    half-open, without keepalive it reports connected for minutes.
+    """
+    sock = None if transport is None else transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (
+            ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+            ("TCP_USER_TIMEOUT", USER_TIMEOUT),
+        ):
+            # not all options exist on all platforms
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+    except OSError as exc:
+        _LOGGER.debug("TCP keepalive could not be enabled: %s", exc)
+
 
 class ModbusAPI:
     """ModbusAPI class provides a connection to the modbus, which is used by the ModbusItems."""
@@ -36,9 +127,27 @@ class ModbusAPI:
         self._connect_pending: bool = False
         self._failed_reconnect_counter: int = 0
         self._last_connection_try: Any = None
-        self._modbus_client: AsyncModbusTcpClient = AsyncModbusTcpClient(
-            host=self._ip, port=self._port, name="Weishaupt_WBB", retries=1
-        )
+        self._states: ItemStates = ItemStates()
+        self._metrics: ModbusMetrics = ModbusMetrics()
+        self._health: HealthTracker = HealthTracker()
+        self._modbus_client: ModbusClient
+        if config_entry.data.get(CONF.REPLAY_FILE):
+            # offline tests and benchmarks, serves a capture file
+            self._modbus_client = ReplayModbusClient(
+                Path(config_entry.data[CONF.REPLAY_FILE])
+            )
+        elif config_entry.data.get(CONF.FAST_TRANSPORT, False):
+            self._modbus_client = SlimModbusTcpClient(
+                host=self._ip, port=self._port, timeout=REQUEST_TIMEOUT
+            )
+        else:
+            self._modbus_client = AsyncModbusTcpClient(
+                host=self._ip,
+                port=self._port,
+                name="Weishaupt_WBB",
+                timeout=REQUEST_TIMEOUT,
+                retries=0,
+            )
 
     async def connect(self, startup: bool = False) -> bool:
         """Open modbus connection."""
@@ -54,8 +163,10 @@ class ModbusAPI:
                 )
                 await asyncio.sleep(300)
             await self._modbus_client.connect()
+            self._metrics.record_connect(self._modbus_client.connected)
             if self._modbus_client.connected:
                 # _LOGGER.warning("Connection to heatpump succeeded")
+                enable_keepalive(_transport_of(self._modbus_client))
                 self._failed_reconnect_counter = 0
                 self._connect_pending = False
                 return self._modbus_client.connected
@@ -66,13 +177,54 @@ class ModbusAPI:
 
         except ModbusException:
             _LOGGER.warning("Connection to heatpump failed")
+            self._metrics.record_connect(False)
             self._failed_reconnect_counter += 1
             self._connect_pending = False
             self._modbus_client.close()
             return self._modbus_client.connected
 
+    @property
+    def connected(self) -> bool:
+        """Return True if the client reports an open connection."""
+        return self._modbus_client.connected
+
+    def idle_time(self) -> float:
+        """Return the seconds since the last answer, inf without answer."""
+        last_answer = self._metrics.last_answer
+        if last_answer is None:
+            return float("inf")
+        return time.perf_counter() - last_answer
+
+    async def heartbeat(self) -> bool:
+        """Read one register with a short timeout, True if the heat pump answers.
+
+        A half-open connection reports connected, but no request is answered.
+        """
+        try:
+            async with asyncio.timeout(HEARTBEAT_TIMEOUT):
+                await self._modbus_client.read_input_registers(
+                    HEARTBEAT_ADDRESS, slave=1
+                )
+        except (ModbusException, TimeoutError) as exc:
+            _LOGGER.debug("Heartbeat failed: %s", exc)
+            return False
+        self._metrics.record_answer()
+        return True
+
+    async def reconnect(self) -> bool:
+        """Close a dead connection and connect again at once.
+
+        Returns True if the new connection answers a heartbeat, a gateway
+        may accept the connection without reaching the heat pump.
+        """
+        _LOGGER.info("Connection to heat pump lost, reconnecting")
+        self.close()
+        # startup skips the waiting time after repeated failures
+        return await self.connect(startup=True) and await self.heartbeat()
+
     def close(self) -> bool:
         """Close modbus connection."""
+        self._metrics.record_close()
         try:
             self._modbus_client.close()
         except ModbusException:
@@ -81,7 +233,35 @@ class ModbusAPI:
         _LOGGER.info("Connection to heat pump closed")
         return True
 
-    def get_device(self) -> AsyncModbusTcpClient:
+    def start_capture(self, writer: CaptureWriter) -> None:
+        """Record all following requests and responses to writer.
+
+        Has to be called before the ModbusObjects are created, they keep a
+        reference to the client.
+        """
+        self._modbus_client = CapturingModbusClient(self._modbus_client, writer)
+
+    def stop_capture(self) -> None:
+        """Close the capture file, has to be called before the ModbusAPI is dropped."""
+        if isinstance(self._modbus_client, CapturingModbusClient):
+            self._modbus_client.writer.close()
+
+    @property
+    def states(self) -> ItemStates:
+        """Return the runtime values of the items read over this connection."""
+        return self._states
+
+    @property
+    def metrics(self) -> ModbusMetrics:
+        """Return the counters of the requests over this connection."""
+        return self._metrics
+
+    @property
+    def health(self) -> HealthTracker:
+        """Return the health of the registers read over this connection."""
+        return self._health
+
+    def get_device(self) -> ModbusClient:
         """Return modbus connection."""
         return self._modbus_client
 
@@ -108,8 +288,11 @@ class ModbusObject:
 
         """
         self._modbus_item: ModbusItem = modbus_item
-        self._modbus_client: AsyncModbusTcpClient = modbus_api.get_device()
+        self._modbus_client: ModbusClient = modbus_api.get_device()
         self._no_connect_warn: bool = no_connect_warn
+        self._states: ItemStates = modbus_api.states
+        self._metrics: ModbusMetrics = modbus_api.metrics
+        self._health: HealthTracker = modbus_api.health
 
     def check_valid_result(self, val: int) -> int | None:
         """Check if item is available and valid."""
@@ -121,7 +304,7 @@ class ModbusObject:
             case FORMATS.STATUS:
                 return self.check_status(val)
             case _:
-                self._modbus_item.is_invalid = False
+                self._states.set_invalid(self._modbus_item, False)
                 return val
 
     def check_temperature(self, val: int) -> int | None:
@@ -137,21 +320,21 @@ class ModbusObject:
         match val:
             case -32768:
                 # No Sensor installed, remove it from the list
-                self._modbus_item.is_invalid = True
+                self._states.set_invalid(self._modbus_item, True)
                 return None
             case 32768:
                 # This seems to be zero, should be allowed
-                self._modbus_item.is_invalid = True
+                self._states.set_invalid(self._modbus_item, True)
                 return None
             case -32767:
                 # Sensor broken set return value to -99.9 to inform user
-                self._modbus_item.is_invalid = False
+                self._states.set_invalid(self._modbus_item, False)
                 return -999
             case _:
                 # Temperature Sensor seems to be Einerkomplement
                 if val > 32768:
                     val = val - 65536
-                self._modbus_item.is_invalid = False
+                self._states.set_invalid(self._modbus_item, False)
                 return val
 
     def check_percentage(self, val) -> int | None:
@@ -162,14 +345,14 @@ class ModbusObject:
         :type val: int
         """
         if val == 65535:
-            self._modbus_item.is_invalid = True
+            self._states.set_invalid(self._modbus_item, True)
             return None
-        self._modbus_item.is_invalid = False
+        self._states.set_invalid(self._modbus_item, False)
         return val
 
     def check_status(self, val) -> int:
         """Check general availability of item."""
-        self._modbus_item.is_invalid = False
+        self._states.set_invalid(self._modbus_item, False)
         return val
 
     def check_valid_response(self, val) -> int:
@@ -192,7 +375,7 @@ class ModbusObject:
         if mbr.isError():
             myexception_code: ExceptionResponse = mbr
             if myexception_code.exception_code == 2:
-                self._modbus_item.is_invalid = True
+                self._states.set_invalid(self._modbus_item, True)
             else:
                 _LOGGER.warning(
                     "Received Modbus library error: %s in item: %s",
@@ -226,37 +409,61 @@ class ModbusObject:
                 self._modbus_item.translation_key,
             )
             return None
-        if not self._modbus_item.is_invalid:
+        # quarantined registers are only read when a probe is due, see health.py
+        if self._health.is_due(self._modbus_item):
+            match self._modbus_item.type:
+                case TYPES.SENSOR | TYPES.SENSOR_CALC:
+                    # Sensor entities are read-only
+                    read = self._modbus_client.read_input_registers
+                    function_code = FC_READ_INPUT_REGISTERS
+                case (
+                    TYPES.SELECT
+                    | TYPES.NUMBER
+                    | TYPES.NUMBER_RO
+                ):
+                    read = self._modbus_client.read_holding_registers
+                    function_code = FC_READ_HOLDING_REGISTERS
+                case _:
+                    _LOGGER.warning(
+                        "Unknown Sensor type: %s in %s",
+                        str(self._modbus_item.type),
+                        str(self._modbus_item.name),
+                    )
+                    return None
+            start = time.perf_counter()
             try:
-                match self._modbus_item.type:
-                    case TYPES.SENSOR | TYPES.SENSOR_CALC:
-                        # Sensor entities are read-only
-                        mbr = await self._modbus_client.read_input_registers(
-                            self._modbus_item.address, slave=1
-                        )
-                        return self.validate_modbus_answer(mbr)
-                    case (
-                        TYPES.SELECT
-                        | TYPES.NUMBER
-                        | TYPES.NUMBER_RO
-                    ):
-                        mbr = await self._modbus_client.read_holding_registers(
-                            self._modbus_item.address, slave=1
-                        )
-                        return self.validate_modbus_answer(mbr)
-                    case _:
-                        _LOGGER.warning(
-                            "Unknown Sensor type: %s in %s",
-                            str(self._modbus_item.type),
-                            str(self._modbus_item.name),
-                        )
-                        return None
+                mbr = await read(self._modbus_item.address, slave=1)
             except ModbusException as exc:
+                self._metrics.record_request(
+                    self._modbus_item,
+                    function_code,
+                    start,
+                    time.perf_counter(),
+                    OUTCOME_ERROR,
+                )
+                self._health.record_failure(self._modbus_item)
                 _LOGGER.warning(
                     "ModbusException: Reading %s in item: %s failed",
                     str(exc),
                     str(self._modbus_item.name),
                 )
+                return None
+            self._metrics.record_request(
+                self._modbus_item,
+                function_code,
+                start,
+                time.perf_counter(),
+                OUTCOME_EXCEPTION if mbr.isError() else OUTCOME_OK,
+                exception_code=_exception_code(mbr),
+            )
+            val = self.validate_modbus_answer(mbr)
+            if self._states.is_invalid(self._modbus_item):
+                self._health.record_invalid(self._modbus_item)
+            elif mbr.isError():
+                self._health.record_failure(self._modbus_item)
+            else:
+                self._health.record_success(self._modbus_item)
+            return val
         return None
 
     # @value.setter
@@ -270,6 +477,7 @@ class ModbusObject:
             return
         if self._modbus_client.connected is False:
             return
+        start = time.perf_counter()
         try:
             match self._modbus_item.type:
                 case (
@@ -280,12 +488,29 @@ class ModbusObject:
                     # Sensor entities are read-only
                     return
                 case _:
-                    await self._modbus_client.write_register(
+                    mbr = await self._modbus_client.write_register(
                         self._modbus_item.address,
                         self.check_valid_response(value),
                         slave=1,
                     )
+                    self._metrics.record_request(
+                        self._modbus_item,
+                        FC_WRITE_REGISTER,
+                        start,
+                        time.perf_counter(),
+                        OUTCOME_EXCEPTION if mbr.isError() else OUTCOME_OK,
+                        key=(self._modbus_item, FC_WRITE_REGISTER),
+                        exception_code=_exception_code(mbr),
+                    )
         except ModbusException:
+            self._metrics.record_request(
+                self._modbus_item,
+                FC_WRITE_REGISTER,
+                start,
+                time.perf_counter(),
+                OUTCOME_ERROR,
+                key=(self._modbus_item, FC_WRITE_REGISTER),
+            )
             _LOGGER.warning(
                 "ModbusException: Writing %s to %s (%s) failed",
                 str(value),
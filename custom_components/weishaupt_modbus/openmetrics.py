@@ -0,0 +1,168 @@
+"""OpenMetrics export of the modbus and WebIF polling statistics.
+
+With the option "Metrics-Endpoint" the counters of ModbusMetrics and the
+WebIF timings are served at /api/weishaupt_modbus/metrics in the OpenMetrics
+text format, e.g. for Prometheus. The view requires authentication, use a
+long-lived access token as bearer token of the scrape job. The values are
+read from memory, the state machine and the recorder are not involved.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .configentry import MyConfigEntry
+from .const import CONF, CONST
+from .metrics import BUCKETS, OUTCOME_OK, OUTCOMES, LatencyHistogram, ModbusMetrics
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = CONST.DOMAIN
+
+_REGISTERED = f"{CONST.DOMAIN}_metrics_view"
+
+
+def _escape(value: object) -> str:
+    """Return a label value escaped for the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    """Return the label set of a sample."""
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _histogram(name: str, labels: str, histogram: LatencyHistogram) -> Iterator[str]:
+    """Yield the samples of a histogram with cumulative buckets."""
+    total = 0
+    for bound, count in zip(BUCKETS, histogram.counts, strict=False):
+        total += count
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {total}'
+    total += histogram.counts[-1]
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {total}'
+    yield f"{name}_count{{{labels}}} {total}"
+    yield f"{name}_sum{{{labels}}} {histogram.sum}"
+
+
+def _metric(name: str, metric_type: str, help_text: str) -> Iterator[str]:
+    """Yield the metadata of a metric family."""
+    yield f"# TYPE {name} {metric_type}"
+    yield f"# HELP {name} {help_text}"
+
+
+def _modbus_families(
+    entries: list[tuple[str, ModbusMetrics]],
+) -> Iterator[str]:
+    """Yield the metric families of the modbus communication."""
+    name = f"{PREFIX}_poll_cycle_duration_seconds"
+    yield from _metric(name, "histogram", "Duration of the modbus poll cycles.")
+    for entry, metrics in entries:
+        yield from _histogram(name, _labels(entry=entry), metrics.cycle_durations)
+
+    name = f"{PREFIX}_requests"
+    yield from _metric(name, "counter", "Modbus requests by function code and outcome.")
+    for entry, metrics in entries:
+        counts: dict[int, list[int]] = {}
+        for stats in metrics.registers.values():
+            outcomes = counts.setdefault(stats.function_code, [0, 0, 0])
+            for index, count in enumerate(stats.outcomes):
+                outcomes[index] += count
+            outcomes[OUTCOME_OK] += stats.count - sum(stats.outcomes)
+        for function_code, outcomes in sorted(counts.items()):
+            for outcome, count in zip(OUTCOMES, outcomes, strict=True):
+                labels = _labels(
+                    entry=entry, function_code=function_code, outcome=outcome
+                )
+                yield f"{name}_total{{{labels}}} {count}"
+
+    name = f"{PREFIX}_request_duration_seconds"
+    yield from _metric(name, "histogram", "Duration of the modbus requests.")
+    for entry, metrics in entries:
+        for function_code, histogram in sorted(metrics.by_function_code().items()):
+            labels = _labels(entry=entry, function_code=function_code)
+            yield from _histogram(name, labels, histogram)
+
+    for attribute, help_text in (
+        ("reconnects", "Successful connects after the first one."),
+        ("connect_failures", "Failed connection attempts."),
+    ):
+        name = f"{PREFIX}_{attribute}"
+        yield from _metric(name, "counter", help_text)
+        for entry, metrics in entries:
+            yield f"{name}_total{{{_labels(entry=entry)}}} {getattr(metrics, attribute)}"
+
+    name = f"{PREFIX}_register_age_seconds"
+    yield from _metric(name, "gauge", "Age of the last valid value of a register.")
+    for entry, metrics in entries:
+        for key, age in metrics.data_ages().items():
+            stats = metrics.registers[key]
+            labels = _labels(
+                entry=entry,
+                address=stats.item.address,
+                function_code=stats.function_code,
+                key=stats.item.translation_key,
+            )
+            yield f"{name}{{{labels}}} {age}"
+
+
+def _webif_families(entries: list[tuple[str, MyConfigEntry]]) -> Iterator[str]:
+    """Yield the metric families of the WebIF requests."""
+    webifs = [
+        (entry, config_entry.runtime_data.webif_api)
+        for entry, config_entry in entries
+        if config_entry.runtime_data.webif_api is not None
+    ]
+    for phase, attribute in (("fetch", "fetch_times"), ("parse", "parse_times")):
+        name = f"{PREFIX}_webif_{phase}_duration_seconds"
+        yield from _metric(name, "histogram", f"Duration of the WebIF {phase}.")
+        for entry, webif in webifs:
+            yield from _histogram(name, _labels(entry=entry), getattr(webif, attribute))
+
+
+def render_metrics(config_entries: list[MyConfigEntry]) -> str:
+    """Return the metrics of the config entries in the OpenMetrics format."""
+    entries = [(config_entry.entry_id, config_entry) for config_entry in config_entries]
+    lines = [
+        *_modbus_families(
+            [
+                (entry, config_entry.runtime_data.modbus_api.metrics)
+                for entry, config_entry in entries
+            ]
+        ),
+        *_webif_families(entries),
+        "# EOF",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsView(HomeAssistantView):
+    """Serves the metrics of the entries with the option "Metrics-Endpoint"."""
+
+    url = f"/api/{CONST.DOMAIN}/metrics"
+    name = f"api:{CONST.DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        config_entries = [
+            config_entry
+            for config_entry in hass.config_entries.async_loaded_entries(CONST.DOMAIN)
+            if config_entry.data.get(CONF.METRICS_ENDPOINT, False)
+        ]
+        return web.Response(
+            body=render_metrics(config_entries), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+
+@callback
+def async_register_view(hass: HomeAssistant) -> None:
+    """Register the metrics view, views can not be removed again."""
+    if hass.data.get(_REGISTERED):
+        return
+    hass.data[_REGISTERED] = True
+    hass.http.register_view(MetricsView())
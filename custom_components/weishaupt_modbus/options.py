@@ -0,0 +1,225 @@
+"""Apply changed options of a loaded config entry.
+
+A reload closes the modbus connection, fits and plots the power map again,
+probes every item and creates all entities again. Most options do not need
+this, so the update listener compares the options with the ones the entry
+was set up with and applies the difference:
+
+- heating circuits and second heat generator: the entities of enabled devices
+  are added, the ones of disabled devices removed, the polling follows the
+  flags of the entry
+- kennfeld file: the power map is replaced
+- metrics endpoint: the view is registered
+- poll interval bounds: the bounds of the poll governor are replaced
+- prefix, postfix, name options and WebIF: the platforms are set up again
+  with the same connection, coordinator and power map
+- host, port, transport, register map and capture: full reload
+
+The entities of registers that were not available at setup are added the
+same way when the registers answer, see health.py.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .configentry import MyConfigEntry
+from .const import CONF, CONST, DEVICES
+from .coordinator import poll_bounds
+from .entity_helpers import PLATFORM_ITEM_TYPES, build_entity_list
+from .hpconst import get_hz_items
+from .items import ModbusItem
+from .kennfeld import PowerMap
+from .openmetrics import async_register_view
+from .register_helpers import OPTIONAL_DEVICES
+from .webif_object import WebifConnection
+
+_LOGGER = logging.getLogger(__name__)
+
+# options that need a new connection or new item lists
+RELOAD_OPTIONS = (
+    CONF.HOST,
+    CONF.PORT,
+    CONF.FAST_TRANSPORT,
+    CONF.REGISTER_MAP_FILE,
+    CONF.CAPTURE,
+    CONF.REPLAY_FILE,
+)
+
+# options that change the names or unique ids of the entities
+PLATFORM_OPTIONS = (
+    CONF.PREFIX,
+    CONF.DEVICE_POSTFIX,
+    CONF.NAME_DEVICE_PREFIX,
+    CONF.NAME_TOPIC_PREFIX,
+)
+
+WEBIF_OPTIONS = (CONF.CB_WEBIF, CONF.USERNAME, CONF.PASSWORD, CONF.WEBIF_TOKEN)
+
+# heating circuit of the devices with a built-in item list per circuit
+_CIRCUITS = {DEVICES.HZ2: 2, DEVICES.HZ3: 3, DEVICES.HZ4: 4, DEVICES.HZ5: 5}
+
+
+def changed_options(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    """Return the keys with a different value."""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def needs_reload(changed: set[str]) -> bool:
+    """Return True if the changed options can not be applied in place."""
+    return any(option in changed for option in RELOAD_OPTIONS)
+
+
+def needs_platform_reload(changed: set[str]) -> bool:
+    """Return True if the entities have to be created again."""
+    return any(option in changed for option in (*PLATFORM_OPTIONS, *WEBIF_OPTIONS))
+
+
+async def async_apply_webif(entry: MyConfigEntry) -> None:
+    """Replace the WebIF connection, the platforms have to be set up again."""
+    data = entry.runtime_data
+    if data.webif_api is not None:
+        await data.webif_api.close()
+        data.webif_api = None
+    if entry.data[CONF.CB_WEBIF]:
+        data.webif_api = WebifConnection(config_entry=entry)
+        await data.webif_api.login()
+
+
+async def async_apply_kennfeld(hass: HomeAssistant, entry: MyConfigEntry) -> None:
+    """Replace the power map, the calculated sensors use it at the next update."""
+    powermap = PowerMap(entry, hass)
+    await powermap.initialize()
+    entry.runtime_data.powermap = powermap
+    _LOGGER.info("Power map %s loaded", entry.data[CONF.KENNFELD_FILE])
+
+
+def apply_metrics_endpoint(hass: HomeAssistant, entry: MyConfigEntry) -> None:
+    """Register the metrics view, it only serves the entries with the option."""
+    if entry.data.get(CONF.METRICS_ENDPOINT, False):
+        async_register_view(hass)
+
+
+def apply_poll_bounds(entry: MyConfigEntry) -> None:
+    """Move the poll governor into the new bounds."""
+    coordinator = entry.runtime_data.coordinator
+    coordinator.governor.set_bounds(*poll_bounds(entry))
+    if coordinator.update_interval is not None:
+        coordinator.update_interval = timedelta(seconds=coordinator.governor.interval)
+
+
+def _device_items(entry: MyConfigEntry, device: str) -> list[ModbusItem]:
+    """Return the items of the device, loaded from hpconst if missing."""
+    data = entry.runtime_data
+    items = [
+        item for items in data.devicelists for item in items if item.device == device
+    ]
+    if items or device not in _CIRCUITS:
+        return items
+    # the built-in register map only contains the circuits enabled at setup
+    if entry.data.get(CONF.REGISTER_MAP_FILE, CONST.DEF_REGISTER_MAP) != (
+        CONST.DEF_REGISTER_MAP
+    ):
+        return items
+    items = get_hz_items(_CIRCUITS[device])
+    data.devicelists.append(items)
+    data.coordinator.add_items(items)
+    return items
+
+
+async def async_add_items(entry: MyConfigEntry, items: list[Any]) -> int:
+    """Add the entities of the items to the platforms, return their number."""
+    data = entry.runtime_data
+    count = 0
+    for platform, item_types in PLATFORM_ITEM_TYPES.items():
+        add_entities = data.add_entities.get(platform)
+        if add_entities is None:
+            continue
+        entries: list[Any] = []
+        for item_type in item_types:
+            entries = await build_entity_list(
+                entries=entries,
+                config_entry=entry,
+                api_items=items,
+                item_type=item_type,
+                coordinator=data.coordinator,
+            )
+        add_entities(entries, update_before_add=True)
+        count += len(entries)
+    return count
+
+
+async def async_add_device(entry: MyConfigEntry, device: str) -> None:
+    """Add the entities of an enabled device to the platforms."""
+    count = await async_add_items(entry, _device_items(entry, device))
+    _LOGGER.info("Added %s entities of %s", count, device)
+
+
+async def async_add_recovered(entry: MyConfigEntry) -> None:
+    """Add the entities of the registers that answer again."""
+    items = entry.runtime_data.modbus_api.health.take_recovered()
+    if items:
+        count = await async_add_items(entry, items)
+        _LOGGER.info(
+            "Added %s entities of recovered registers %s",
+            count,
+            [item.address for item in items],
+        )
+
+
+def watch_recovered(hass: HomeAssistant, entry: MyConfigEntry) -> CALLBACK_TYPE:
+    """Add the entities of recovered registers after each poll cycle."""
+
+    @callback
+    def _cycle_done() -> None:
+        if entry.runtime_data.modbus_api.health.has_recovered():
+            entry.async_create_background_task(
+                hass, async_add_recovered(entry), "weishaupt_modbus add recovered"
+            )
+
+    return entry.runtime_data.coordinator.async_add_listener(_cycle_done)
+
+
+def remove_device(hass: HomeAssistant, entry: MyConfigEntry, device: str) -> None:
+    """Remove the entities of a disabled device and detach the device."""
+    device_registry = dr.async_get(hass)
+    device_entry = device_registry.async_get_device(
+        identifiers={(CONST.DOMAIN, device)}
+    )
+    if device_entry is None or entry.entry_id not in device_entry.config_entries:
+        return
+    entity_registry = er.async_get(hass)
+    removed = 0
+    for registry_entry in er.async_entries_for_device(entity_registry, device_entry.id):
+        if registry_entry.config_entry_id == entry.entry_id:
+            entity_registry.async_remove(registry_entry.entity_id)
+            removed += 1
+    device_registry.async_update_device(
+        device_entry.id, remove_config_entry_id=entry.entry_id
+    )
+    _LOGGER.info("Removed %s entities of %s", removed, device)
+
+
+async def async_apply_devices(
+    hass: HomeAssistant, entry: MyConfigEntry, changed: set[str], add: bool = True
+) -> None:
+    """Add or remove the entities of the devices whose flag changed.
+
+    With add=False only the items of enabled devices are loaded, for the
+    platforms that are set up again anyway.
+    """
+    for device, flag in OPTIONAL_DEVICES.items():
+        if flag not in changed:
+            continue
+        # entries created before the device detection poll the W2 items
+        if not entry.data.get(flag, flag == CONF.W2):
+            remove_device(hass, entry, device)
+        elif add:
+            await async_add_device(entry, device)
+        else:
+            _device_items(entry, device)
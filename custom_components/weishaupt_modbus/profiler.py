@@ -0,0 +1,231 @@
+"""On-demand profiling of the poll cycles and the entity updates.
+
+The service weishaupt_modbus.profile profiles the event loop until the
+coordinators of all loaded config entries have finished the requested number
+of poll cycles and notified their entities. Two files are written to the
+config directory:
+
+- <name>.pstats: cProfile statistics, e.g. for snakeviz or pstats
+- <name>.collapsed: stacks of the event loop thread sampled every few
+  milliseconds in the collapsed format of flamegraph.pl and speedscope
+
+Both profilers only run during the requested cycles, so the service can be
+used on a production system without restarting Home Assistant. Since Python
+3.12 cProfile records all threads, the waits of the sampler thread show up in
+the pstats file and can be ignored.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import cProfile
+import logging
+from pathlib import Path
+import sys
+import threading
+from types import CodeType, FrameType
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import CONST
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+DEFAULT_CYCLES = 3
+# seconds between two stack samples
+SAMPLE_INTERVAL = 0.005
+# seconds added to the expected duration before the profiling is stopped
+PROFILE_GRACE = 60
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+_RUNNING = f"{CONST.DOMAIN}_profile_running"
+
+
+class StackSampler:
+    """Samples the stack of a thread from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        """Initialize the sampler.
+
+        Args:
+            thread_id: threading.get_ident() of the sampled thread
+            interval: seconds between two samples
+
+        """
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[CodeType, str] = {}
+        self.samples: Counter[str] = Counter()
+
+    def _label(self, code: CodeType) -> str:
+        """Return the frame name of code, cached because it is sampled often."""
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (
+                f"{code.co_qualname} ({Path(code.co_filename).name}:"
+                f"{code.co_firstlineno})"
+            )
+        return label
+
+    def _sample(self, frame: FrameType | None) -> None:
+        """Count the stack of frame, outermost frame first."""
+        stack: list[str] = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        """Take samples until stop() is called."""
+        while not self._stop.wait(self._interval):
+            self._sample(sys._current_frames().get(self._thread_id))  # noqa: SLF001
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(
+            target=self._run, name=f"{CONST.DOMAIN}_sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, filepath: Path) -> None:
+        """Write the samples in the collapsed stack format."""
+        with filepath.open("w", encoding="utf-8") as file:
+            file.writelines(
+                f"{stack} {count}\n" for stack, count in self.samples.most_common()
+            )
+
+
+async def async_profile_cycles(
+    hass: HomeAssistant, coordinators: list[Any], cycles: int
+) -> dict[str, Any]:
+    """Profile the event loop until each coordinator finished cycles updates.
+
+    Returns the paths of the written files, the number of cycles and samples.
+    """
+    remaining = dict.fromkeys(range(len(coordinators)), cycles)
+    done = asyncio.Event()
+    unsubscribers = []
+
+    def count_cycle(index: int) -> Any:
+        @callback
+        def cycle_done() -> None:
+            # called after the listeners of the entities of the coordinator
+            remaining[index] -= 1
+            if all(count <= 0 for count in remaining.values()):
+                done.set()
+
+        return cycle_done
+
+    for index, coordinator in enumerate(coordinators):
+        unsubscribers.append(coordinator.async_add_listener(count_cycle(index)))
+    timeout = PROFILE_GRACE + cycles * max(
+        (
+            coordinator.update_interval.total_seconds()
+            for coordinator in coordinators
+            if coordinator.update_interval is not None
+        ),
+        default=0,
+    )
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+    try:
+        profiler.enable()
+    except ValueError as err:
+        # another profiler, e.g. of the profiler integration, is running
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+        raise HomeAssistantError(f"Profiling not possible: {err}") from err
+    sampler.start()
+    try:
+        async with asyncio.timeout(timeout):
+            await done.wait()
+            # let the state_changed events of the last cycle be handled
+            await asyncio.sleep(0)
+    except TimeoutError:
+        _LOGGER.warning(
+            "Profiling stopped after %s s before all cycles were finished", timeout
+        )
+    finally:
+        profiler.disable()
+        sampler.stop()
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    name = f"{CONST.DOMAIN}_profile_{dt_util.utcnow():%Y%m%d_%H%M%S}"
+    pstats_file = Path(hass.config.path(f"{name}.pstats"))
+    collapsed_file = Path(hass.config.path(f"{name}.collapsed"))
+
+    def write_files() -> None:
+        profiler.dump_stats(pstats_file)
+        sampler.write_collapsed(collapsed_file)
+
+    await hass.async_add_executor_job(write_files)
+    _LOGGER.info("Profile written to %s and %s", pstats_file, collapsed_file)
+    return {
+        "pstats": str(pstats_file),
+        "collapsed": str(collapsed_file),
+        "cycles": cycles - max(0, min(remaining.values(), default=0)),
+        "samples": sampler.samples.total(),
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next poll cycles of all loaded config entries."""
+        coordinators = [
+            entry.runtime_data.coordinator
+            for entry in hass.config_entries.async_loaded_entries(CONST.DOMAIN)
+        ]
+        if not coordinators:
+            raise HomeAssistantError("No loaded config entry to profile")
+        if hass.data.get(_RUNNING):
+            raise HomeAssistantError("Profiling is already running")
+        hass.data[_RUNNING] = True
+        try:
+            return await async_profile_cycles(
+                hass, coordinators, call.data[ATTR_CYCLES]
+            )
+        finally:
+            hass.data[_RUNNING] = False
+
+    hass.services.async_register(
+        CONST.DOMAIN,
+        SERVICE_PROFILE,
+        profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
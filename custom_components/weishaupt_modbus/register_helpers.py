@@ -0,0 +1,55 @@
+"""Register blocks and optional devices.
+
+Shared by the device detection of the config flow and the register scanner.
+The scanner needs numpy and is only used from the command line, so the
+helpers needed at runtime live here.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .const import CONF, DEVICES
+from .slim_modbus import FC_READ_HOLDING_REGISTERS, FC_READ_INPUT_REGISTERS
+
+# registers read with one request
+BLOCK_SIZE = 64
+
+# configuration flag of each optional device
+OPTIONAL_DEVICES: dict[str, str] = {
+    DEVICES.HZ2: CONF.HK2,
+    DEVICES.HZ3: CONF.HK3,
+    DEVICES.HZ4: CONF.HK4,
+    DEVICES.HZ5: CONF.HK5,
+    DEVICES.W2: CONF.W2,
+}
+
+
+def function_code_of(address: int) -> int:
+    """Return the function code to read address, 4xxxx are holding registers."""
+    if address >= 40000:
+        return FC_READ_HOLDING_REGISTERS
+    return FC_READ_INPUT_REGISTERS
+
+
+def contiguous_blocks(
+    addresses: Iterable[int], block_size: int
+) -> list[tuple[int, int]]:
+    """Return (first, count) blocks of consecutive addresses.
+
+    Unlike split_blocks of the scanner, the blocks contain only the given
+    addresses, so a block read does not hit an unknown address.
+    """
+    blocks: list[tuple[int, int]] = []
+    for address in sorted(set(addresses)):
+        if blocks:
+            first, count = blocks[-1]
+            if (
+                address == first + count
+                and count < block_size
+                and function_code_of(address) == function_code_of(first)
+            ):
+                blocks[-1] = (first, count + 1)
+                continue
+        blocks.append((address, 1))
+    return blocks
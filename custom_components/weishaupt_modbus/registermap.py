@@ -0,0 +1,280 @@
+"""Register map files.
+
+A register map file describes the modbus items of a heat pump type as json.
+The built-in map is defined in hpconst.py. Other heat pump types can ship a
+file "*registers.json" in the integration directory which is selected in the
+configuration. The file looks like this:
+
+{
+    "version": 1,
+    "statuslists": {"SYS_FEHLER": [{"number": 1, "text": "...", "translation_key": "..."}]},
+    "params": {"PARAMS_STDTEMP": {"divider": 10, "unit": "°C"}},
+    "devices": [
+        {
+            "device": "dev_system",
+            "items": [
+                {
+                    "address": 30001,
+                    "name": "Aussentemperatur",
+                    "format": "temperature",
+                    "type": "Sensor",
+                    "translation_key": "aussentemp",
+                    "params": "PARAMS_STDTEMP"
+                }
+            ]
+        }
+    ]
+}
+
+"resultlist" and "params" of an item either name an entry of "statuslists"
+and "params" or contain the list or dict itself. Named entries are shared by
+all items that use them.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+import sys
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from . import hpconst
+from .const import CONST
+from .items import ModbusItem, StatusItem
+
+_LOGGER = logging.getLogger(__name__)
+
+# version of the file format
+REGISTER_MAP_VERSION = 1
+
+
+def _build_statuslist(raw: list[dict[str, Any]]) -> list[StatusItem]:
+    """Build a status list from its json representation."""
+    return [
+        StatusItem(
+            number=entry["number"],
+            text=entry["text"],
+            translation_key=entry.get("translation_key"),
+            description=entry.get("description"),
+        )
+        for entry in raw
+    ]
+
+
+def _build_params(raw: dict[str, Any]) -> dict[str, Any]:
+    """Build a params dict from its json representation."""
+    params = dict(raw)
+    if "deviceclass" in params:
+        params["deviceclass"] = SensorDeviceClass(params["deviceclass"])
+    if "stateclass" in params:
+        params["stateclass"] = SensorStateClass(params["stateclass"])
+    return params
+
+
+def parse_register_map(data: dict[str, Any]) -> list[list[ModbusItem]]:
+    """Build the device lists from the json representation of a register map.
+
+    Args:
+        data: content of a register map file
+
+    Returns:
+        list of modbus item lists, one per device
+
+    Raises:
+        ValueError: when the content is not a valid register map
+
+    """
+    if data.get("version") != REGISTER_MAP_VERSION:
+        raise ValueError(f"Unsupported register map version {data.get('version')}")
+
+    try:
+        statuslists = {
+            name: _build_statuslist(raw)
+            for name, raw in data.get("statuslists", {}).items()
+        }
+        params = {
+            name: _build_params(raw) for name, raw in data.get("params", {}).items()
+        }
+
+        devicelists: list[list[ModbusItem]] = []
+        for device in data["devices"]:
+            itemlist: list[ModbusItem] = []
+            for raw_item in device["items"]:
+                resultlist = raw_item.get("resultlist")
+                if isinstance(resultlist, str):
+                    resultlist = statuslists[resultlist]
+                elif resultlist is not None:
+                    resultlist = _build_statuslist(resultlist)
+                item_params = raw_item.get("params")
+                if isinstance(item_params, str):
+                    item_params = params[item_params]
+                elif item_params is not None:
+                    item_params = _build_params(item_params)
+                itemlist.append(
+                    ModbusItem(
+                        address=raw_item["address"],
+                        name=raw_item["name"],
+                        mformat=raw_item["format"],
+                        mtype=raw_item["type"],
+                        device=raw_item.get("device", device["device"]),
+                        translation_key=raw_item["translation_key"],
+                        resultlist=resultlist,
+                        params=item_params,
+                    )
+                )
+            devicelists.append(itemlist)
+    except (KeyError, TypeError) as err:
+        raise ValueError(f"Invalid register map: {err!r}") from err
+    return devicelists
+
+
+def load_register_map(filepath: Path) -> list[list[ModbusItem]]:
+    """Load a register map file.
+
+    This function does blocking I/O and has to be run in the executor.
+
+    Args:
+        filepath: the register map file
+
+    Returns:
+        list of modbus item lists, one per device
+
+    Raises:
+        OSError: when the register map file cannot be read
+        ValueError: when the register map file is invalid
+
+    """
+    try:
+        data = json.loads(filepath.read_bytes())
+    except json.JSONDecodeError as err:
+        raise ValueError(f"Register map {filepath.name} is no valid json") from err
+    return parse_register_map(data)
+
+
+def remove_register_map_caches(storage_dir: Path) -> None:
+    """Remove the register map caches written by former versions.
+
+    This function does blocking I/O and has to be run in the executor.
+    """
+    for cache_file in storage_dir.glob(f"{CONST.DOMAIN}.*.cache"):
+        cache_file.unlink(missing_ok=True)
+
+
+def dump_register_map(
+    devicelists: list[list[ModbusItem]],
+    statuslists: dict[str, list[StatusItem]] | None = None,
+    params: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Create the json representation of device lists.
+
+    Status lists and params that are equal to one of the given named ones are
+    written as reference, all others are added with a generated name.
+
+    Args:
+        devicelists: list of modbus item lists, one per device
+        statuslists: named status lists, e.g. SYS_FEHLER from hpconst
+        params: named params, e.g. PARAMS_STDTEMP from hpconst
+
+    Returns:
+        content of a register map file
+
+    """
+
+    def statuslist_to_json(statuslist: list[StatusItem]) -> list[dict[str, Any]]:
+        result = []
+        for status in statuslist:
+            entry: dict[str, Any] = {
+                "number": status.number,
+                "text": status.text,
+                "translation_key": status.translation_key,
+            }
+            if status.description:
+                entry["description"] = status.description
+            result.append(entry)
+        return result
+
+    def add_named(
+        named: dict[str, Any], index: dict[str, str], prefix: str, value: Any
+    ) -> str:
+        key = json.dumps(value, sort_keys=True)
+        if key not in index:
+            name = f"{prefix}_{len(named)}"
+            named[name] = value
+            index[key] = name
+        return index[key]
+
+    json_statuslists: dict[str, Any] = {}
+    json_params: dict[str, Any] = {}
+    statuslist_index: dict[str, str] = {}
+    params_index: dict[str, str] = {}
+    for name, statuslist in (statuslists or {}).items():
+        json_statuslists[name] = statuslist_to_json(statuslist)
+        statuslist_index[json.dumps(json_statuslists[name], sort_keys=True)] = name
+    for name, param in (params or {}).items():
+        json_params[name] = dict(param)
+        params_index[json.dumps(param, sort_keys=True)] = name
+
+    devices = []
+    for devicelist in devicelists:
+        if len(devicelist) == 0:
+            continue
+        items = []
+        for item in devicelist:
+            json_item: dict[str, Any] = {
+                "address": item.address,
+                "name": item.name,
+                "format": item.format,
+                "type": item.type,
+                "translation_key": item.translation_key,
+            }
+            if item.device != devicelist[0].device:
+                json_item["device"] = item.device
+            if item.resultlist is not None:
+                json_item["resultlist"] = add_named(
+                    json_statuslists,
+                    statuslist_index,
+                    "STATUS",
+                    statuslist_to_json(item.resultlist),
+                )
+            if item.params:
+                json_item["params"] = add_named(
+                    json_params, params_index, "PARAMS", dict(item.params)
+                )
+            items.append(json_item)
+        devices.append({"device": devicelist[0].device, "items": items})
+
+    return {
+        "version": REGISTER_MAP_VERSION,
+        "statuslists": json_statuslists,
+        "params": json_params,
+        "devices": devices,
+    }
+
+
+def create_register_map_json(filepath: Path) -> None:
+    """Write the built-in register map of hpconst.py as register map file.
+
+    The file can be used as template for the register map of another heat pump type.
+    """
+    statuslists = {
+        name: value
+        for name, value in vars(hpconst).items()
+        if isinstance(value, list) and value and isinstance(value[0], StatusItem)
+    }
+    params = {
+        name: value
+        for name, value in vars(hpconst).items()
+        if name.startswith("PARAMS_") and isinstance(value, dict)
+    }
+    data = dump_register_map(hpconst.DEVICELISTS, statuslists, params)
+    filepath.write_text(
+        json.dumps(data, indent=4, ensure_ascii=False), encoding="utf-8"
+    )
+
+
+if __name__ == "__main__":
+    # python -m custom_components.weishaupt_modbus.registermap <file>
+    create_register_map_json(Path(sys.argv[1]))
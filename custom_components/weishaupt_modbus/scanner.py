@@ -0,0 +1,880 @@
+"""Register scanner of the Weishaupt heat pump.
+
+Maps the input registers (30001-39999) and holding registers (40001-49999)
+of a heat pump. Instead of reading one register after the other, the address
+space is read in blocks. The heat pump answers a block that contains an
+unknown address with exception code 2 (illegal data address), then the read
+size is halved until the valid islands are found. Several blocks are scanned
+at the same time over separate connections, as the modbus servers of heat
+pumps answer one request per connection at a time.
+
+The values are written in the semicolon separated layout of
+auswertung_register.csv, in address order while the scan is running:
+
+    python -m custom_components.weishaupt_modbus.scanner --host 192.168.42.144
+
+Ranges that did not answer (timeout, busy) are listed at the end, see
+--help for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterable
+import csv
+from dataclasses import dataclass, field
+import json
+import logging
+from pathlib import Path
+import sys
+import time
+from typing import TextIO
+
+import numpy as np
+import numpy.typing as npt
+from pymodbus import ModbusException
+
+from .capture import ILLEGAL_ADDRESS
+from .const import CONST, FORMATS, TYPES
+from .hpconst import get_devicelists
+from .items import ModbusItem
+from .register_helpers import BLOCK_SIZE, contiguous_blocks, function_code_of
+from .slim_modbus import (
+    FC_READ_HOLDING_REGISTERS,
+    SlimModbusResponse,
+    SlimModbusTcpClient,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RANGES: tuple[tuple[int, int], ...] = ((30001, 39999), (40001, 49999))
+CONNECTIONS = 4
+RETRIES = 2
+# exception code for a count the device does not support
+ILLEGAL_VALUE = 3
+# raw values of a temperature without sensor (32768) or a broken sensor
+# (-32767) and of a percentage without value, see ModbusObject
+TEMPERATURE_SENTINELS = (32768, 32769)
+PERCENTAGE_SENTINEL = 65535
+# plausible range of a temperature in °C
+TEMPERATURE_RANGE = (-60, 150)
+# seconds between two writes of the checkpoint file
+CHECKPOINT_INTERVAL = 2.0
+# suggested poll intervals in seconds, a register is polled at the longest
+# interval that is at most half of its mean time between changes
+POLL_TIERS: tuple[tuple[str, float], ...] = (
+    ("every cycle", CONST.SCAN_INTERVAL.total_seconds()),
+    ("5 min", 300),
+    ("1 h", 3600),
+)
+# tier of registers that did not change while monitoring
+STATIC_TIER = "once"
+
+type BlockCallback = Callable[[int, int, dict[int, int]], None]
+
+
+def parse_range(text: str) -> tuple[int, int]:
+    """Return (first, last) of a range given as "first-last" or "address"."""
+    first, _sep, last = text.partition("-")
+    return int(first), int(last or first)
+
+
+def merge_ranges(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Return the ranges sorted, with overlapping and adjacent ranges joined."""
+    merged: list[tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def subtract_ranges(
+    ranges: Iterable[tuple[int, int]], removed: Iterable[tuple[int, int]]
+) -> list[tuple[int, int]]:
+    """Return the parts of ranges that are not in removed."""
+    remaining = merge_ranges(ranges)
+    for removed_first, removed_last in merge_ranges(removed):
+        parts: list[tuple[int, int]] = []
+        for first, last in remaining:
+            if last < removed_first or first > removed_last:
+                parts.append((first, last))
+                continue
+            if first < removed_first:
+                parts.append((first, removed_first - 1))
+            if last > removed_last:
+                parts.append((removed_last + 1, last))
+        remaining = parts
+    return remaining
+
+
+def split_blocks(
+    ranges: Iterable[tuple[int, int]], block_size: int
+) -> list[tuple[int, int]]:
+    """Return the (first, count) blocks of the ranges.
+
+    Blocks do not cross a range boundary or the boundary between input and
+    holding registers, as they need different function codes.
+    """
+    blocks: list[tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        address = first
+        while address <= last:
+            end = min(last + 1, address + block_size)
+            if address < 40000 < end:
+                end = 40000
+            blocks.append((address, end - address))
+            address = end
+    return blocks
+
+
+@dataclass
+class ScanResult:
+    """Values found by a scan."""
+
+    values: dict[int, int] = field(default_factory=dict)
+    # (first, last) of the scanned ranges
+    ranges: list[tuple[int, int]] = field(default_factory=list)
+    # (first, last) of the ranges without an answer
+    unanswered: list[tuple[int, int]] = field(default_factory=list)
+    requests: int = 0
+
+
+class RegisterScanner:
+    """Scans register ranges in blocks over several connections."""
+
+    def __init__(
+        self,
+        clients: list[SlimModbusTcpClient],
+        block_size: int = BLOCK_SIZE,
+        retries: int = RETRIES,
+    ) -> None:
+        """Initialize the scanner.
+
+        Args:
+            clients: modbus clients, one request is in flight per client
+            block_size: registers per block, the first request of a block
+            retries: retries of a request without a valid answer
+
+        """
+        self._clients = clients
+        self._block_size = block_size
+        self._retries = retries
+        self.result = ScanResult()
+
+    async def _read(
+        self, client: SlimModbusTcpClient, address: int, count: int
+    ) -> SlimModbusResponse | None:
+        """Read count registers, None if there is no usable answer."""
+        for attempt in range(self._retries + 1):
+            if attempt:
+                await asyncio.sleep(0.1 * attempt)
+            if not client.connected and not await client.connect():
+                continue
+            self.result.requests += 1
+            try:
+                if function_code_of(address) == FC_READ_HOLDING_REGISTERS:
+                    response = await client.read_holding_registers(address, count=count)
+                else:
+                    response = await client.read_input_registers(address, count=count)
+            except ModbusException as exc:
+                _LOGGER.debug("No answer for %s+%s: %s", address, count, exc)
+                # a late answer would be taken for the next request
+                client.close()
+                continue
+            if not response.isError() or response.exception_code in (
+                ILLEGAL_ADDRESS,
+                ILLEGAL_VALUE,
+            ):
+                return response
+            _LOGGER.debug(
+                "Exception %s for %s+%s", response.exception_code, address, count
+            )
+        return None
+
+    async def _probe(
+        self, client: SlimModbusTcpClient, first: int, count: int
+    ) -> dict[int, int]:
+        """Return the valid registers of a block.
+
+        The whole block is read first. If it contains an unknown address, the
+        block is walked with a read size that is halved on each exception
+        down to one register and doubled after each valid read. A gap costs
+        one request per register, an island of n registers about 2 log2(n).
+        """
+        values: dict[int, int] = {}
+        end = first + count
+        address, size = first, count
+        while address < end:
+            size = min(size, end - address)
+            response = await self._read(client, address, size)
+            if response is None:
+                self.result.unanswered.append((address, address + size - 1))
+                address, size = address + size, 1
+            elif not response.isError():
+                values.update(
+                    zip(
+                        range(address, address + size), response.registers, strict=False
+                    )
+                )
+                address, size = address + size, size * 2
+            elif size > 1:
+                size //= 2
+            else:
+                address += 1
+        return values
+
+    async def scan(
+        self,
+        ranges: Iterable[tuple[int, int]],
+        on_block: BlockCallback | None = None,
+    ) -> ScanResult:
+        """Scan the ranges, (first, last) inclusive.
+
+        on_block is called with (first, last, values) of each block in
+        address order, so the values can be written while the scan runs.
+        """
+        ranges = sorted(ranges)
+        self.result.ranges.extend(ranges)
+        blocks = split_blocks(ranges, self._block_size)
+        queue = iter(range(len(blocks)))
+        done: dict[int, dict[int, int]] = {}
+        next_block = 0
+
+        async def worker(client: SlimModbusTcpClient) -> None:
+            nonlocal next_block
+            for index in queue:
+                first, count = blocks[index]
+                done[index] = await self._probe(client, first, count)
+                while next_block in done:
+                    values = done.pop(next_block)
+                    self.result.values.update(values)
+                    if on_block is not None:
+                        first, count = blocks[next_block]
+                        on_block(first, first + count - 1, values)
+                    next_block += 1
+
+        await asyncio.gather(*(worker(client) for client in self._clients))
+        self.result.unanswered.sort()
+        return self.result
+
+    async def sample(self, blocks: list[tuple[int, int]]) -> dict[int, int]:
+        """Read the blocks once, registers without a valid answer are missing."""
+        values: dict[int, int] = {}
+        queue = iter(blocks)
+
+        async def worker(client: SlimModbusTcpClient) -> None:
+            for first, count in queue:
+                response = await self._read(client, first, count)
+                if response is not None and not response.isError():
+                    values.update(
+                        zip(
+                            range(first, first + count),
+                            response.registers,
+                            strict=False,
+                        )
+                    )
+
+        await asyncio.gather(*(worker(client) for client in self._clients))
+        return values
+
+
+def mapped_items(
+    devicelists: list[list[ModbusItem]] | None = None,
+) -> dict[int, ModbusItem]:
+    """Return the item of each address of the register map."""
+    items: dict[int, ModbusItem] = {}
+    for device in get_devicelists() if devicelists is None else devicelists:
+        for item in device:
+            # calculated sensors share the address of the item they use
+            if item.type != TYPES.SENSOR_CALC:
+                items.setdefault(item.address, item)
+    return items
+
+
+def _in_ranges(
+    addresses: npt.NDArray[np.int64], ranges: list[tuple[int, int]]
+) -> npt.NDArray[np.bool_]:
+    """Return which addresses lie in one of the sorted (first, last) ranges."""
+    if not ranges:
+        return np.zeros(len(addresses), dtype=np.bool_)
+    firsts = np.array([first for first, _last in ranges])
+    lasts = np.maximum.accumulate([last for _first, last in ranges])
+    index = np.searchsorted(firsts, addresses, side="right") - 1
+    return (index >= 0) & (addresses <= lasts[np.maximum(index, 0)])
+
+
+@dataclass
+class RegisterDiff:
+    """Differences between a scan and the register map."""
+
+    # (address, value) of registers that answer but are not mapped
+    unmapped: list[tuple[int, int]]
+    # mapped registers in the scanned ranges that answer with exception 2
+    missing: list[ModbusItem]
+    # mapped registers with a value outside their format or sentinels
+    invalid: list[tuple[ModbusItem, int]]
+
+
+def diff_register_map(
+    result: ScanResult, devicelists: list[list[ModbusItem]] | None = None
+) -> RegisterDiff:
+    """Compare a scan with the items of the register map.
+
+    The checks run on arrays of all addresses at once. A value is invalid if
+    it is not a sentinel of its format and a status value is not in the
+    resultlist, a percentage is above 100, a temperature is outside
+    TEMPERATURE_RANGE or a number setting is outside its min and max.
+    """
+    by_address = mapped_items(devicelists)
+    items = [by_address[address] for address in sorted(by_address)]
+    mapped = np.array([item.address for item in items], dtype=np.int64)
+    scanned = np.array(sorted(result.values), dtype=np.int64)
+    values = np.array([result.values[address] for address in scanned], dtype=np.int64)
+
+    answered = _in_ranges(mapped, result.ranges) & ~_in_ranges(
+        mapped, result.unanswered
+    )
+    missing = answered & ~np.isin(mapped, scanned)
+    is_mapped = np.isin(scanned, mapped)
+
+    # per mapped register: format flags, divider and limits
+    formats = np.array([item.format for item in items])
+    divider = np.array([item.params.get("divider", 1) for item in items])
+    limited = np.array(
+        [
+            item.type in (TYPES.NUMBER, TYPES.NUMBER_RO) and "min" in item.params
+            for item in items
+        ]
+    )
+    low = np.array([item.params.get("min", 0) for item in items], dtype=float)
+    high = np.array([item.params.get("max", 0) for item in items], dtype=float)
+    # (address << 16 | number) of all known status values
+    status_keys = np.array(
+        [
+            item.address << 16 | status.number
+            for item in items
+            if item.format == FORMATS.STATUS and item.resultlist
+            for status in item.resultlist
+        ],
+        dtype=np.int64,
+    )
+    has_status = np.array(
+        [item.format == FORMATS.STATUS and bool(item.resultlist) for item in items]
+    )
+
+    index = np.searchsorted(mapped, scanned[is_mapped])
+    raw = values[is_mapped]
+    fmt = formats[index]
+    is_temperature = fmt == FORMATS.TEMPERATURE
+    is_percentage = fmt == FORMATS.PERCENTAGE
+    signed = np.where(is_temperature & (raw > 32768), raw - 65536, raw)
+    scaled = signed / divider[index]
+    sentinel = (is_temperature & np.isin(raw, TEMPERATURE_SENTINELS)) | (
+        is_percentage & (raw == PERCENTAGE_SENTINEL)
+    )
+    wrong = (
+        (
+            is_temperature
+            & ((scaled < TEMPERATURE_RANGE[0]) | (scaled > TEMPERATURE_RANGE[1]))
+        )
+        | (is_percentage & (raw > 100))
+        | (has_status[index] & ~np.isin(scanned[is_mapped] << 16 | raw, status_keys))
+        | (limited[index] & ((scaled < low[index]) | (scaled > high[index])))
+    ) & ~sentinel
+
+    return RegisterDiff(
+        unmapped=[
+            (int(address), int(value))
+            for address, value in zip(
+                scanned[~is_mapped], values[~is_mapped], strict=True
+            )
+        ],
+        missing=[items[i] for i in np.flatnonzero(missing)],
+        invalid=[
+            (items[i], int(value))
+            for i, value in zip(index[wrong], raw[wrong], strict=True)
+        ],
+    )
+
+
+def print_diff(diff: RegisterDiff, file: TextIO) -> None:
+    """Print the differences of a scan and the register map."""
+    lines = [f"Unmapped registers: {len(diff.unmapped)}"]
+    lines += [f"  {address} = {value}" for address, value in diff.unmapped]
+    lines.append(f"Mapped registers without answer (exception 2): {len(diff.missing)}")
+    lines += [f"  {item.address} {item.name} ({item.device})" for item in diff.missing]
+    lines.append(f"Mapped registers with invalid values: {len(diff.invalid)}")
+    lines += [
+        f"  {item.address} {item.name} = {value} ({item.format})"
+        for item, value in diff.invalid
+    ]
+    file.write("\n".join(lines) + "\n")
+
+
+class ActivitySamples:
+    """Values of a set of registers sampled over time."""
+
+    def __init__(self, addresses: Iterable[int]) -> None:
+        """Initialize without samples."""
+        self.addresses = np.array(sorted(set(addresses)), dtype=np.int64)
+        self.times: list[float] = []
+        self.rows: list[npt.NDArray[np.int32]] = []
+
+    def add(self, timestamp: float, values: dict[int, int]) -> None:
+        """Add a sample, missing registers are stored as -1."""
+        row = np.full(len(self.addresses), -1, dtype=np.int32)
+        if values:
+            read = np.fromiter(values, dtype=np.int64, count=len(values))
+            row[np.searchsorted(self.addresses, read)] = list(values.values())
+        self.times.append(timestamp)
+        self.rows.append(row)
+
+    def save(self, path: Path) -> None:
+        """Save the samples as npz file for a later analysis."""
+        np.savez_compressed(
+            path,
+            addresses=self.addresses,
+            times=np.array(self.times),
+            values=np.array(self.rows).reshape(-1, len(self.addresses)),
+        )
+
+
+@dataclass
+class RegisterActivity:
+    """How a register changed while it was monitored."""
+
+    address: int
+    samples: int
+    changes: int
+    changes_per_hour: float
+    minimum: int
+    maximum: int
+    # median of the absolute value changes
+    step: float
+    tier: str
+
+
+def analyze_activity(
+    samples: ActivitySamples, devicelists: list[list[ModbusItem]] | None = None
+) -> list[RegisterActivity]:
+    """Return the activity of each register with at least one valid sample.
+
+    Temperatures of the register map are evaluated as signed values. The
+    tier is a guess from the monitored period, a register that changes once
+    a day needs a day of samples to be told apart from a static one.
+    """
+    addresses = samples.addresses
+    if not samples.rows:
+        return []
+    temperatures = [
+        address
+        for address, item in mapped_items(devicelists).items()
+        if item.format == FORMATS.TEMPERATURE
+    ]
+    raw = np.array(samples.rows).reshape(-1, len(addresses)).astype(np.int64)
+    valid = raw >= 0
+    signed = np.isin(addresses, temperatures) & (raw > 32767)
+    values = np.where(signed, raw - 65536, raw)
+
+    delta = np.abs(np.diff(values, axis=0))
+    changed = (delta != 0) & valid[1:] & valid[:-1]
+    changes = changed.sum(axis=0)
+    steps = np.zeros(len(addresses))
+    moving = changes > 0
+    if moving.any():
+        steps[moving] = np.nanmedian(
+            np.where(changed[:, moving], delta[:, moving], np.nan), axis=0
+        )
+    minimum = np.where(valid, values, np.iinfo(np.int64).max).min(axis=0)
+    maximum = np.where(valid, values, np.iinfo(np.int64).min).max(axis=0)
+
+    duration = samples.times[-1] - samples.times[0]
+    hours = duration / 3600 or float("nan")
+    intervals = np.array([interval for _name, interval in POLL_TIERS])
+    # registers without changes are static, they get no interval
+    mean_interval = np.divide(
+        duration, changes, out=np.full(len(addresses), np.inf), where=moving
+    )
+    tier_index = np.maximum(
+        np.searchsorted(intervals, mean_interval / 2, side="right") - 1, 0
+    )
+    counts = valid.sum(axis=0)
+    return [
+        RegisterActivity(
+            address=int(addresses[i]),
+            samples=int(counts[i]),
+            changes=int(changes[i]),
+            changes_per_hour=float(changes[i] / hours),
+            minimum=int(minimum[i]),
+            maximum=int(maximum[i]),
+            step=float(steps[i]),
+            tier=POLL_TIERS[tier_index[i]][0] if changes[i] else STATIC_TIER,
+        )
+        for i in np.flatnonzero(counts)
+    ]
+
+
+def print_activity(
+    activities: list[RegisterActivity],
+    file: TextIO,
+    devicelists: list[list[ModbusItem]] | None = None,
+) -> None:
+    """Print the suggested tier of the mapped registers and the unknown ones."""
+    items = mapped_items(devicelists)
+
+    def line(activity: RegisterActivity, name: str) -> str:
+        return (
+            f"  {activity.address} {name[:32]:32} {activity.changes_per_hour:>9.1f}"
+            f"{activity.minimum:>8}{activity.maximum:>8}{activity.step:>8.1f}"
+            f"  {activity.tier}"
+        )
+
+    header = f"  {'':5} {'':32} {'changes/h':>9}{'min':>8}{'max':>8}{'step':>8}  tier"
+    lines = ["Mapped registers:", header]
+    lines += [
+        line(activity, items[activity.address].name)
+        for activity in activities
+        if activity.address in items
+    ]
+    # placeholders like "Adr. 31106" have the format unknown
+    unknown = sorted(
+        (
+            activity
+            for activity in activities
+            if activity.changes
+            and (
+                activity.address not in items
+                or items[activity.address].format == FORMATS.UNKNOWN
+            )
+        ),
+        key=lambda activity: -activity.changes_per_hour,
+    )
+    lines += ["Undocumented registers that change:", header]
+    lines += [
+        line(
+            activity, items[activity.address].name if activity.address in items else ""
+        )
+        for activity in unknown
+    ]
+    file.write("\n".join(lines) + "\n")
+
+
+class CsvRegisterWriter:
+    """Writes found registers in the layout of auswertung_register.csv."""
+
+    def __init__(
+        self, file: TextIO, column: str, previous: dict[int, int] | None = None
+    ) -> None:
+        """Write the header, column is the name of the value column.
+
+        The previous values, e.g. of a resumed scan, are written in address
+        order between the blocks.
+        """
+        self._file = file
+        self._names = {
+            item.address: item.name for device in get_devicelists() for item in device
+        }
+        self._previous = sorted((previous or {}).items(), reverse=True)
+        file.write(f"Register;Name Doku;{column}\n")
+
+    def write_block(self, first: int, last: int, values: dict[int, int]) -> None:
+        """Write the values of a block in address order."""
+        values = dict(values)
+        while self._previous and self._previous[-1][0] <= last:
+            address, value = self._previous.pop()
+            values.setdefault(address, value)
+        for address in sorted(values):
+            self._file.write(
+                f"{address};{self._names.get(address, '')};{values[address]}\n"
+            )
+        self._file.flush()
+
+    def finish(self) -> None:
+        """Write the previous values after the last block."""
+        if self._previous:
+            self.write_block(self._previous[0][0], self._previous[0][0], {})
+
+
+def load_scan_csv(path: Path, column: str) -> dict[int, int]:
+    """Return the register values of a csv file of the scanner.
+
+    Files with several value columns like auswertung_register.csv are read
+    from column, other files from their first value column.
+    """
+    with path.open(encoding="utf-8", newline="") as file:
+        reader = csv.reader(file, delimiter=";")
+        header = next(reader, [])
+        index = header.index(column) if column in header else 2
+        values: dict[int, int] = {}
+        for row in reader:
+            try:
+                values[int(row[0])] = int(row[index])
+            except (IndexError, ValueError):
+                # empty value of a register the heat pump does not have
+                continue
+    return values
+
+
+class Checkpoint:
+    """State file of a scan to resume it after an interruption.
+
+    Contains the completed ranges in address order, their values and the
+    ranges without an answer. The file is replaced at most every
+    CHECKPOINT_INTERVAL seconds, so an interrupted scan loses only the last
+    blocks.
+    """
+
+    def __init__(self, path: Path, host: str) -> None:
+        """Initialize an empty checkpoint for host."""
+        self.path = path
+        self.host = host
+        self.done: list[tuple[int, int]] = []
+        self.values: dict[int, int] = {}
+        self.unanswered: list[tuple[int, int]] = []
+        self._saved = 0.0
+
+    def load(self) -> bool:
+        """Load the file, returns False if there is none."""
+        if not self.path.exists():
+            return False
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data["host"] != self.host:
+            raise SystemExit(f"{self.path} is a scan of {data['host']}")
+        self.done = [(first, last) for first, last in data["done"]]
+        self.values = {int(address): value for address, value in data["values"].items()}
+        self.unanswered = [(first, last) for first, last in data["unanswered"]]
+        return True
+
+    def forget(self, ranges: list[tuple[int, int]]) -> None:
+        """Remove ranges that are scanned again."""
+        self.done = subtract_ranges(self.done, ranges)
+        self.unanswered = subtract_ranges(self.unanswered, ranges)
+
+    def add_block(
+        self,
+        first: int,
+        last: int,
+        values: dict[int, int],
+        unanswered: list[tuple[int, int]],
+    ) -> None:
+        """Record a completed block and save the file now and then."""
+        self.done = merge_ranges([*self.done, (first, last)])
+        self.values.update(values)
+        self.unanswered.extend(
+            (start, end) for start, end in unanswered if first <= start <= last
+        )
+        if time.monotonic() - self._saved >= CHECKPOINT_INTERVAL:
+            self.save()
+
+    def save(self) -> None:
+        """Replace the file, a crash while writing keeps the old file."""
+        data = {
+            "host": self.host,
+            "done": self.done,
+            "values": self.values,
+            "unanswered": sorted(self.unanswered),
+        }
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_text(json.dumps(data), encoding="utf-8")
+        temp.replace(self.path)
+        self._saved = time.monotonic()
+
+
+async def _connect(args: argparse.Namespace) -> list[SlimModbusTcpClient]:
+    """Return the connected clients."""
+    clients = [
+        SlimModbusTcpClient(args.host, args.port, timeout=args.timeout)
+        for _index in range(args.connections)
+    ]
+    connected = await asyncio.gather(*(client.connect() for client in clients))
+    if not any(connected):
+        raise SystemExit(f"Could not connect to {args.host}:{args.port}")
+    # the heat pump may accept less connections than requested
+    return [client for client, ok in zip(clients, connected, strict=True) if ok]
+
+
+async def run_scan(args: argparse.Namespace, output: TextIO) -> ScanResult:
+    """Connect, scan and write the registers to output."""
+    clients = await _connect(args)
+    scanner = RegisterScanner(clients, block_size=args.block_size, retries=args.retries)
+
+    ranges = merge_ranges(args.range or DEFAULT_RANGES)
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint, args.host)
+        if checkpoint.load():
+            if args.retry_unanswered:
+                # the unanswered ranges that lie in the requested ranges
+                ranges = subtract_ranges(
+                    checkpoint.unanswered,
+                    subtract_ranges(checkpoint.unanswered, ranges),
+                )
+                checkpoint.forget(ranges)
+            else:
+                ranges = subtract_ranges(ranges, checkpoint.done)
+    writer = CsvRegisterWriter(
+        output, args.column, checkpoint.values if checkpoint else None
+    )
+
+    def block_done(first: int, last: int, values: dict[int, int]) -> None:
+        writer.write_block(first, last, values)
+        if checkpoint is not None:
+            checkpoint.add_block(first, last, values, scanner.result.unanswered)
+
+    try:
+        result = await scanner.scan(ranges, block_done)
+    finally:
+        for client in clients:
+            client.close()
+        if checkpoint is not None:
+            checkpoint.save()
+    writer.finish()
+    if checkpoint is None:
+        return result
+    # the result of the resumed scan covers all completed ranges
+    return ScanResult(
+        values=dict(sorted(checkpoint.values.items())),
+        ranges=checkpoint.done,
+        unanswered=sorted(checkpoint.unanswered),
+        requests=result.requests,
+    )
+
+
+async def run_monitor(args: argparse.Namespace, samples: ActivitySamples) -> None:
+    """Sample the registers every interval for the monitored hours."""
+    clients = await _connect(args)
+    scanner = RegisterScanner(clients, block_size=args.block_size, retries=0)
+    blocks = contiguous_blocks(map(int, samples.addresses), args.block_size)
+    start = time.monotonic()
+    try:
+        while (now := time.monotonic()) - start < args.monitor * 3600:
+            samples.add(now - start, await scanner.sample(blocks))
+            await asyncio.sleep(args.interval - (time.monotonic() - now))
+    finally:
+        for client in clients:
+            client.close()
+
+
+def merge_scans(paths: list[Path], column: str, output: TextIO) -> ScanResult:
+    """Write the values of several csv files as one csv, later files win."""
+    values: dict[int, int] = {}
+    for path in paths:
+        values.update(load_scan_csv(path, column))
+    writer = CsvRegisterWriter(output, column, values)
+    writer.finish()
+    return ScanResult(values=values)
+
+
+def main() -> None:
+    """Scan the registers from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int, default=502)
+    parser.add_argument(
+        "--range",
+        type=parse_range,
+        action="append",
+        help="first-last, can be repeated (default 30001-39999 and 40001-49999)",
+    )
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=CONNECTIONS,
+        help="parallel connections, each with one request in flight",
+    )
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    parser.add_argument("--timeout", type=float, default=3.0)
+    parser.add_argument(
+        "--column", default="Scan", help="name of the value column of the csv"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="csv file to write, default standard output"
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="compare the scan with the register map of hpconst",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="state file, an interrupted scan continues where it stopped",
+    )
+    parser.add_argument(
+        "--retry-unanswered",
+        action="store_true",
+        help="scan only the ranges without an answer of the checkpoint",
+    )
+    parser.add_argument(
+        "--monitor",
+        type=float,
+        metavar="HOURS",
+        help="sample the found registers for HOURS and suggest poll tiers",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=CONST.SCAN_INTERVAL.total_seconds(),
+        help="seconds between two samples of --monitor",
+    )
+    parser.add_argument(
+        "--registers",
+        type=Path,
+        help="csv of an earlier scan with the registers to monitor",
+    )
+    parser.add_argument("--samples", type=Path, help="npz file to save the samples")
+    parser.add_argument(
+        "--merge",
+        type=Path,
+        nargs="+",
+        help="write the registers of these csv files as one csv instead of scanning",
+    )
+    args = parser.parse_args()
+    if not args.host and not args.merge:
+        parser.error("--host is required for a scan")
+    if args.retry_unanswered and not args.checkpoint:
+        parser.error("--retry-unanswered needs --checkpoint")
+    logging.basicConfig(level=logging.WARNING)
+
+    def run(output: TextIO) -> ScanResult:
+        if args.merge:
+            return merge_scans(args.merge, args.column, output)
+        return asyncio.run(run_scan(args, output))
+
+    if args.monitor and args.registers:
+        addresses = list(load_scan_csv(args.registers, args.column))
+    else:
+        start = time.perf_counter()
+        if args.output:
+            with args.output.open("w", encoding="utf-8") as output:
+                result = run(output)
+        else:
+            result = run(sys.stdout)
+        print(  # noqa: T201
+            f"{len(result.values)} registers in {result.requests} requests, "
+            f"{time.perf_counter() - start:.1f} s",
+            file=sys.stderr,
+        )
+        for first, last in result.unanswered:
+            print(f"no answer: {first}-{last}", file=sys.stderr)  # noqa: T201
+        if args.diff:
+            print_diff(diff_register_map(result), sys.stderr)
+        addresses = list(result.values)
+
+    if args.monitor:
+        samples = ActivitySamples(addresses)
+        try:
+            asyncio.run(run_monitor(args, samples))
+        except KeyboardInterrupt:
+            print("Monitoring stopped", file=sys.stderr)  # noqa: T201
+        if args.samples:
+            samples.save(args.samples)
+        print_activity(analyze_activity(samples), sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
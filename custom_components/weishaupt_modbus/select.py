@@ -10,7 +10,6 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .configentry import MyConfigEntry
 from .const import TYPES
 from .entity_helpers import build_entity_list
-from .hpconst import DEVICELISTS
 
 
 async def async_setup_entry(
@@ -26,7 +25,7 @@ async def async_setup_entry(
     # we create one communicator per integration only for better performance and to allow dynamic parameters
     coordinator = config_entry.runtime_data.coordinator
 
-    for device in DEVICELISTS:
+    for device in config_entry.runtime_data.devicelists:
         entries = await build_entity_list(
             entries=entries,
             config_entry=config_entry,
@@ -39,3 +38,5 @@ async def async_setup_entry(
         entries,
         update_before_add=True,
     )
+    # used to add the entities of devices enabled later, see options.py
+    config_entry.runtime_data.add_entities["select"] = async_add_entities
@@ -5,18 +5,78 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .configentry import MyConfigEntry
 from .const import CONF, TYPES
 from .coordinator import MyWebIfCoordinator
-from .entities import MyWebifSensorEntity
+from .entities import (
+    MyDiagnosticSensorEntity,
+    MyDiagnosticSensorEntityDescription,
+    MyWebifSensorEntity,
+)
 from .entity_helpers import build_entity_list
-from .hpconst import DEVICELISTS, WEBIF_INFO_HEIZKREIS1
+from .hpconst import WEBIF_INFO_HEIZKREIS1
 
 _LOGGER = logging.getLogger(__name__)
 
+DIAGNOSTIC_SENSORS: tuple[MyDiagnosticSensorEntityDescription, ...] = (
+    MyDiagnosticSensorEntityDescription(
+        key="cycle_duration",
+        translation_key="cycle_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: (
+            None
+            if metrics.last_cycle_duration is None
+            else metrics.last_cycle_duration * 1000
+        ),
+    ),
+    MyDiagnosticSensorEntityDescription(
+        key="requests_per_cycle",
+        translation_key="requests_per_cycle",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.last_cycle_requests,
+    ),
+    MyDiagnosticSensorEntityDescription(
+        key="error_rate",
+        translation_key="error_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics.error_rate,
+    ),
+    MyDiagnosticSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.reconnects,
+    ),
+    MyDiagnosticSensorEntityDescription(
+        key="data_age_p95",
+        translation_key="data_age_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: metrics.data_age_percentile(0.95),
+    ),
+    MyDiagnosticSensorEntityDescription(
+        key="poll_interval",
+        translation_key="poll_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: metrics.poll_interval,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -31,7 +91,7 @@ async def async_setup_entry(
     # we create one communicator per integration only for better performance and to allow dynamic parameters
     coordinator = config_entry.runtime_data.coordinator
 
-    for device in DEVICELISTS:
+    for device in config_entry.runtime_data.devicelists:
         entries = await build_entity_list(
             entries=entries,
             config_entry=config_entry,
@@ -56,6 +116,11 @@ async def async_setup_entry(
             coordinator=coordinator,
         )
 
+    entries.extend(
+        MyDiagnosticSensorEntity(config_entry, coordinator, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
+
     webifentries = []
 
     if config_entry.data[CONF.CB_WEBIF]:
@@ -75,3 +140,5 @@ async def async_setup_entry(
         entries,
         update_before_add=True,
     )
+    # used to add the entities of devices enabled later, see options.py
+    config_entry.runtime_data.add_entities["sensor"] = async_add_entities
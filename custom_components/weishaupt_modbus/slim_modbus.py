@@ -0,0 +1,270 @@
+"""Lightweight asyncio Modbus TCP client.
+
+Implements the subset of the pymodbus client interface that is used by
+ModbusObject (read holding/input registers and write single register)
+directly on top of asyncio.Protocol. Frames are encoded and decoded with
+precompiled structs, there are no framer objects, no retry layer and no
+per request logging.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import cache
+import logging
+import struct
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+_LOGGER = logging.getLogger(__name__)
+
+FC_READ_HOLDING_REGISTERS = 0x03
+FC_READ_INPUT_REGISTERS = 0x04
+FC_WRITE_REGISTER = 0x06
+
+# MBAP header (transaction id, protocol id, length, unit id) and the PDU of
+# FC03/FC04/FC06 (function code, address, count or value) in one struct
+_REQUEST = struct.Struct(">HHHBBHH")
+_MBAP = struct.Struct(">HHH")
+# MBAP header plus function code
+_MIN_FRAME_SIZE = 8
+
+
+@cache
+def _registers_struct(count: int) -> struct.Struct:
+    """Return a precompiled struct for decoding count registers."""
+    return struct.Struct(f">{count}H")
+
+
+class SlimModbusResponse:
+    """Decoded Modbus response.
+
+    Provides the attributes of a pymodbus response that are evaluated by
+    ModbusObject.validate_modbus_answer.
+    """
+
+    __slots__ = ("exception_code", "function_code", "registers")
+
+    def __init__(
+        self,
+        function_code: int,
+        registers: tuple[int, ...] = (),
+        exception_code: int = 0,
+    ) -> None:
+        """Initialize the response."""
+        self.function_code: int = function_code
+        self.registers: tuple[int, ...] = registers
+        self.exception_code: int = exception_code
+
+    def isError(self) -> bool:
+        """Return True if the device answered with an exception."""
+        return bool(self.function_code & 0x80)
+
+    def __str__(self) -> str:
+        """Return a readable representation for log messages."""
+        if self.isError():
+            return (
+                f"ExceptionResponse(function_code={self.function_code}, "
+                f"exception_code={self.exception_code})"
+            )
+        return f"Response(function_code={self.function_code}, registers={list(self.registers)})"
+
+
+class _SlimModbusProtocol(asyncio.Protocol):
+    """Splits the received byte stream into frames and decodes them."""
+
+    def __init__(self, client: SlimModbusTcpClient) -> None:
+        """Initialize the protocol."""
+        self._client = client
+        self._buffer = bytearray()
+        self.transport: asyncio.Transport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self.transport = transport  # type: ignore[assignment]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Inform the client about the lost connection."""
+        self.transport = None
+        self._client.connection_lost(self, exc)
+
+    def data_received(self, data: bytes) -> None:
+        """Decode all complete frames in the receive buffer."""
+        buffer = self._buffer
+        buffer += data
+        while len(buffer) >= _MIN_FRAME_SIZE:
+            transaction_id, _protocol_id, length = _MBAP.unpack_from(buffer, 0)
+            frame_size = 6 + length
+            if length < 2:
+                _LOGGER.warning("Received invalid Modbus frame, closing connection")
+                buffer.clear()
+                if self.transport is not None:
+                    self.transport.close()
+                return
+            if len(buffer) < frame_size:
+                return
+            response = _decode_pdu(buffer, length)
+            del buffer[:frame_size]
+            if response is None:
+                # the MBAP header still delimits the frame, only this one is lost
+                self._client.response_failed(
+                    transaction_id,
+                    ModbusIOException(f"Malformed response of length {length}"),
+                )
+            else:
+                self._client.response_received(transaction_id, response)
+
+
+def _decode_pdu(buffer: bytearray, length: int) -> SlimModbusResponse | None:
+    """Decode the PDU of the frame at the start of buffer, None if malformed.
+
+    length is the MBAP length, it counts the unit id and the PDU.
+    """
+    function_code = buffer[7]
+    if function_code & 0x80:
+        if length != 3:
+            return None
+        return SlimModbusResponse(function_code, (), buffer[8])
+    if function_code == FC_WRITE_REGISTER:
+        if length != 6:
+            return None
+        # echo of address and value, only the value is returned
+        return SlimModbusResponse(
+            function_code, _registers_struct(2).unpack_from(buffer, 8)[1:]
+        )
+    byte_count = buffer[8] if length > 2 else -1
+    if byte_count != length - 3 or byte_count % 2:
+        return None
+    return SlimModbusResponse(
+        function_code, _registers_struct(byte_count // 2).unpack_from(buffer, 9)
+    )
+
+
+class SlimModbusTcpClient:
+    """Minimal Modbus TCP client with the interface of AsyncModbusTcpClient."""
+
+    def __init__(self, host: str, port: int, timeout: float = 3.0) -> None:
+        """Initialize the client.
+
+        Args:
+            host: IP address or hostname of the heat pump
+            port: Modbus TCP port
+            timeout: timeout for connect and for each request in seconds
+
+        """
+        self._host: str = host
+        self._port: int = port
+        self._timeout: float = timeout
+        self._protocol: _SlimModbusProtocol | None = None
+        self._pending: dict[int, asyncio.Future[SlimModbusResponse]] = {}
+        self._transaction_id: int = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection is established."""
+        return (
+            self._protocol is not None
+            and self._protocol.transport is not None
+            and not self._protocol.transport.is_closing()
+        )
+
+    @property
+    def transport(self) -> asyncio.Transport | None:
+        """Return the transport of the connection, None if not connected."""
+        return None if self._protocol is None else self._protocol.transport
+
+    async def connect(self) -> bool:
+        """Open the connection, returns the connection state."""
+        if self.connected:
+            return True
+        loop = asyncio.get_running_loop()
+        try:
+            async with asyncio.timeout(self._timeout):
+                _transport, self._protocol = await loop.create_connection(
+                    lambda: _SlimModbusProtocol(self), self._host, self._port
+                )
+        except (OSError, TimeoutError) as exc:
+            _LOGGER.debug("Connecting to %s:%s failed: %s", self._host, self._port, exc)
+            self._protocol = None
+        return self.connected
+
+    def close(self) -> None:
+        """Close the connection and cancel all pending requests."""
+        protocol = self._protocol
+        self._protocol = None
+        if protocol is not None and protocol.transport is not None:
+            protocol.transport.close()
+        self._fail_pending("Connection closed")
+
+    def connection_lost(
+        self, protocol: _SlimModbusProtocol, exc: Exception | None
+    ) -> None:
+        """Handle a connection that was closed by the peer or by close()."""
+        if protocol is self._protocol:
+            self._protocol = None
+            self._fail_pending(f"Connection lost: {exc}")
+
+    def response_received(
+        self, transaction_id: int, response: SlimModbusResponse
+    ) -> None:
+        """Resolve the request waiting for this transaction id."""
+        future = self._pending.pop(transaction_id, None)
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    def response_failed(self, transaction_id: int, exc: Exception) -> None:
+        """Fail the request waiting for this transaction id."""
+        future = self._pending.pop(transaction_id, None)
+        if future is not None and not future.done():
+            future.set_exception(exc)
+
+    def _fail_pending(self, reason: str) -> None:
+        """Fail all requests that are waiting for a response."""
+        pending = self._pending
+        self._pending = {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionException(reason))
+
+    async def _execute(
+        self, slave: int, function_code: int, address: int, value: int
+    ) -> SlimModbusResponse:
+        """Send one request and wait for the matching response."""
+        protocol = self._protocol
+        if protocol is None or protocol.transport is None:
+            raise ConnectionException("Not connected")
+        self._transaction_id = transaction_id = (self._transaction_id + 1) & 0xFFFF
+        future: asyncio.Future[SlimModbusResponse] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[transaction_id] = future
+        protocol.transport.write(
+            _REQUEST.pack(transaction_id, 0, 6, slave, function_code, address, value)
+        )
+        try:
+            async with asyncio.timeout(self._timeout):
+                return await future
+        except TimeoutError as exc:
+            raise ModbusIOException(
+                f"No response for address {address}", function_code
+            ) from exc
+        finally:
+            self._pending.pop(transaction_id, None)
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Read holding registers (FC03)."""
+        return await self._execute(slave, FC_READ_HOLDING_REGISTERS, address, count)
+
+    async def read_input_registers(
+        self, address: int, *, count: int = 1, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Read input registers (FC04)."""
+        return await self._execute(slave, FC_READ_INPUT_REGISTERS, address, count)
+
+    async def write_register(
+        self, address: int, value: int, *, slave: int = 1
+    ) -> SlimModbusResponse:
+        """Write a single holding register (FC06)."""
+        return await self._execute(slave, FC_WRITE_REGISTER, address, value)
@@ -1,6 +1,7 @@
 """Integration for Weishaupt WebIF connection."""
 
 import logging
+import time
 from typing import Any
 
 import aiohttp
@@ -9,6 +10,7 @@ from bs4.element import Tag
 
 from .configentry import MyConfigEntry
 from .const import CONF
+from .metrics import LatencyHistogram
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +30,11 @@ class WebifConnection:
         self._login_url: str = "/login.html"
         self._connected: bool = False
         self._values: dict[str, Any] = {}
+        # durations of the page download and of the html parsing in seconds
+        self.fetch_times: LatencyHistogram = LatencyHistogram()
+        self.parse_times: LatencyHistogram = LatencyHistogram()
+        self.last_fetch_time: float | None = None
+        self.last_parse_time: float | None = None
 
     async def login(self) -> None:
         """Log into the portal. Create cookie to stay logged in for the session."""
@@ -68,6 +75,7 @@ class WebifConnection:
         """Return Info -> Heizkreis1."""
         if not self._connected or not self._session:
             return None
+        start = time.perf_counter()
         try:
             async with self._session.get(
                 # token = F9AF
@@ -81,26 +89,32 @@ class WebifConnection:
                 if response.status != 200:
                     _LOGGER.debug("Error: %s", response.status)
                     return None
-
-                main_page = BeautifulSoup(
-                    markup=await response.text(), features="html.parser"
-                )
-                navs = main_page.find_all("div", class_="col-3")
-
-                if len(navs) == 3:
-                    values_nav = navs[2]
-                    if isinstance(values_nav, Tag):
-                        self._values["Info"] = {
-                            "Heizkreis": self.get_values(soup=values_nav)
-                        }
-                        _LOGGER.debug("Values: %s", self._values)
-                        return self._values["Info"]["Heizkreis"]
-
-                _LOGGER.debug("Update failed. return None")
-                return None
+                markup = await response.text()
         except TimeoutError:
             _LOGGER.debug("Timeout while getting info")
             return None
+        parse_start = time.perf_counter()
+        self.last_fetch_time = parse_start - start
+        self.fetch_times.observe(self.last_fetch_time)
+        values = self.parse_info(markup)
+        self.last_parse_time = time.perf_counter() - parse_start
+        self.parse_times.observe(self.last_parse_time)
+        return values
+
+    def parse_info(self, markup: str) -> dict[str, Any] | None:
+        """Return the values of the Heizkreis page."""
+        main_page = BeautifulSoup(markup=markup, features="html.parser")
+        navs = main_page.find_all("div", class_="col-3")
+
+        if len(navs) == 3:
+            values_nav = navs[2]
+            if isinstance(values_nav, Tag):
+                self._values["Info"] = {"Heizkreis": self.get_values(soup=values_nav)}
+                _LOGGER.debug("Values: %s", self._values)
+                return self._values["Info"]["Heizkreis"]
+
+        _LOGGER.debug("Update failed. return None")
+        return None
 
     async def get_info_wp(self) -> dict[str, Any] | None:
         """Return Info -> Wärmepumpe."""
@@ -0,0 +1 @@
+"""Tests for the Weishaupt modbus integration."""
@@ -0,0 +1 @@
+"""Benchmark tests for the Weishaupt modbus integration."""
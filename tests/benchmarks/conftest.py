@@ -0,0 +1,52 @@
+"""Fixtures for the benchmark tests."""
+
+from collections.abc import Iterator
+import json
+from pathlib import Path
+import platform
+from typing import Any
+
+import pytest
+
+from benchmarks.harness import start_simulator
+
+# port of the simulator of the benchmark tests
+SIMULATOR_PORT = 15031
+
+BASELINE = Path(__file__).parent / "baseline_hot_paths.json"
+
+
+@pytest.fixture(autouse=True)
+def enable_event_loop_debug() -> None:
+    """Keep the debug mode of the event loop off, it distorts the timings."""
+
+
+@pytest.fixture(scope="module")
+def simulator() -> Iterator[tuple[int, Any]]:
+    """Run the simulator in a process, return its port and request counter."""
+    server, counter = start_simulator(SIMULATOR_PORT)
+    yield SIMULATOR_PORT, counter
+    server.terminate()
+    server.join()
+
+
+@pytest.fixture(scope="session")
+def hot_path_baseline() -> dict[str, dict[str, float]]:
+    """Return the baseline results of the hot path benchmarks."""
+    return json.loads(BASELINE.read_text(encoding="utf-8"))["results"]
+
+
+@pytest.fixture(scope="session")
+def hot_path_results(
+    request: pytest.FixtureRequest,
+) -> Iterator[dict[str, dict[str, float]]]:
+    """Collect the hot path results, write them as baseline with --save-baseline."""
+    results: dict[str, dict[str, float]] = {}
+    yield results
+    if results and request.config.getoption("--save-baseline"):
+        baseline = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        BASELINE.write_text(json.dumps(baseline, indent=4) + "\n", encoding="utf-8")
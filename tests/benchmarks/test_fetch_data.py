@@ -0,0 +1,124 @@
+"""Benchmarks of MyCoordinator.fetch_data against the simulator.
+
+The timings are the wall time of a poll cycle. The requests, the CPU time
+and the allocations of a cycle are added to the extra info of the results.
+test_replay serves a recording of the simulator, or with --replay a capture
+file of a real heat pump. It measures decoding and value processing without
+the network.
+
+Run from the repository root:
+
+    pytest tests/benchmarks/test_fetch_data.py
+    pytest tests/benchmarks/test_fetch_data.py -k replay --replay <capture file>
+"""
+
+import asyncio
+from pathlib import Path
+import time
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.harness import (
+    create_config_entry,
+    create_coordinator,
+    measure_allocations,
+)
+from custom_components.weishaupt_modbus.capture import CaptureWriter
+from custom_components.weishaupt_modbus.const import CONF
+from custom_components.weishaupt_modbus.coordinator import MyCoordinator
+from homeassistant.core import HomeAssistant
+
+ROUNDS = 20
+ALLOC_CYCLES = 3
+
+
+def benchmark_cycles(
+    benchmark: BenchmarkFixture,
+    event_loop: asyncio.AbstractEventLoop,
+    coordinator: MyCoordinator,
+    counter: Any = None,
+) -> dict[str, Any]:
+    """Time the poll cycles, add requests, CPU time and allocations."""
+    values = event_loop.run_until_complete(coordinator.fetch_data())
+    start_requests = counter.value if counter is not None else 0
+    cpu_start = time.process_time()
+    benchmark.pedantic(
+        lambda: event_loop.run_until_complete(coordinator.fetch_data()),
+        rounds=ROUNDS,
+        iterations=1,
+    )
+    benchmark.extra_info["cpu_ms_per_cycle"] = (
+        (time.process_time() - cpu_start) / ROUNDS * 1000
+    )
+    if counter is not None:
+        benchmark.extra_info["requests_per_cycle"] = (
+            counter.value - start_requests
+        ) / ROUNDS
+    benchmark.extra_info.update(
+        event_loop.run_until_complete(measure_allocations(coordinator, ALLOC_CYCLES))
+    )
+    return values
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize("fast_transport", [False, True], ids=["pymodbus", "slim"])
+def test_fetch_data(
+    benchmark: BenchmarkFixture,
+    event_loop: asyncio.AbstractEventLoop,
+    hass: HomeAssistant,
+    simulator: tuple[int, Any],
+    fast_transport: bool,
+) -> None:
+    """Benchmark a poll cycle of the items of the built-in register map."""
+    port, counter = simulator
+    entry = create_config_entry(port, **{CONF.FAST_TRANSPORT: fast_transport})
+    coordinator = event_loop.run_until_complete(create_coordinator(hass, entry))
+    try:
+        values = benchmark_cycles(benchmark, event_loop, coordinator, counter)
+    finally:
+        coordinator.modbus_api.close()
+    assert len(values) > 100
+    assert benchmark.extra_info["requests_per_cycle"] > 0
+
+
+@pytest.fixture
+def capture_file(
+    request: pytest.FixtureRequest,
+    event_loop: asyncio.AbstractEventLoop,
+    hass: HomeAssistant,
+    socket_enabled: None,
+    tmp_path: Path,
+) -> Path:
+    """Return the --replay file or a recording of a poll cycle of the simulator."""
+    filepath: Path | None = request.config.getoption("--replay")
+    if filepath is not None:
+        return filepath
+    port, _counter = request.getfixturevalue("simulator")
+    filepath = tmp_path / "simulator.modbus_capture"
+    entry = create_config_entry(port)
+    coordinator = event_loop.run_until_complete(create_coordinator(hass, entry))
+    writer = CaptureWriter(filepath)
+    coordinator.modbus_api.start_capture(writer)
+    event_loop.run_until_complete(coordinator.fetch_data())
+    coordinator.modbus_api.close()
+    coordinator.modbus_api.stop_capture()
+    writer.join()
+    return filepath
+
+
+def test_replay(
+    benchmark: BenchmarkFixture,
+    event_loop: asyncio.AbstractEventLoop,
+    hass: HomeAssistant,
+    capture_file: Path,
+) -> None:
+    """Benchmark a poll cycle served from a capture file."""
+    entry = create_config_entry(0, **{CONF.REPLAY_FILE: str(capture_file)})
+    coordinator = event_loop.run_until_complete(create_coordinator(hass, entry))
+    try:
+        values = benchmark_cycles(benchmark, event_loop, coordinator)
+    finally:
+        coordinator.modbus_api.close()
+    assert sum(value is not None for value in values.values()) > 100
@@ -0,0 +1,196 @@
+"""Benchmarks of the functions that run per value and poll cycle.
+
+The integration is set up with all entities against the synthetic heat pump
+of the soak test, one poll cycle fills the register values. Each case calls
+its function with the realistic inputs of all matching items of hpconst (or
+the power map grid and the bundled INFO_WP page). The time per call in
+nanoseconds and its change against baseline_hot_paths.json are added to the
+extra info of the results:
+
+    pytest tests/benchmarks/test_hot_paths.py --compare-baseline
+    pytest tests/benchmarks/test_hot_paths.py --save-baseline
+
+--compare-baseline fails a case that is more than 30 % slower than the
+baseline, --save-baseline writes the results as new baseline. Baselines are
+only comparable on the same machine and Python version, the stored baseline
+was measured on the development machine. The functions take less than a
+microsecond, so results vary by 10-20 % between runs; repeat a run before
+trusting a single regression.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from bs4 import BeautifulSoup
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.harness import create_config_entry
+from benchmarks.soak import SyntheticModbusClient, VirtualClock, setup_integration
+from custom_components.weishaupt_modbus.configentry import MyConfigEntry
+from custom_components.weishaupt_modbus.const import FORMATS, TYPES
+from custom_components.weishaupt_modbus.entities import (
+    MyCalcSensorEntity,
+    MyEntity,
+    MyNumberEntity,
+)
+from custom_components.weishaupt_modbus.hpconst import DEVICELISTS
+from custom_components.weishaupt_modbus.modbusobject import ModbusObject
+from custom_components.weishaupt_modbus.slim_modbus import (
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    SlimModbusResponse,
+)
+from custom_components.weishaupt_modbus.webif_object import INFO_WP, WebifConnection
+from homeassistant.core import HomeAssistant
+
+# slowdown against the baseline that fails --compare-baseline
+THRESHOLD = 0.3
+
+type Case = tuple[Callable[..., Any], list[tuple[Any, ...]]]
+
+CASES = (
+    "validate_modbus_answer",
+    "check_valid_result",
+    "get_translation_key_from_number",
+    "MyEntity.translate_val",
+    "MyEntity.set_min_max",
+    "MyCalcSensorEntity.translate_val",
+    "PowerMap.map",
+    "WebifConnection.get_values",
+)
+
+
+def build_cases(
+    client: SyntheticModbusClient, entry: MyConfigEntry, entities: list[Any]
+) -> dict[str, Case]:
+    """Return the benchmark cases with their inputs."""
+    api = entry.runtime_data.modbus_api
+    items = [item for device in DEVICELISTS for item in device]
+    responses = []
+    for item in items:
+        if item.address not in client.registers:
+            continue
+        function_code = (
+            FC_READ_INPUT_REGISTERS
+            if item.type in (TYPES.SENSOR, TYPES.SENSOR_CALC)
+            else FC_READ_HOLDING_REGISTERS
+        )
+        response = SlimModbusResponse(function_code, (client.value(item.address),))
+        responses.append((ModbusObject(api, item), response))
+    status_items = [
+        (item, client.value(item.address))
+        for item in items
+        if item.format == FORMATS.STATUS
+        and item.resultlist
+        and item.address in client.registers
+    ]
+    calc_entities = [
+        entity for entity in entities if isinstance(entity, MyCalcSensorEntity)
+    ]
+    value_entities = [
+        entity
+        for entity in entities
+        if getattr(type(entity), "translate_val", None) is MyEntity.translate_val
+        and api.states.get_state(entity._api_item) is not None
+    ]
+    number_entities = [
+        entity for entity in entities if isinstance(entity, MyNumberEntity)
+    ]
+    soup = BeautifulSoup(markup=INFO_WP, features="html.parser")
+    values_nav = soup.find_all("div", class_="col-3")[2]
+    webif = WebifConnection(entry)
+    powermap = entry.runtime_data.powermap
+
+    return {
+        "validate_modbus_answer": (
+            lambda mbo, response: mbo.validate_modbus_answer(response),
+            responses,
+        ),
+        "check_valid_result": (
+            lambda mbo, response: mbo.check_valid_result(response.registers[0]),
+            responses,
+        ),
+        "get_translation_key_from_number": (
+            lambda item, value: item.get_translation_key_from_number(value),
+            status_items,
+        ),
+        "MyEntity.translate_val": (
+            lambda entity, value: entity.translate_val(value),
+            [
+                (entity, api.states.get_state(entity._api_item))
+                for entity in value_entities
+            ],
+        ),
+        "MyEntity.set_min_max": (
+            lambda entity: entity.set_min_max(True),
+            [(entity,) for entity in number_entities],
+        ),
+        "MyCalcSensorEntity.translate_val": (
+            lambda entity, value: entity.translate_val(value),
+            [
+                (entity, api.states.get_state(entity._api_item))
+                for entity in calc_entities
+            ],
+        ),
+        "PowerMap.map": (
+            powermap.map,
+            [(x, y) for x in range(-250, 400, 25) for y in range(250, 560, 25)],
+        ),
+        "WebifConnection.get_values": (webif.get_values, [(values_nav,)]),
+    }
+
+
+@pytest.fixture
+def cases(
+    event_loop: asyncio.AbstractEventLoop, hass: HomeAssistant
+) -> dict[str, Case]:
+    """Set up the integration, return the cases with their inputs."""
+    clock = VirtualClock()
+    client = SyntheticModbusClient(clock)
+    entities: list[Any] = []
+    entry = create_config_entry(0)
+    coordinator = event_loop.run_until_complete(
+        setup_integration(hass, entry, client, entities)
+    )
+    clock.advance(3600)
+    event_loop.run_until_complete(coordinator.async_refresh())
+    event_loop.run_until_complete(hass.async_block_till_done())
+    coordinator.modbus_api.close()
+    return build_cases(client, entry, entities)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_hot_path(
+    benchmark: BenchmarkFixture,
+    cases: dict[str, Case],
+    hot_path_results: dict[str, dict[str, float]],
+    request: pytest.FixtureRequest,
+    name: str,
+) -> None:
+    """Benchmark one function with all its inputs."""
+    func, inputs = cases[name]
+    assert inputs
+
+    def run() -> None:
+        for args in inputs:
+            func(*args)
+
+    benchmark(run)
+    if benchmark.disabled:
+        return
+    ns_per_call = benchmark.stats.stats.min / len(inputs) * 1e9
+    benchmark.extra_info["ns_per_call"] = ns_per_call
+    benchmark.extra_info["inputs"] = len(inputs)
+    hot_path_results[name] = {"ns_per_call": ns_per_call, "inputs": len(inputs)}
+
+    base = request.getfixturevalue("hot_path_baseline").get(name)
+    if base is None:
+        return
+    change = ns_per_call / base["ns_per_call"] - 1
+    benchmark.extra_info["change_to_baseline"] = change
+    if request.config.getoption("--compare-baseline"):
+        assert change <= THRESHOLD, (
+            f"{name} takes {ns_per_call:.0f} ns, {change:+.1%} against the baseline"
+        )
@@ -0,0 +1,25 @@
+"""Fixtures for the tests of the Weishaupt modbus integration."""
+
+from pathlib import Path
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options of the benchmark tests."""
+    parser.addoption(
+        "--replay",
+        type=Path,
+        help="capture file served to the replay benchmark instead of a recording "
+        "of the simulator",
+    )
+    parser.addoption(
+        "--compare-baseline",
+        action="store_true",
+        help="fail hot path benchmarks that are slower than the baseline",
+    )
+    parser.addoption(
+        "--save-baseline",
+        action="store_true",
+        help="write the results of the hot path benchmarks as baseline",
+    )
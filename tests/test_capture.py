@@ -0,0 +1,93 @@
+"""Tests for the capture file of the modbus traffic."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from custom_components.weishaupt_modbus.capture import (
+    CAPTURE_MAGIC,
+    FLUSH_SECONDS,
+    NO_RESPONSE,
+    CaptureRecord,
+    CaptureWriter,
+    read_capture,
+)
+
+# time of the first request in ns since the epoch
+START_NS = 1_760_000_000_000_000_000
+
+
+@pytest.fixture
+def writer(tmp_path: Path) -> Iterator[CaptureWriter]:
+    """Return a writer of a new capture file, closed after the test."""
+    writer = CaptureWriter(tmp_path / "test.modbus_capture")
+    yield writer
+    writer.close()
+    writer.join()
+
+
+def test_round_trip(writer: CaptureWriter) -> None:
+    """The records are read back as written."""
+    writer.write(4, 30001, 1, 0, (215,), timestamp_ns=START_NS)
+    writer.write(4, 30002, 1, NO_RESPONSE, timestamp_ns=START_NS + 1)
+    writer.write(6, 41108, 450, 0, (450,), timestamp_ns=START_NS + 2)
+    writer.close()
+    writer.join()
+    assert list(read_capture(writer.filepath)) == [
+        CaptureRecord(START_NS, 4, 0, 30001, 1, (215,)),
+        CaptureRecord(START_NS + 1, 4, NO_RESPONSE, 30002, 1, ()),
+        CaptureRecord(START_NS + 2, 6, 0, 41108, 450, (450,)),
+    ]
+
+
+def test_flush_after_interval(writer: CaptureWriter) -> None:
+    """Records are buffered for at most FLUSH_SECONDS."""
+    writer.write(4, 30001, 1, 0, (215,), timestamp_ns=START_NS)
+    writer.write(
+        4, 30001, 1, 0, (215,), timestamp_ns=START_NS + (FLUSH_SECONDS - 1) * 10**9
+    )
+    assert writer._buffer
+    writer.write(4, 30001, 1, 0, (216,), timestamp_ns=START_NS + FLUSH_SECONDS * 10**9)
+    assert not writer._buffer
+
+
+def test_writer_thread_is_daemon(writer: CaptureWriter) -> None:
+    """The writer thread does not keep the interpreter alive."""
+    assert writer._thread.daemon
+
+
+def test_rotation(tmp_path: Path) -> None:
+    """A full file is renamed to "<file>.1" and a new one is started."""
+    filepath = tmp_path / "test.modbus_capture"
+    writer = CaptureWriter(filepath, buffer_size=100, max_bytes=1000)
+    for index in range(100):
+        writer.write(4, 30001, 1, 0, (index,), timestamp_ns=START_NS + index)
+    writer.close()
+    writer.join()
+    rotated = filepath.with_name(f"{filepath.name}.1")
+    assert writer.rotations > 0
+    assert filepath.stat().st_size <= 1000
+    assert rotated.stat().st_size <= 1000
+    registers = [record.registers[0] for record in read_capture(filepath)]
+    assert registers[-1] == 99
+    assert registers == list(range(100 - len(registers), 100))
+
+
+def test_incomplete_record(writer: CaptureWriter) -> None:
+    """A record cut off at the end of the file is ignored."""
+    writer.write(4, 30001, 1, 0, (215,), timestamp_ns=START_NS)
+    writer.write(4, 30002, 2, 0, (1, 2), timestamp_ns=START_NS)
+    writer.close()
+    writer.join()
+    data = writer.filepath.read_bytes()
+    writer.filepath.write_bytes(data[:-1])
+    assert [record.address for record in read_capture(writer.filepath)] == [30001]
+
+
+def test_no_capture_file(tmp_path: Path) -> None:
+    """Reading another file raises a ValueError."""
+    filepath = tmp_path / "other"
+    filepath.write_bytes(CAPTURE_MAGIC[:-1] + b"\0")
+    with pytest.raises(ValueError, match="not a modbus capture file"):
+        list(read_capture(filepath))
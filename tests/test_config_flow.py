@@ -0,0 +1,103 @@
+"""Tests for the validation of the config flow."""
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.weishaupt_modbus.config_flow import (
+    PollIntervalRange,
+    validate_poll_interval,
+)
+from custom_components.weishaupt_modbus.const import CONF, CONST
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+DETECTED = {CONF.HK2: False, CONF.HK3: False, CONF.HK4: False, CONF.HK5: False}
+
+
+@pytest.fixture(autouse=True)
+def detection(enable_custom_integrations: None) -> Any:
+    """Answer the device detection without a heat pump."""
+    with patch(
+        "custom_components.weishaupt_modbus.config_flow.async_detect_devices",
+        return_value={**DETECTED, CONF.W2: True},
+    ) as detect:
+        yield detect
+
+
+@pytest.mark.parametrize(
+    ("data", "valid"),
+    [
+        ({}, True),
+        ({CONF.POLL_INTERVAL_MIN: 30, CONF.POLL_INTERVAL_MAX: 30}, True),
+        ({CONF.POLL_INTERVAL_MIN: 60, CONF.POLL_INTERVAL_MAX: 30}, False),
+        ({CONF.POLL_INTERVAL_MIN: 600}, False),
+        ({CONF.POLL_INTERVAL_MAX: 10}, False),
+    ],
+)
+def test_validate_poll_interval(data: dict[str, Any], valid: bool) -> None:
+    """The longest poll interval must not be below the shortest."""
+    if valid:
+        validate_poll_interval(data)
+    else:
+        with pytest.raises(PollIntervalRange):
+            validate_poll_interval(data)
+
+
+async def test_user_step_poll_interval(hass: HomeAssistant) -> None:
+    """The first form is shown again if the bounds are swapped."""
+    result = await hass.config_entries.flow.async_init(
+        CONST.DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    user_input = {
+        CONF.HOST: "10.10.1.225",
+        CONF.POLL_INTERVAL_MIN: 120,
+        CONF.POLL_INTERVAL_MAX: 60,
+    }
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {CONF.POLL_INTERVAL_MAX: "poll_interval_range"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**user_input, CONF.POLL_INTERVAL_MAX: 120}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "devices"
+
+
+async def test_reconfigure_poll_interval(hass: HomeAssistant) -> None:
+    """A reconfiguration with swapped bounds is not stored."""
+    entry = MockConfigEntry(
+        domain=CONST.DOMAIN,
+        version=5,
+        data={
+            CONF.HOST: "10.10.1.225",
+            CONF.PORT: 502,
+            CONF.PREFIX: CONST.DEF_PREFIX,
+            CONF.DEVICE_POSTFIX: "",
+            CONF.KENNFELD_FILE: CONST.DEF_KENNFELDFILE,
+            CONF.NAME_DEVICE_PREFIX: False,
+            CONF.NAME_TOPIC_PREFIX: False,
+            CONF.CB_WEBIF: False,
+            CONF.USERNAME: "",
+            CONF.PASSWORD: "",
+            CONF.WEBIF_TOKEN: "",
+        },
+    )
+    entry.add_to_hass(hass)
+    result = await entry.start_reconfigure_flow(hass)
+    assert result["step_id"] == "reconfigure"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF.POLL_INTERVAL_MIN: 300, CONF.POLL_INTERVAL_MAX: 30},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF.POLL_INTERVAL_MAX: "poll_interval_range"}
+    assert CONF.POLL_INTERVAL_MIN not in entry.data
@@ -0,0 +1,84 @@
+"""Tests for the handling of a connection that stops answering."""
+
+import asyncio
+from collections.abc import AsyncIterator
+import time
+from typing import Any
+
+from pymodbus.client import AsyncModbusTcpClient
+import pytest
+
+from benchmarks.harness import create_config_entry, create_coordinator
+from benchmarks.simulator import HeatPumpSimulator
+from custom_components.weishaupt_modbus.const import CONF
+from custom_components.weishaupt_modbus.coordinator import CYCLE_TIMEOUT
+from custom_components.weishaupt_modbus.modbusobject import _transport_of
+from homeassistant.core import HomeAssistant
+
+SIMULATOR_PORT = 15049
+
+
+@pytest.fixture
+async def simulator(socket_enabled: None) -> AsyncIterator[HeatPumpSimulator]:
+    """Run the simulator in the event loop of the test."""
+    async with HeatPumpSimulator(port=SIMULATOR_PORT) as simulator:
+        yield simulator
+
+
+def freeze(simulator: HeatPumpSimulator, after: int) -> tuple[asyncio.Event, list[int]]:
+    """Stop answering after a number of requests, new connections still work.
+
+    Returns the event that answers the waiting requests and the addresses
+    of the requests without answer.
+    """
+    context = simulator.context
+    answer = context.async_getValues
+    requests = 0
+    thawed = asyncio.Event()
+    unanswered: list[int] = []
+
+    async def get_values(function_code: int, address: int, count: int = 1) -> Any:
+        nonlocal requests
+        requests += 1
+        if requests > after and not thawed.is_set():
+            unanswered.append(address)
+            await thawed.wait()
+        return await answer(function_code, address, count)
+
+    context.async_getValues = get_values  # type: ignore[method-assign]
+    return thawed, unanswered
+
+
+@pytest.mark.parametrize("fast_transport", [False, True], ids=["pymodbus", "slim"])
+async def test_dead_link(
+    hass: HomeAssistant, simulator: HeatPumpSimulator, fast_transport: bool
+) -> None:
+    """A connection without answer aborts the cycle before the cycle timeout."""
+    entry = create_config_entry(SIMULATOR_PORT, **{CONF.FAST_TRANSPORT: fast_transport})
+    coordinator = await create_coordinator(hass, entry)
+    api = coordinator.modbus_api
+    assert _transport_of(api._modbus_client) is not None
+    thawed, unanswered = freeze(simulator, after=5)
+
+    start = time.perf_counter()
+    data = await coordinator._async_update_data()
+    duration = time.perf_counter() - start
+
+    # the cycle was aborted by the dead link check, not by the cycle timeout
+    assert 0 < len(data) < len(coordinator.modbus_items)
+    assert duration < CYCLE_TIMEOUT - 2
+    # the request, the heartbeat and the heartbeat after the reconnect
+    assert len(unanswered) == 3
+    # the register without answer is not blamed for the connection
+    for item in coordinator.modbus_items:
+        if item.address == unanswered[0]:
+            assert api.health.get(item).score == 0
+    thawed.set()
+    api.close()
+    await hass.async_block_till_done()
+
+
+async def test_transport_without_connection(caplog: pytest.LogCaptureFixture) -> None:
+    """A pymodbus client without transport is reported, keepalive is skipped."""
+    assert _transport_of(AsyncModbusTcpClient("127.0.0.1")) is None
+    assert "No transport found in AsyncModbusTcpClient" in caplog.text
@@ -0,0 +1,143 @@
+"""Tests for the adaptive poll interval."""
+
+import pytest
+
+from custom_components.weishaupt_modbus.governor import (
+    BASELINE_WEIGHT,
+    LATENCY_FACTOR,
+    LATENCY_FLOOR,
+    PAUSE_MAX,
+    PAUSE_SHARE,
+    PAUSE_START,
+    PAUSE_STEP,
+    SIGNAL_ERRORS,
+    SIGNAL_HEALTHY,
+    SIGNAL_IDLE,
+    SIGNAL_LATENCY,
+    PollGovernor,
+)
+
+
+@pytest.fixture
+def governor() -> PollGovernor:
+    """Return a governor between 30 s and 300 s with a baseline of 20 ms."""
+    governor = PollGovernor(30, 300)
+    governor.update(requests=100, errors=0, latency=0.02)
+    return governor
+
+
+def test_start() -> None:
+    """A new governor polls at the shortest interval without pause."""
+    governor = PollGovernor(30, 300)
+    assert (governor.interval, governor.pause, governor.baseline) == (30, 0.0, None)
+    assert governor.signal == SIGNAL_IDLE
+
+
+def test_bounds() -> None:
+    """The longest interval is never below the shortest."""
+    governor = PollGovernor(60, 30)
+    assert (governor.min_interval, governor.max_interval) == (60, 60)
+    governor.set_bounds(10, 20)
+    assert (governor.interval, governor.max_interval) == (20, 20)
+    governor.set_bounds(40, 300)
+    assert governor.interval == 40
+
+
+@pytest.mark.parametrize(
+    ("errors", "signal"), [(10, SIGNAL_HEALTHY), (11, SIGNAL_ERRORS)]
+)
+def test_error_limit(governor: PollGovernor, errors: int, signal: str) -> None:
+    """More than a tenth of overloaded requests is a backoff."""
+    governor.update(requests=100, errors=errors, latency=0.02)
+    assert governor.signal == signal
+
+
+def test_backoff_and_recovery(governor: PollGovernor) -> None:
+    """The interval doubles up to the longest and shrinks by the shortest."""
+    intervals = []
+    pauses = []
+    for _ in range(5):
+        governor.update(requests=100, errors=50, latency=0.02)
+        intervals.append(governor.interval)
+        pauses.append(governor.pause)
+    assert intervals == [60, 120, 240, 300, 300]
+    assert pauses == [PAUSE_START, 0.01, 0.02, 0.04, PAUSE_MAX]
+    assert governor.backoffs == 5
+    assert governor.last_backoff is not None
+
+    intervals = []
+    for _ in range(10):
+        governor.update(requests=100, errors=0, latency=0.02)
+        intervals.append(governor.interval)
+    assert intervals == [270, 240, 210, 180, 150, 120, 90, 60, 30, 30]
+    assert governor.pause == 0.0
+    assert governor.signal == SIGNAL_HEALTHY
+    assert governor.recoveries == 10
+    # a healthy cycle at the shortest interval without pause is no recovery
+    governor.update(requests=100, errors=0, latency=0.02)
+    assert governor.recoveries == 10
+
+
+def test_pause_steps_down(governor: PollGovernor) -> None:
+    """Each healthy cycle reduces the pause by one step."""
+    for _ in range(4):
+        governor.update(requests=100, errors=50, latency=0.02)
+    pauses = []
+    while governor.pause > 0:
+        governor.update(requests=100, errors=0, latency=0.02)
+        pauses.append(governor.pause)
+    assert pauses == [round(0.04 - PAUSE_STEP * n, 3) for n in range(1, 9)]
+
+
+def test_latency_floor() -> None:
+    """A slow cycle below the latency floor is healthy."""
+    governor = PollGovernor(30, 300)
+    governor.update(requests=100, errors=0, latency=0.001)
+    governor.update(requests=100, errors=0, latency=LATENCY_FLOOR * 0.9)
+    assert governor.signal == SIGNAL_HEALTHY
+    assert governor.interval == 30
+
+
+def test_latency_backoff(governor: PollGovernor) -> None:
+    """A cycle slower than three times the baseline backs off."""
+    governor.update(requests=100, errors=0, latency=LATENCY_FACTOR * 0.02 + 0.001)
+    assert governor.signal == SIGNAL_LATENCY
+    assert governor.interval == 60
+    # the slow cycle does not move the baseline
+    assert governor.baseline == 0.02
+
+
+def test_baseline(governor: PollGovernor) -> None:
+    """The baseline is the moving average of the healthy cycles."""
+    governor.update(requests=100, errors=0, latency=0.04)
+    assert governor.baseline == pytest.approx(0.02 + BASELINE_WEIGHT * 0.02)
+    governor.update(requests=100, errors=50, latency=0.04)
+    assert governor.baseline == pytest.approx(0.022)
+
+
+def test_idle(governor: PollGovernor) -> None:
+    """A cycle without requests changes nothing but the signal."""
+    governor.update(requests=100, errors=50, latency=0.02)
+    state = governor.as_dict()
+    governor.update(requests=0, errors=0, latency=None)
+    assert governor.signal == SIGNAL_IDLE
+    assert {**governor.as_dict(), "signal": state["signal"]} == state
+
+
+@pytest.mark.parametrize(
+    ("requests", "pause"),
+    [
+        (0, PAUSE_MAX),
+        (10, PAUSE_MAX),
+        (40, PAUSE_MAX),
+        (100, PAUSE_SHARE * 10 / 100),
+        (400, PAUSE_SHARE * 10 / 400),
+    ],
+)
+def test_pause_per_request(governor: PollGovernor, requests: int, pause: float) -> None:
+    """The pauses of a cycle use at most a share of the cycle timeout."""
+    for _ in range(5):
+        governor.update(requests=100, errors=50, latency=0.02)
+    assert governor.pause == PAUSE_MAX
+    assert governor.pause_per_request(requests, cycle_timeout=10) == pause
+    assert requests * pause <= PAUSE_SHARE * 10 or requests == 0
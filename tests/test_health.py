@@ -0,0 +1,208 @@
+"""Tests for the health of the registers."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.weishaupt_modbus import health as health_module
+from custom_components.weishaupt_modbus.health import (
+    PROBE_MAX,
+    PROBE_START,
+    QUARANTINE_SCORE,
+    REASON_ERRORS,
+    REASON_INVALID,
+    STATE_FAILING,
+    STATE_OK,
+    STATE_QUARANTINED,
+    SUCCESS_CREDIT,
+    HealthTracker,
+)
+from custom_components.weishaupt_modbus.items import ModbusItem
+
+
+class Clock:
+    """Replacement of time.monotonic that only moves when told."""
+
+    def __init__(self) -> None:
+        """Start at 1000 s."""
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """Replace the clock of the health module."""
+    clock = Clock()
+    monkeypatch.setattr(
+        health_module, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+@pytest.fixture
+def tracker() -> HealthTracker:
+    """Return a tracker without reads."""
+    return HealthTracker()
+
+
+@pytest.fixture
+def item() -> ModbusItem:
+    """Return the room temperature of heating circuit 1."""
+    return ModbusItem(31101, "Raumsolltemperatur", "temperature", "Sensor", "HZ", "rt")
+
+
+def quarantine(tracker: HealthTracker, item: ModbusItem) -> None:
+    """Fail the reads of the register until it is quarantined."""
+    while tracker.get(item).state != STATE_QUARANTINED:
+        tracker.record_failure(item)
+
+
+def test_never_read(tracker: HealthTracker, item: ModbusItem) -> None:
+    """A register that was never read is ok and due."""
+    assert tracker.get(item).state == STATE_OK
+    assert tracker.is_due(item)
+    tracker.record_success(item)
+    assert tracker.as_dict() == {"failing": 0, "quarantined": 0, "registers": []}
+
+
+def test_failing_to_quarantined(
+    tracker: HealthTracker, item: ModbusItem, clock: Clock
+) -> None:
+    """Failed reads add up until the score reaches QUARANTINE_SCORE."""
+    states = []
+    for _ in range(int(QUARANTINE_SCORE)):
+        tracker.record_failure(item)
+        states.append(tracker.get(item).state)
+    assert states == [STATE_FAILING] * (int(QUARANTINE_SCORE) - 1) + [STATE_QUARANTINED]
+    health = tracker.get(item)
+    assert (health.reason, health.quarantines) == (REASON_ERRORS, 1)
+    assert health.next_probe == clock.now + PROBE_START
+    assert tracker.as_dict()["quarantined"] == 1
+
+
+def test_success_credit(tracker: HealthTracker, item: ModbusItem) -> None:
+    """An answered read takes SUCCESS_CREDIT off the score."""
+    tracker.record_failure(item)
+    tracker.record_success(item)
+    assert tracker.get(item).score == 1 - SUCCESS_CREDIT
+    assert tracker.get(item).state == STATE_FAILING
+    tracker.record_success(item)
+    assert (tracker.get(item).score, tracker.get(item).state) == (0, STATE_OK)
+    tracker.record_success(item)
+    assert tracker.get(item).score == 0
+
+
+@pytest.mark.parametrize(
+    ("pattern", "state"),
+    [
+        # one failure in three reads is paid back by the two answers
+        ("FSS" * 10, STATE_OK),
+        # one failure in two reads keeps growing
+        ("FS" * 10, STATE_QUARANTINED),
+        ("FF" + "S" * 4, STATE_OK),
+        ("FFS", STATE_FAILING),
+    ],
+)
+def test_read_patterns(
+    tracker: HealthTracker, item: ModbusItem, pattern: str, state: str
+) -> None:
+    """A register failing in more than a third of the reads is quarantined."""
+    for read in pattern:
+        if tracker.get(item).state == STATE_QUARANTINED:
+            break
+        if read == "F":
+            tracker.record_failure(item)
+        else:
+            tracker.record_success(item)
+    assert tracker.get(item).state == state
+
+
+def test_invalid(tracker: HealthTracker, item: ModbusItem, clock: Clock) -> None:
+    """An answer that the register is not available quarantines at once."""
+    tracker.record_invalid(item)
+    health = tracker.get(item)
+    assert (health.state, health.reason) == (STATE_QUARANTINED, REASON_INVALID)
+    assert health.next_probe == clock.now + PROBE_START
+
+
+def test_probe_schedule(tracker: HealthTracker, item: ModbusItem, clock: Clock) -> None:
+    """Each failed probe doubles the wait from PROBE_START up to PROBE_MAX."""
+    tracker.record_invalid(item)
+    backoffs = [tracker.get(item).backoff]
+    while backoffs[-1] < PROBE_MAX:
+        assert not tracker.is_due(item)
+        clock.now = tracker.get(item).next_probe
+        assert tracker.is_due(item)
+        tracker.record_invalid(item)
+        backoffs.append(tracker.get(item).backoff)
+    assert backoffs == [60, 120, 240, 480, 960, 1920, PROBE_MAX]
+    # a probe without answer counts as a probe as well
+    tracker.record_failure(item)
+    health = tracker.get(item)
+    assert health.backoff == PROBE_MAX
+    assert health.next_probe == clock.now + PROBE_MAX
+    assert (health.probes, health.quarantines, health.reason) == (7, 1, REASON_ERRORS)
+
+
+def test_recovery(tracker: HealthTracker, item: ModbusItem) -> None:
+    """A probe with a valid answer brings the register back."""
+    tracker.record_invalid(item)
+    tracker.record_invalid(item)
+    tracker.record_success(item)
+    health = tracker.get(item)
+    assert (health.state, health.score, health.reason) == (STATE_OK, 0, None)
+    assert (health.backoff, health.recoveries) == (PROBE_START, 1)
+    # the next quarantine starts with the first probe again
+    quarantine(tracker, item)
+    assert tracker.get(item).backoff == PROBE_START
+    assert tracker.get(item).quarantines == 2
+    assert tracker.as_dict()["registers"][0]["recoveries"] == 1
+
+
+def test_forgive(tracker: HealthTracker, item: ModbusItem) -> None:
+    """The last failed read is undone if the connection failed."""
+    tracker.record_failure(item)
+    tracker.record_failure(item)
+    tracker.forgive(item)
+    assert (tracker.get(item).state, tracker.get(item).score) == (STATE_FAILING, 1)
+    # only once, and only for the register of the last failure
+    tracker.forgive(item)
+    assert tracker.get(item).score == 1
+    other = item.replace(address=31102, translation_key="rt2")
+    tracker.record_failure(item)
+    tracker.forgive(other)
+    tracker.forgive(item)
+    assert tracker.get(item).score == 2
+
+
+def test_forgive_quarantine(tracker: HealthTracker, item: ModbusItem) -> None:
+    """A quarantine caused by a failed connection is undone."""
+    tracker.record_failure(item)
+    tracker.record_failure(item)
+    tracker.record_failure(item)
+    assert tracker.get(item).state == STATE_QUARANTINED
+    tracker.forgive(item)
+    health = tracker.get(item)
+    assert (health.state, health.score, health.quarantines) == (STATE_FAILING, 2, 0)
+
+
+def test_take_recovered(tracker: HealthTracker, item: ModbusItem) -> None:
+    """Registers without entity are handed out once when they answer."""
+    other = item.replace(address=31102, translation_key="rt2")
+    for register in (item, other):
+        tracker.record_invalid(register)
+        tracker.set_without_entity(register)
+    assert not tracker.has_recovered()
+    assert tracker.take_recovered() == []
+
+    tracker.record_success(item)
+    assert tracker.has_recovered()
+    assert tracker.take_recovered() == [item]
+    assert not tracker.has_recovered()
+    assert tracker.take_recovered() == []
+
+    tracker.record_success(other)
+    assert tracker.take_recovered() == [other]
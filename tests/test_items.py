@@ -0,0 +1,42 @@
+"""Tests for the item classes."""
+
+import pytest
+
+from custom_components.weishaupt_modbus.items import (
+    ItemStates,
+    ModbusItem,
+    StatusItem,
+    get_status_description,
+)
+
+
+def test_description_from_file() -> None:
+    """The description of a status item is read from the descriptions file."""
+    assert StatusItem(0, "AUS").description == (
+        "Keine Funktion, wird nicht angesteuert."
+    )
+    assert get_status_description("", "no such status") == ""
+
+
+def test_explicit_description() -> None:
+    """A description given to the item is not looked up."""
+    assert StatusItem(0, "AUS", description="off").description == "off"
+
+
+def test_items_are_immutable() -> None:
+    """Assigning an attribute of an item raises, replace returns a copy."""
+    item = ModbusItem(30001, "Aussentemp", "temperature", "Sensor", "dev", "aussentemp")
+    with pytest.raises(AttributeError):
+        item.address = 30002
+    copy = item.replace(address=30002)
+    assert (item.address, copy.address) == (30001, 30002)
+
+
+def test_states_per_entry() -> None:
+    """Each ItemStates keeps its own values of the shared items."""
+    item = ModbusItem(30001, "Aussentemp", "temperature", "Sensor", "dev", "aussentemp")
+    first, second = ItemStates(), ItemStates()
+    first.set_state(item, 21.5)
+    first.set_invalid(item, True)
+    assert (first.get_state(item), second.get_state(item)) == (21.5, None)
+    assert (first.is_invalid(item), second.is_invalid(item)) == (True, False)
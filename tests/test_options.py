@@ -0,0 +1,161 @@
+"""Tests for the classification of changed options."""
+
+from typing import Any
+
+import pytest
+
+from custom_components.weishaupt_modbus.const import CONF
+from custom_components.weishaupt_modbus.options import (
+    PLATFORM_OPTIONS,
+    RELOAD_OPTIONS,
+    WEBIF_OPTIONS,
+    changed_options,
+    needs_platform_reload,
+    needs_reload,
+)
+
+ENTRY_DATA: dict[str, Any] = {
+    CONF.HOST: "10.10.1.225",
+    CONF.PORT: 502,
+    CONF.FAST_TRANSPORT: False,
+    CONF.REGISTER_MAP_FILE: "builtin",
+    CONF.CAPTURE: False,
+    CONF.REPLAY_FILE: "",
+    CONF.PREFIX: "weishaupt_wbb",
+    CONF.DEVICE_POSTFIX: "",
+    CONF.NAME_DEVICE_PREFIX: False,
+    CONF.NAME_TOPIC_PREFIX: False,
+    CONF.CB_WEBIF: False,
+    CONF.USERNAME: "",
+    CONF.PASSWORD: "",
+    CONF.WEBIF_TOKEN: "",
+    CONF.KENNFELD_FILE: "weishaupt_wbb_kennfeld.json",
+    CONF.METRICS_ENDPOINT: False,
+    CONF.POLL_INTERVAL_MIN: 30,
+    CONF.POLL_INTERVAL_MAX: 300,
+    CONF.HK2: False,
+    CONF.HK3: False,
+    CONF.HK4: False,
+    CONF.HK5: False,
+    CONF.W2: True,
+}
+
+# a changed value of each option
+CHANGED_VALUES: dict[str, Any] = {
+    CONF.HOST: "10.10.1.226",
+    CONF.PORT: 5020,
+    CONF.FAST_TRANSPORT: True,
+    CONF.REGISTER_MAP_FILE: "my_register_map.json",
+    CONF.CAPTURE: True,
+    CONF.REPLAY_FILE: "capture.bin",
+    CONF.PREFIX: "wp",
+    CONF.DEVICE_POSTFIX: "_2",
+    CONF.NAME_DEVICE_PREFIX: True,
+    CONF.NAME_TOPIC_PREFIX: True,
+    CONF.CB_WEBIF: True,
+    CONF.USERNAME: "user",
+    CONF.PASSWORD: "secret",
+    CONF.WEBIF_TOKEN: "token",
+    CONF.KENNFELD_FILE: "weishaupt_wbb_kennfeld_2.json",
+    CONF.METRICS_ENDPOINT: True,
+    CONF.POLL_INTERVAL_MIN: 10,
+    CONF.POLL_INTERVAL_MAX: 600,
+    CONF.HK2: True,
+    CONF.HK3: True,
+    CONF.HK4: True,
+    CONF.HK5: True,
+    CONF.W2: False,
+}
+
+IN_PLACE_OPTIONS = (
+    CONF.KENNFELD_FILE,
+    CONF.METRICS_ENDPOINT,
+    CONF.POLL_INTERVAL_MIN,
+    CONF.POLL_INTERVAL_MAX,
+    CONF.HK2,
+    CONF.HK3,
+    CONF.HK4,
+    CONF.HK5,
+    CONF.W2,
+)
+
+# option group, options of the group, reload, platform reload
+GROUPS = (
+    ("reload", RELOAD_OPTIONS, True, False),
+    ("platform", PLATFORM_OPTIONS, False, True),
+    ("webif", WEBIF_OPTIONS, False, True),
+    ("in place", IN_PLACE_OPTIONS, False, False),
+)
+
+
+def test_every_option_has_a_group() -> None:
+    """Each option of the table belongs to exactly one group."""
+    options = [option for _, group, _, _ in GROUPS for option in group]
+    assert sorted(options) == sorted(ENTRY_DATA)
+    assert ENTRY_DATA.keys() == CHANGED_VALUES.keys()
+
+
+@pytest.mark.parametrize(
+    ("option", "reload", "platform_reload"),
+    [
+        pytest.param(option, reload, platform_reload, id=f"{name}-{option}")
+        for name, group, reload, platform_reload in GROUPS
+        for option in group
+    ],
+)
+def test_single_option(option: str, reload: bool, platform_reload: bool) -> None:
+    """A change of one option is classified by its group."""
+    changed = changed_options(
+        ENTRY_DATA, {**ENTRY_DATA, option: CHANGED_VALUES[option]}
+    )
+    assert changed == {option}
+    assert needs_reload(changed) is reload
+    assert needs_platform_reload(changed) is platform_reload
+
+
+@pytest.mark.parametrize(
+    ("options", "reload", "platform_reload"),
+    [
+        ((CONF.KENNFELD_FILE, CONF.HK2), False, False),
+        ((CONF.PREFIX, CONF.HK3), False, True),
+        ((CONF.CB_WEBIF, CONF.USERNAME, CONF.PASSWORD), False, True),
+        ((CONF.PORT, CONF.PREFIX), True, True),
+        ((CONF.POLL_INTERVAL_MIN, CONF.CAPTURE), True, False),
+    ],
+)
+def test_mixed_options(
+    options: tuple[str, ...], reload: bool, platform_reload: bool
+) -> None:
+    """The strongest group of the changed options decides."""
+    new = {**ENTRY_DATA, **{option: CHANGED_VALUES[option] for option in options}}
+    changed = changed_options(ENTRY_DATA, new)
+    assert changed == set(options)
+    assert needs_reload(changed) is reload
+    assert needs_platform_reload(changed) is platform_reload
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "expected"),
+    [
+        (ENTRY_DATA, dict(ENTRY_DATA), set()),
+        # an option missing in older entries is added with its default
+        (
+            {k: v for k, v in ENTRY_DATA.items() if k != CONF.W2},
+            ENTRY_DATA,
+            {CONF.W2},
+        ),
+        (
+            ENTRY_DATA,
+            {k: v for k, v in ENTRY_DATA.items() if k != CONF.HK2},
+            {CONF.HK2},
+        ),
+        ({CONF.PORT: 502}, {CONF.PORT: 502, CONF.HK2: None}, set()),
+        ({CONF.PORT: 502}, {CONF.PORT: "502"}, {CONF.PORT}),
+    ],
+    ids=["unchanged", "added", "removed", "added-none", "type"],
+)
+def test_changed_options(
+    old: dict[str, Any], new: dict[str, Any], expected: set[str]
+) -> None:
+    """Only keys with a different value are reported."""
+    assert changed_options(old, new) == expected
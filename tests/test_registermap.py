@@ -0,0 +1,87 @@
+"""Tests for the register map files."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from custom_components.weishaupt_modbus import hpconst
+from custom_components.weishaupt_modbus.items import ModbusItem
+from custom_components.weishaupt_modbus.registermap import (
+    create_register_map_json,
+    load_register_map,
+    parse_register_map,
+    remove_register_map_caches,
+)
+
+
+def as_tuple(item: ModbusItem) -> tuple[Any, ...]:
+    """Return the definition of an item for comparison."""
+    resultlist = None
+    if item.resultlist is not None:
+        resultlist = [
+            (status.number, status.text, status.translation_key, status.description)
+            for status in item.resultlist
+        ]
+    return (
+        item.address,
+        item.name,
+        item.format,
+        item.type,
+        item.device,
+        item.translation_key,
+        dict(item.params),
+        resultlist,
+    )
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """The register map file of hpconst reproduces the built-in items."""
+    filepath = tmp_path / "builtin_registers.json"
+    create_register_map_json(filepath)
+    devicelists = parse_register_map(json.loads(filepath.read_text("utf-8")))
+
+    expected = [devicelist for devicelist in hpconst.DEVICELISTS if devicelist]
+    assert [[as_tuple(item) for item in devicelist] for devicelist in devicelists] == [
+        [as_tuple(item) for item in devicelist] for devicelist in expected
+    ]
+
+
+def test_shared_entries(tmp_path: Path) -> None:
+    """Named status lists and params are shared by the items using them."""
+    filepath = tmp_path / "builtin_registers.json"
+    create_register_map_json(filepath)
+    items = [item for devicelist in load_register_map(filepath) for item in devicelist]
+    by_params: dict[str, ModbusItem] = {}
+    for item in items:
+        if item.params:
+            first = by_params.setdefault(json.dumps(item.params, sort_keys=True), item)
+            assert first.params is item.params
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ("{", "no valid json"),
+        ('{"version": 2, "devices": []}', "Unsupported register map version"),
+        (
+            '{"version": 1, "devices": [{"items": [{"name": "x"}]}]}',
+            "Invalid register map",
+        ),
+    ],
+)
+def test_invalid_file(tmp_path: Path, content: str, message: str) -> None:
+    """An invalid file raises a ValueError."""
+    filepath = tmp_path / "broken_registers.json"
+    filepath.write_text(content, "utf-8")
+    with pytest.raises(ValueError, match=message):
+        load_register_map(filepath)
+
+
+def test_remove_caches(tmp_path: Path) -> None:
+    """The caches of former versions are removed, other files are kept."""
+    (tmp_path / "weishaupt_modbus.my_registers.0123456789abcdef.cache").touch()
+    (tmp_path / "core.config_entries").touch()
+    remove_register_map_caches(tmp_path)
+    assert [path.name for path in tmp_path.iterdir()] == ["core.config_entries"]
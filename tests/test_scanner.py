@@ -0,0 +1,37 @@
+"""Tests for the activity analysis of the register scanner."""
+
+import pytest
+
+from custom_components.weishaupt_modbus.scanner import (
+    POLL_TIERS,
+    STATIC_TIER,
+    ActivitySamples,
+    analyze_activity,
+)
+
+
+@pytest.mark.filterwarnings("error")
+def test_single_sample() -> None:
+    """One sample gives static registers without a division warning."""
+    samples = ActivitySamples([30001, 30002])
+    samples.add(0.0, {30001: 215, 30002: 100})
+    activities = analyze_activity(samples, [])
+    assert [(activity.changes, activity.tier) for activity in activities] == [
+        (0, STATIC_TIER),
+        (0, STATIC_TIER),
+    ]
+
+
+@pytest.mark.filterwarnings("error")
+def test_tiers() -> None:
+    """A register changing every cycle is polled every cycle."""
+    samples = ActivitySamples([30001, 30002, 30003])
+    for index in range(10):
+        samples.add(30.0 * index, {30001: index, 30002: 7})
+    activities = {
+        activity.address: activity for activity in analyze_activity(samples, [])
+    }
+    assert activities[30001].tier == POLL_TIERS[0][0]
+    assert activities[30001].changes == 9
+    assert activities[30002].tier == STATIC_TIER
+    assert 30003 not in activities
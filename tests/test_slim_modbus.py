@@ -0,0 +1,124 @@
+"""Tests for the frame decoding of the slim modbus client."""
+
+import asyncio
+import struct
+
+from pymodbus.exceptions import ModbusIOException
+import pytest
+
+from custom_components.weishaupt_modbus.slim_modbus import (
+    SlimModbusResponse,
+    SlimModbusTcpClient,
+    _SlimModbusProtocol,
+)
+
+
+def frame(transaction_id: int, pdu: bytes, length: int | None = None) -> bytes:
+    """Return a modbus TCP frame of unit 1, length defaults to the real one."""
+    if length is None:
+        length = len(pdu) + 1
+    return struct.pack(">HHHB", transaction_id, 0, length, 1) + pdu
+
+
+def read_pdu(*registers: int) -> bytes:
+    """Return the PDU of an input register response."""
+    return struct.pack(f">BB{len(registers)}H", 4, 2 * len(registers), *registers)
+
+
+@pytest.fixture
+def client() -> SlimModbusTcpClient:
+    """Return a client without connection."""
+    return SlimModbusTcpClient("127.0.0.1", 502)
+
+
+@pytest.fixture
+def protocol(client: SlimModbusTcpClient) -> _SlimModbusProtocol:
+    """Return the protocol of the client."""
+    return _SlimModbusProtocol(client)
+
+
+def expect(
+    client: SlimModbusTcpClient, *transaction_ids: int
+) -> list[asyncio.Future[SlimModbusResponse]]:
+    """Register pending requests and return their futures."""
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in transaction_ids]
+    client._pending.update(zip(transaction_ids, futures, strict=True))
+    return futures
+
+
+async def test_read_response(
+    client: SlimModbusTcpClient, protocol: _SlimModbusProtocol
+) -> None:
+    """A complete frame resolves its request."""
+    (future,) = expect(client, 1)
+    protocol.data_received(frame(1, read_pdu(215, 65535)))
+    response = future.result()
+    assert not response.isError()
+    assert response.registers == (215, 65535)
+
+
+async def test_split_frame(
+    client: SlimModbusTcpClient, protocol: _SlimModbusProtocol
+) -> None:
+    """A frame received in pieces is decoded when complete."""
+    (future,) = expect(client, 7)
+    data = frame(7, read_pdu(1, 2, 3))
+    for index in range(len(data) - 1):
+        protocol.data_received(data[index : index + 1])
+    assert not future.done()
+    protocol.data_received(data[-1:])
+    assert future.result().registers == (1, 2, 3)
+
+
+async def test_coalesced_frames(
+    client: SlimModbusTcpClient, protocol: _SlimModbusProtocol
+) -> None:
+    """Several frames in one segment resolve their requests in any order."""
+    first, second, third = expect(client, 1, 2, 3)
+    protocol.data_received(
+        frame(2, read_pdu(20))
+        + frame(1, read_pdu(10, 11))
+        + frame(3, bytes((0x84, 2)))
+        + frame(4, read_pdu(40))[:5]
+    )
+    assert first.result().registers == (10, 11)
+    assert second.result().registers == (20,)
+    assert third.result().isError()
+    assert third.result().exception_code == 2
+
+
+async def test_write_response(
+    client: SlimModbusTcpClient, protocol: _SlimModbusProtocol
+) -> None:
+    """The echo of a write returns the written value."""
+    (future,) = expect(client, 1)
+    protocol.data_received(frame(1, struct.pack(">BHH", 6, 41108, 450)))
+    assert future.result().registers == (450,)
+
+
+@pytest.mark.parametrize(
+    "pdu",
+    [
+        # byte count larger than the frame
+        struct.pack(">BBH", 4, 4, 1),
+        # odd byte count
+        struct.pack(">BBHB", 4, 3, 1, 0),
+        # no byte count
+        bytes((4,)),
+        # exception without exception code
+        bytes((0x84,)),
+        # write echo without value
+        struct.pack(">BH", 6, 41108),
+    ],
+    ids=["byte_count", "odd", "short", "exception", "write"],
+)
+async def test_malformed_frame(
+    client: SlimModbusTcpClient, protocol: _SlimModbusProtocol, pdu: bytes
+) -> None:
+    """A malformed frame fails its request, the next frame is still decoded."""
+    failed, answered = expect(client, 1, 2)
+    protocol.data_received(frame(1, pdu) + frame(2, read_pdu(5)))
+    with pytest.raises(ModbusIOException):
+        failed.result()
+    assert answered.result().registers == (5,)